@@ -1,4 +1,6 @@
 import streamlit as st
+from utils.rerun_timing import finish_page, start_page
+from utils.warmup import start_warmup
 
 st.set_page_config(
     page_title="CP Group - Grocery Platform Analysis",
@@ -7,6 +9,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+start_page()
+# Pre-import and prime the heavy pages in the background (once per process)
+start_warmup()
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -121,3 +127,5 @@ st.markdown("""
 <p>XJTLU Entrepreneur College (Taicang)</p>
 </div>
 """, unsafe_allow_html=True)
+
+finish_page()
@@ -0,0 +1,87 @@
+"""Catalog lookup and filter timings at scale.
+
+Builds a synthetic catalog by repeating the records in
+``data/products.json`` with jittered prices and quality scores and unique
+SKUs and names, then times the operations the consumer app runs per
+rerun, including the precomputed top-k recommendations. Exits with
+status 1 if any operation's median exceeds the budget:
+
+    python -m benchmarks.catalog
+    python -m benchmarks.catalog --skus 1000000 --budget-ms 5
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from utils.catalog import build_catalog
+from utils.data_loader import get_products
+
+DEFAULT_SKUS = 100_000
+DEFAULT_BUDGET_MS = 1.0
+REPEATS = 200
+
+def synthetic_products(n, seed=0):
+    """n product records derived from the shipped catalog"""
+    base = get_products().get('products', [])
+    rng = np.random.default_rng(seed)
+    price_jitter = rng.uniform(0.7, 1.3, n)
+    quality_jitter = rng.uniform(-0.1, 0.05, n)
+    products = []
+    for i in range(n):
+        record = dict(base[i % len(base)])
+        record['sku'] = f"{record['sku']}-{i}"
+        record['name'] = f"{record['name']} #{i}"
+        record['price'] = round(record['price'] * price_jitter[i], 2)
+        record['original_price'] = max(record.get('original_price', record['price']), record['price'])
+        record['quality_score'] = float(np.clip(record['quality_score'] + quality_jitter[i], 0, 1))
+        products.append(record)
+    return {'products': products}
+
+def median_ms(func, repeats=REPEATS):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time catalog lookups and filters on a synthetic catalog")
+    parser.add_argument('--skus', type=int, default=DEFAULT_SKUS)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    raw = synthetic_products(args.skus)
+    start = time.perf_counter()
+    catalog = build_catalog(raw)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(catalog):,} SKUs, built in {build_ms:,.0f} ms")
+
+    rng = np.random.default_rng(1)
+    skus = catalog.skus[rng.integers(0, len(catalog), REPEATS)]
+    names = catalog.names[rng.integers(0, len(catalog), REPEATS)]
+    sku_iter, name_iter = iter(skus), iter(names)
+    operations = {
+        'get(sku)': lambda: catalog.get(next(sku_iter)),
+        'get_by_name(name)': lambda: catalog.get_by_name(next(name_iter)),
+        'filter(price, quality)': lambda: catalog.filter(max_price=50, min_quality=0.8),
+        'filter(category, price)': lambda: catalog.filter(max_price=50, category='Vegetables'),
+        'rows(category)': lambda: catalog.rows('Seafood'),
+        'top(quality, 4)': lambda: catalog.top('quality', 4),
+        'top(value, 4, category)': lambda: catalog.top('value', 4, 'Meat'),
+    }
+
+    over = []
+    for label, func in operations.items():
+        ms = median_ms(func)
+        status = 'ok' if ms <= args.budget_ms else 'OVER'
+        print(f"  {label:28} {ms * 1000:>9.1f} us  {status}")
+        if status != 'ok':
+            over.append(label)
+    sys.exit(1 if over else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Cold-start profile of each page.
+
+For every page this runs the page's module-level imports in a fresh
+interpreter under ``python -X importtime`` and prints the total import
+time, with a breakdown of the slowest top-level packages. Imports made
+inside functions or page sections are deferred by construction and not
+counted. ``--cold`` also times each page's first AppTest run in a fresh
+interpreter, with and without the warmup from ``utils/warmup.py``:
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --top 15 --cold
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ['Home.py', 'pages/1_CP_Dashboard.py', 'pages/2_Consumer_App.py']
+DEFAULT_TOP = 8
+
+COLD_RUN = """
+import logging, os, sys, time
+os.environ.setdefault('CP_DATA_REFRESH_SECONDS', '0')
+logging.disable(logging.WARNING)
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+if {warm}:
+    from utils.warmup import warmup
+    warmup()
+warm_ms = (time.perf_counter() - start) * 1000
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+AppTest.from_file({page!r}, default_timeout=120).run()
+print(warm_ms, (time.perf_counter() - start) * 1000)
+"""
+
+def module_imports(path):
+    """Source of a script's module-level import statements"""
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def import_times(code):
+    """(module, self us, cumulative us, depth) for every module imported by code,
+    leaving out what the interpreter imports at start-up"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+
+    def run(source):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', source], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        return rows
+
+    startup = {row[0] for row in run('pass')}
+    return [row for row in run(code) if row[0] not in startup]
+
+def cold_run(page, warm):
+    """(warmup ms, first run ms) of a page in a fresh interpreter"""
+    code = COLD_RUN.format(root=str(ROOT), page=str(ROOT / page), warm=warm)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    warm_ms, run_ms = result.stdout.split()[-2:]
+    return float(warm_ms), float(run_ms)
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time breakdown of each page")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="top-level imports to list per page")
+    parser.add_argument('--cold', action='store_true', help="also time each page's first run, cold and warmed up")
+    args = parser.parse_args()
+
+    for page in PAGES:
+        rows = import_times(module_imports(ROOT / page))
+        total_ms = sum(r[1] for r in rows) / 1000
+        print(f"\n{page}: {total_ms:,.0f} ms of module-level imports ({len(rows)} modules)")
+        top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+        for name, _, cumulative_us, _ in top_level[:args.top]:
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+        if args.cold:
+            _, cold_ms = cold_run(page, False)
+            warm_ms, warmed_ms = cold_run(page, True)
+            print(f"  first run: {cold_ms:,.0f} ms cold, {warmed_ms:,.0f} ms after a {warm_ms:,.0f} ms warmup")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""Concurrent-session load test against a local Streamlit server.
+
+Starts ``streamlit run Home.py`` on a free port and, for each session count
+N, opens N websocket sessions speaking the browser protocol (BackMsg /
+ForwardMsg protobufs on ``/_stcore/stream``). Every session replays
+``SCRIPT`` in a loop: opening the dashboard, switching modules, moving
+entry simulator sliders, adding to cart and asking the assistant. Each
+session pauses for a think time between steps. Per N the harness reports
+throughput, rerun latency percentiles (request sent to ``script_finished``
+received) and the server process's CPU and RSS, read from ``/proc``:
+
+    python -m benchmarks.load_test --sessions 1 5 10 25 50 --duration 20
+    python -m benchmarks.load_test --sessions 10 --think 0   # closed loop
+
+Widget changes inside an ``st.fragment`` are sent as fragment reruns, as
+the browser does. All sessions are driven from one asyncio loop in this
+process, so at very high N the client itself can become the bottleneck;
+the client CPU time is reported for that reason.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SESSIONS = [1, 5, 10, 25]
+DEFAULT_DURATION = 20.0
+DEFAULT_THINK = 1.0
+RERUN_TIMEOUT = 60.0
+STARTUP_TIMEOUT = 60.0
+SAMPLE_INTERVAL = 0.5
+PERCENTILES = (50, 95, 99)
+
+FINISHED_WITH_COMPILE_ERROR = 1
+FINISHED_EARLY_FOR_RERUN = 2
+
+DASHBOARD = 'CP Dashboard'
+CONSUMER_APP = 'Consumer App'
+
+# Widget elements carry a user-visible label and a value type for WidgetState
+VALUE_FIELDS = {
+    'radio': 'int_value',
+    'slider': 'double_array_value',
+    'text_input': 'string_value',
+    'selectbox': 'string_value',
+}
+
+class RerunError(Exception):
+    pass
+
+class Session:
+    """One browser-like session: tracks pages, rendered widgets and widget state"""
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.pages = {}       # page name -> page script hash
+        self.page = ''        # current page script hash ('' = main page)
+        self.widgets = {}     # label -> [(kind, proto, fragment_id)]
+        self.states = {}      # widget id -> WidgetState (non-trigger values)
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=['streamlit'])
+        await self.rerun()
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    def widget(self, label, kind=None):
+        for widget_kind, proto, fragment_id in self.widgets.get(label, ()):
+            if kind is None or widget_kind == kind:
+                return widget_kind, proto, fragment_id
+        raise RerunError(f"widget {label!r} not rendered")
+
+    async def rerun(self, triggers=(), fragment_id=''):
+        """Send a rerun with the current widget state; returns the latency in ms"""
+        msg = BackMsg()
+        client = msg.rerun_script
+        client.page_script_hash = self.page
+        client.fragment_id = fragment_id
+        client.widget_states.widgets.extend(self.states.values())
+        client.widget_states.widgets.extend(triggers)
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        widgets = {}
+        error = None
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), RERUN_TIMEOUT)
+            if raw is None:
+                raise RerunError("connection closed")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof('type')
+            if kind == 'navigation':
+                self.pages = {p.page_name: p.page_script_hash for p in fwd.navigation.app_pages}
+            elif kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element_kind = fwd.delta.new_element.WhichOneof('type')
+                element = getattr(fwd.delta.new_element, element_kind)
+                if element_kind == 'exception':
+                    error = element.message
+                elif getattr(element, 'id', '') and hasattr(element, 'label'):
+                    widgets.setdefault(element.label, []).append((element_kind, element, fwd.delta.fragment_id))
+            elif kind == 'script_finished':
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if fwd.script_finished in (FINISHED_WITH_COMPILE_ERROR, FINISHED_EARLY_FOR_RERUN):
+                    error = error or f"script finished with status {fwd.script_finished}"
+                break
+
+        if fragment_id:
+            self.widgets.update(widgets)
+        else:
+            self.widgets = widgets
+        if error:
+            raise RerunError(error)
+        return elapsed_ms
+
+    async def open_page(self, name):
+        self.page = self.pages[name]
+        self.states = {}
+        return await self.rerun()
+
+    async def set_value(self, label, value, kind=None):
+        widget_kind, proto, fragment_id = self.widget(label, kind)
+        state = WidgetState(id=proto.id)
+        field = VALUE_FIELDS[widget_kind]
+        if field == 'double_array_value':
+            state.double_array_value.data.append(value)
+        else:
+            setattr(state, field, value)
+        self.states[proto.id] = state
+        return await self.rerun(fragment_id=fragment_id)
+
+    async def click(self, label, value=None, value_label=None):
+        """Press a button, optionally setting another widget's value in the same run"""
+        if value_label is not None:
+            widget_kind, proto, _ = self.widget(value_label)
+            state = WidgetState(id=proto.id)
+            setattr(state, VALUE_FIELDS[widget_kind], value)
+            self.states[proto.id] = state
+        _, proto, fragment_id = self.widget(label, 'button')
+        return await self.rerun([WidgetState(id=proto.id, trigger_value=True)], fragment_id)
+
+    async def move_slider(self, label):
+        _, proto, _ = self.widget(label, 'slider')
+        steps = int((proto.max - proto.min) / proto.step) if proto.step else 0
+        return await self.set_value(label, proto.min + self.rng.randint(0, steps) * proto.step, 'slider')
+
+MODULES = ["Overview", "Competitor Intelligence", "Market Analysis", "Customer Insights", "Opportunity Engine"]
+QUESTIONS = ["What vegetables are good for winter?", "Is the salmon fresh?", "Any organic discounts?"]
+
+SCRIPT = [
+    ('open dashboard', lambda s: s.open_page(DASHBOARD)),
+    *[('switch module', lambda s, i=i: s.set_value("Select Module", i, 'radio')) for i in range(1, len(MODULES))],
+    ('move simulator slider', lambda s: s.move_slider("Traceability Coverage")),
+    ('move simulator slider', lambda s: s.move_slider("AI/Tech Investment Level")),
+    ('open consumer app', lambda s: s.open_page(CONSUMER_APP)),
+    ('add to cart', lambda s: s.click("Add to Cart")),
+    ('ask assistant', lambda s: s.click("Ask", s.rng.choice(QUESTIONS), "Your question:")),
+]
+
+class ProcessSampler:
+    """CPU (% of one core) and RSS of a process, sampled from /proc"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf('SC_CLK_TCK')
+
+    def cpu_seconds(self):
+        with open(f'/proc/{self.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+        return (int(fields[11]) + int(fields[12])) / self.ticks
+
+    def rss_mb(self):
+        with open(f'/proc/{self.pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+async def _session_loop(session, deadline, think, latencies, errors):
+    step = 0
+    while time.perf_counter() < deadline:
+        name, action = SCRIPT[step % len(SCRIPT)]
+        step += 1
+        try:
+            latencies.setdefault(name, []).append(await action(session))
+        except (RerunError, KeyError, asyncio.TimeoutError) as e:
+            errors.append(f"{name}: {e}")
+            # Start the script again from the dashboard
+            step = 0
+        if think:
+            await asyncio.sleep(session.rng.uniform(0.5 * think, 1.5 * think))
+
+async def _sample(sampler, stop, rss):
+    while not stop.is_set():
+        rss.append(sampler.rss_mb())
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def run_stage(url, sampler, n_sessions, duration, think, seed):
+    """Drive n_sessions concurrently for duration seconds and summarize the results"""
+    sessions = [Session(url, random.Random(seed + i)) for i in range(n_sessions)]
+    await asyncio.gather(*(s.connect() for s in sessions))
+
+    latencies, errors, rss = {}, [], []
+    stop = asyncio.Event()
+    sampler_task = asyncio.ensure_future(_sample(sampler, stop, rss))
+    cpu_start, client_start, start = sampler.cpu_seconds(), time.process_time(), time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_session_loop(s, deadline, think, latencies, errors) for s in sessions))
+    elapsed = time.perf_counter() - start
+    cpu = sampler.cpu_seconds() - cpu_start
+    client_cpu = time.process_time() - client_start
+    stop.set()
+    await sampler_task
+    for s in sessions:
+        s.close()
+
+    all_ms = np.concatenate([np.asarray(v) for v in latencies.values()]) if latencies else np.empty(0)
+    pct = np.percentile(all_ms, PERCENTILES) if len(all_ms) else [float('nan')] * len(PERCENTILES)
+    return {
+        'sessions': n_sessions,
+        'reruns': int(len(all_ms)),
+        'reruns_per_s': len(all_ms) / elapsed,
+        **{f'p{p}_ms': float(v) for p, v in zip(PERCENTILES, pct)},
+        'errors': len(errors),
+        'first_errors': errors[:3],
+        'server_cpu_pct': cpu / elapsed * 100,
+        'client_cpu_pct': client_cpu / elapsed * 100,
+        'peak_rss_mb': max(rss) if rss else sampler.rss_mb(),
+        'steps': {name: {'count': len(v), 'p50_ms': float(np.percentile(v, 50)), 'p95_ms': float(np.percentile(v, 95))}
+                  for name, v in latencies.items()},
+    }
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(port):
+    """Start the app on port and wait until it reports healthy"""
+    cmd = [sys.executable, '-m', 'streamlit', 'run', 'Home.py',
+           '--server.headless', 'true', '--server.port', str(port), '--server.address', '127.0.0.1',
+           '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false']
+    server = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as r:
+                if r.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {STARTUP_TIMEOUT:.0f}s")
+
+def _print_stage(result):
+    print(f"{result['sessions']:>8} {result['reruns_per_s']:>9.1f} {result['p50_ms']:>9.0f} "
+          f"{result['p95_ms']:>9.0f} {result['p99_ms']:>9.0f} {result['errors']:>7} "
+          f"{result['server_cpu_pct']:>8.0f} {result['peak_rss_mb']:>8.0f} {result['client_cpu_pct']:>10.0f}")
+    for error in result['first_errors']:
+        print(f"{'':>8} error: {error}")
+
+async def run(args):
+    if not os.path.exists('/proc/self/stat'):
+        raise SystemExit("load_test reads CPU and RSS from /proc and needs Linux")
+    port = args.port or _free_port()
+    server = start_server(port)
+    try:
+        sampler = ProcessSampler(server.pid)
+        url = f'ws://127.0.0.1:{port}/_stcore/stream'
+        print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} "
+              f"{'cpu %':>8} {'rss MB':>8} {'client %':>10}")
+        results = []
+        for n in args.sessions:
+            result = await run_stage(url, sampler, n, args.duration, args.think, args.seed)
+            results.append(result)
+            _print_stage(result)
+
+        print("\nPer step at", results[-1]['sessions'], "sessions:")
+        for name, s in results[-1]['steps'].items():
+            print(f"  {name:24} {s['count']:>6} runs  p50 {s['p50_ms']:>7.0f} ms  p95 {s['p95_ms']:>7.0f} ms")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app with concurrent websocket sessions")
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS,
+                        help="session counts to test, in order")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="seconds per session count")
+    parser.add_argument('--think', type=float, default=DEFAULT_THINK,
+                        help="mean pause between interactions in seconds (0 = closed loop)")
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=None, help="also write the results to this file")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Headless page benchmarks.
+
+Every page path (Home, the five dashboard modules and the five Consumer App
+tabs) is driven with Streamlit's ``AppTest``. Each scenario runs its page
+once, applies an interaction (switching module, changing a widget) and then
+reruns it several times, recording:
+
+- wall time: the page's own run time as measured by ``start_page()`` /
+  ``finish_page()``, which leaves out AppTest's thread start-up and message
+  parsing (several times the run time of a light page). The fastest repeat
+  is kept, as with ``timeit``, since it is the least noisy estimate
+- the number of elements rendered in the section the scenario exercises
+- the peak memory allocated during one rerun
+
+Results are compared with ``benchmarks/baselines.json``:
+
+    python -m benchmarks.pages                   # compare, exit 1 on regression
+    python -m benchmarks.pages --update          # record new baselines
+    python -m benchmarks.pages --only dashboard  # scenarios by name prefix
+
+Wall times depend on the machine, so baselines should be recorded on the
+machine that runs the comparison.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+# The background refresher thread would outlive every AppTest run
+os.environ.setdefault('CP_DATA_REFRESH_SECONDS', '0')
+
+from streamlit.testing.v1 import AppTest
+
+from utils.rerun_timing import STATE_KEY
+from utils.warmup import start_warmup
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+
+DEFAULT_REPEATS = 7
+DEFAULT_THRESHOLD = 0.3
+# Absolute slack, so millisecond-scale paths do not fail on timer noise
+MIN_REGRESSION_MS = 10.0
+MIN_REGRESSION_KB = 256
+TIMEOUT = 120
+
+DASHBOARD_MODULES = ["Overview", "Competitor Intelligence", "Market Analysis", "Customer Insights", "Opportunity Engine"]
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    script: str
+    action: object = None   # at -> None, sets widget state before each timed rerun
+    section: object = None  # at -> element node to count (default: main area)
+
+def _find(widgets, label):
+    return next(w for w in widgets if w.label.startswith(label))
+
+def _select_module(module):
+    return lambda at: at.sidebar.radio[0].set_value(module)
+
+def _ask(at):
+    _find(at.text_input, "Your question").set_value("What vegetables are good for winter?")
+    _find(at.button, "Ask").click()
+
+def _tab(index):
+    return lambda at: at.tabs[index]
+
+SCENARIOS = [
+    Scenario('home', 'Home.py'),
+    *[Scenario(f"dashboard:{module.lower().replace(' ', '_')}", 'pages/1_CP_Dashboard.py', _select_module(module))
+      for module in DASHBOARD_MODULES],
+    Scenario('consumer:recommendations', 'pages/2_Consumer_App.py',
+             lambda at: at.sidebar.radio[0].set_value("Value Priority"), _tab(0)),
+    Scenario('consumer:traceability', 'pages/2_Consumer_App.py',
+             lambda at: (sb := _find(at.selectbox, "Select a product")).set_value(sb.options[2]), _tab(1)),
+    Scenario('consumer:price_quality', 'pages/2_Consumer_App.py',
+             lambda at: _find(at.slider, "Maximum Price").set_value(100), _tab(2)),
+    Scenario('consumer:assistant', 'pages/2_Consumer_App.py', _ask, _tab(3)),
+    Scenario('consumer:auto_detect', 'pages/2_Consumer_App.py',
+             lambda at: at.button(key='demo_quality_click').click(), _tab(4)),
+]
+
+def count_elements(node):
+    """Number of elements and blocks in a node's subtree (the node included)"""
+    children = getattr(node, 'children', None) or {}
+    if isinstance(children, dict):
+        children = children.values()
+    return 1 + sum(count_elements(child) for child in children)
+
+def _rerun(at, scenario):
+    """Apply the scenario's interaction, rerun and return the page run time in ms"""
+    if scenario.action is not None:
+        scenario.action(at)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{scenario.name}: {at.exception[0].value}")
+    return at.session_state[STATE_KEY]['page_ms']
+
+def run_scenario(scenario, repeats=DEFAULT_REPEATS):
+    """Best rerun wall time, element count and peak rerun memory for one scenario"""
+    at = AppTest.from_file(str(ROOT / scenario.script), default_timeout=TIMEOUT)
+    at.run()
+
+    timings = [_rerun(at, scenario) for _ in range(repeats)]
+
+    # Peak memory is measured on a separate rerun, as tracing slows the script down
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        _rerun(at, scenario)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    section = scenario.section(at) if scenario.section else at.main
+    return {
+        'wall_ms': round(min(timings), 1),
+        'elements': count_elements(section),
+        'peak_kb': round((peak - baseline) / 1024),
+    }
+
+def compare(result, baseline, threshold=DEFAULT_THRESHOLD):
+    """Human-readable regressions of result against a baseline entry"""
+    regressions = []
+    limit = 1 + threshold
+    if (result['wall_ms'] > baseline['wall_ms'] * limit
+            and result['wall_ms'] - baseline['wall_ms'] > MIN_REGRESSION_MS):
+        regressions.append(f"wall time {baseline['wall_ms']:.1f} -> {result['wall_ms']:.1f} ms")
+    if result['elements'] > baseline['elements'] * limit:
+        regressions.append(f"elements {baseline['elements']} -> {result['elements']}")
+    if (result['peak_kb'] > baseline['peak_kb'] * limit
+            and result['peak_kb'] - baseline['peak_kb'] > MIN_REGRESSION_KB):
+        regressions.append(f"peak memory {baseline['peak_kb']:,} -> {result['peak_kb']:,} KB")
+    return regressions
+
+def load_baselines(path=BASELINES_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['scenarios']
+    except FileNotFoundError:
+        return {}
+
+def save_baselines(results, path=BASELINES_PATH):
+    scenarios = load_baselines(path)
+    scenarios.update(results)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'scenarios': dict(sorted(scenarios.items()))}, f, indent=2)
+        f.write('\n')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every page path headlessly with AppTest")
+    parser.add_argument('--only', default='', help="run scenarios whose name starts with this prefix")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative increase over the baseline (default 0.3)")
+    parser.add_argument('--update', action='store_true', help="record results as the new baselines")
+    args = parser.parse_args()
+
+    # Keep deprecation warnings from the pages out of the report
+    logging.disable(logging.WARNING)
+    # Home starts a background warmup; finish it first so it doesn't skew any scenario
+    start_warmup().join()
+
+    baselines = load_baselines()
+    results = {}
+    failed = False
+    print(f"{'scenario':32} {'wall ms':>9} {'elements':>9} {'peak KB':>9}  status")
+    for scenario in SCENARIOS:
+        if not scenario.name.startswith(args.only):
+            continue
+        try:
+            result = run_scenario(scenario, args.repeats)
+        except Exception as e:
+            print(f"{scenario.name:32} {'':>9} {'':>9} {'':>9}  ERROR {e}")
+            failed = True
+            continue
+        results[scenario.name] = result
+
+        baseline = baselines.get(scenario.name)
+        if args.update:
+            status = "recorded"
+        elif baseline is None:
+            status = "no baseline"
+        else:
+            regressions = compare(result, baseline, args.threshold)
+            status = "REGRESSED: " + "; ".join(regressions) if regressions else "ok"
+            failed = failed or bool(regressions)
+        print(f"{scenario.name:32} {result['wall_ms']:>9.1f} {result['elements']:>9} {result['peak_kb']:>9,}  {status}")
+
+    if args.update and results:
+        save_baselines(results)
+        print(f"Baselines written to {BASELINES_PATH}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""Per-session memory accounting for session state.
+
+Simulates many sessions with ``AppTest`` and replays a few rounds of
+interactions in each: adding to cart, asking the assistant and the
+auto-detect demo in the Consumer App, and switching modules on the
+dashboard. After every round it measures the retained size of each
+session-state key with ``tracemalloc``: the traced memory allocated by
+unpickling an independent copy of the value. That is the bytes the key
+would keep alive on its own; strings it shares with the page's code are
+counted too, so figures are an upper bound.
+
+The report lists every key with its mean and max size across sessions and
+its growth per round. It flags:
+
+- GROWS: the key grew in each of the last ``GROWTH_ROUNDS`` rounds, so its
+  size is bounded only by how long the session lives
+- SHARED: a session-state value (not a widget) is identical in every
+  session, so it could be held once per process instead of once per
+  session
+
+    python -m benchmarks.session_memory --sessions 20 --rounds 10
+    python -m benchmarks.session_memory --page consumer --fail-on-growth
+"""
+import argparse
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tracemalloc
+
+# The background refresher thread would outlive every AppTest run
+os.environ.setdefault('CP_DATA_REFRESH_SECONDS', '0')
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+DEFAULT_SESSIONS = 10
+DEFAULT_ROUNDS = 8
+GROWTH_ROUNDS = 3
+TIMEOUT = 120
+PROJECTED_SESSIONS = (100, 1000)
+
+def _consumer_round(at, round_index, session_index):
+    next(b for b in at.button if b.label == "Add to Cart").click().run()
+    next(t for t in at.text_input if t.label.startswith("Your question")).set_value(
+        f"What vegetables are good for winter? ({session_index}.{round_index})")
+    next(b for b in at.button if b.label == "Ask").click().run()
+    at.button(key='demo_quality_click').click().run()
+
+DASHBOARD_MODULES = ["Overview", "Competitor Intelligence", "Market Analysis", "Customer Insights", "Opportunity Engine"]
+
+def _dashboard_round(at, round_index, session_index):
+    at.sidebar.radio[0].set_value(DASHBOARD_MODULES[round_index % len(DASHBOARD_MODULES)]).run()
+
+PAGES = {
+    'consumer': ('pages/2_Consumer_App.py', _consumer_round),
+    'dashboard': ('pages/1_CP_Dashboard.py', _dashboard_round),
+}
+
+def retained_bytes(value):
+    """Bytes an independent copy of value allocates (tracemalloc must be tracing)"""
+    try:
+        payload = pickle.dumps(value)
+        duplicate_of = lambda: pickle.loads(payload)
+    except Exception:
+        duplicate_of = lambda: copy.deepcopy(value)
+    before = tracemalloc.get_traced_memory()[0]
+    duplicate = duplicate_of()
+    size = tracemalloc.get_traced_memory()[0] - before
+    del duplicate
+    return size
+
+def _fingerprint(value):
+    try:
+        return hashlib.sha1(pickle.dumps(value)).hexdigest()
+    except Exception:
+        return None
+
+def session_state_items(at):
+    """User and widget keys of an AppTest session's state"""
+    state = at.session_state._state
+    return {key: state[key] for key in state.filtered_state}
+
+def widget_keys(at):
+    state = at.session_state._state
+    return set(state._key_id_mapper.id_key_mapping.values()) | {
+        key for key in state.filtered_state if key.startswith('FormSubmitter:')}
+
+def measure(page, n_sessions, n_rounds):
+    """sizes[key] -> (rounds, sessions) retained bytes (NaN where absent),
+    plus which keys hold identical values in every session and which are widgets"""
+    script, interact = PAGES[page]
+    sessions = [AppTest.from_file(script, default_timeout=TIMEOUT).run() for _ in range(n_sessions)]
+    sizes = {}
+    for round_index in range(n_rounds):
+        for s, at in enumerate(sessions):
+            interact(at, round_index, s)
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+        tracemalloc.start()
+        try:
+            for s, at in enumerate(sessions):
+                for key, value in session_state_items(at).items():
+                    sizes.setdefault(key, np.full((n_rounds, n_sessions), np.nan))[round_index, s] = retained_bytes(value)
+        finally:
+            tracemalloc.stop()
+
+    identical = {}
+    for key in sizes:
+        prints = {_fingerprint(session_state_items(at).get(key)) for at in sessions}
+        identical[key] = len(prints) == 1 and None not in prints and n_sessions > 1
+    widgets = set().union(*(widget_keys(at) for at in sessions))
+    return sizes, identical, widgets
+
+def summarize(sizes, identical, widgets):
+    rows = []
+    for key, by_round in sizes.items():
+        # Only rounds in which the key existed in every session
+        present = ~np.isnan(by_round).any(axis=1)
+        mean_by_round = by_round[present].mean(axis=1)
+        recent = np.diff(mean_by_round[-(GROWTH_ROUNDS + 1):])
+        grows = len(recent) == GROWTH_ROUNDS and bool((recent > 0).all())
+        slope = float(np.polyfit(np.arange(len(mean_by_round)), mean_by_round, 1)[0]) if len(mean_by_round) > 1 else 0.0
+        last = by_round[-1][~np.isnan(by_round[-1])]
+        rows.append({
+            'key': key,
+            'kind': 'widget' if key in widgets else 'state',
+            'mean_bytes': float(last.mean()) if len(last) else 0.0,
+            'max_bytes': float(last.max()) if len(last) else 0.0,
+            'growth_per_round': slope,
+            'grows': grows,
+            'shared': identical[key] and key not in widgets,
+        })
+    return sorted(rows, key=lambda r: r['mean_bytes'], reverse=True)
+
+def report(page, rows, n_sessions, n_rounds):
+    total = sum(r['mean_bytes'] for r in rows)
+    print(f"\n{page}: {n_sessions} sessions x {n_rounds} rounds")
+    print(f"  {'key':48} {'kind':>6} {'mean B':>9} {'max B':>9} {'B/round':>9}  flags")
+    for r in rows:
+        flags = ' '.join(flag for flag, on in (('GROWS', r['grows']), ('SHARED', r['shared'])) if on)
+        print(f"  {r['key'][:48]:48} {r['kind']:>6} {r['mean_bytes']:>9,.0f} {r['max_bytes']:>9,.0f} "
+              f"{r['growth_per_round']:>9,.0f}  {flags}")
+    shared = sum(r['mean_bytes'] for r in rows if r['shared'])
+    projected = ', '.join(f"{n} sessions: {total * n / 1024**2:,.1f} MB" for n in PROJECTED_SESSIONS)
+    print(f"  session state per session: {total / 1024:,.1f} KB ({shared / 1024:,.1f} KB identical in every session)")
+    print(f"  projected: {projected}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure retained session-state memory per key")
+    parser.add_argument('--page', choices=[*PAGES, 'all'], default='all')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--fail-on-growth', action='store_true', help="exit 1 if any key grows every round")
+    args = parser.parse_args()
+
+    # Keep deprecation warnings from the pages out of the report
+    logging.disable(logging.WARNING)
+
+    growing = []
+    for page in (PAGES if args.page == 'all' else [args.page]):
+        rows = summarize(*measure(page, args.sessions, args.rounds))
+        report(page, rows, args.sessions, args.rounds)
+        growing += [f"{page}:{r['key']}" for r in rows if r['grows']]
+
+    if growing:
+        print(f"\nUnbounded keys: {', '.join(growing)}")
+    sys.exit(1 if args.fail_on_growth and growing else 0)
+
+if __name__ == '__main__':
+    main()
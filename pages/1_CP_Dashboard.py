@@ -1,8 +1,25 @@
+import os
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from utils.data_loader import load_all_data
+from utils.refresher import current_data
+from utils.figure_cache import cached_plotly_chart
+from utils.figures import (DEFAULT_SEGMENT, consumer_segments_figure, health_index_figure, market_size_figure,
+                           pain_points_figure, priorities_figure, product_preferences_figure,
+                           tier_penetration_figure)
+from utils.comparison import ATTRIBUTES
+from utils.downsample import budgeted_figure, downsample, max_points
+from utils.financial_analytics import ROLLING_WINDOW, period_label
+from utils.render import (competitor_card_html, features_html, gains_html, jobs_html, pains_html,
+                          render_panel, strengths_weaknesses_html, swot_html)
+from utils.rerun_timing import finish_page, start_page, timed_fragment
+from utils.metrics import timed
+from utils.admin import render_admin_panel
+from utils.entry_simulator import (EntryConfig, config_investment, config_score, optimize,
+                                   run_monte_carlo, simulate)
+
+# Side-by-side comparison: cards are shown for up to this many competitors,
+# and the financials get a zoom range beyond this many quarters
+MAX_COMPARISON_CARDS = 4
+ZOOM_MIN_PERIODS = 24
 
 st.set_page_config(
     page_title="CP Dashboard - Strategic Intelligence",
@@ -10,8 +27,10 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load all data
-competitors, market, segments, financials = load_all_data()
+start_page()
+
+# Pin one data version for the whole rerun; refreshed in the background
+data = current_data()
 
 # Custom CSS
 st.markdown("""
@@ -43,6 +62,29 @@ st.markdown("""
         color: #C62828;
         font-weight: 500;
     }
+    .panel-grid {
+        display: grid;
+        gap: 1rem;
+    }
+    .alert {
+        padding: 0.75rem 1rem;
+        border-radius: 0.5rem;
+        margin-bottom: 0.75rem;
+    }
+    .alert-success { background-color: rgba(33, 195, 84, 0.1); color: rgb(23, 114, 51); }
+    .alert-info { background-color: rgba(28, 131, 225, 0.1); color: rgb(0, 66, 128); }
+    .alert-warning { background-color: rgba(255, 227, 18, 0.1); color: rgb(146, 108, 5); }
+    .alert-error { background-color: rgba(255, 43, 43, 0.09); color: rgb(125, 53, 59); }
+    .pain-row {
+        display: flex;
+        justify-content: space-between;
+        padding: 0.75rem 0;
+        border-bottom: 1px solid #ddd;
+    }
+    .pain-frequency {
+        color: #808495;
+        font-size: 0.875rem;
+    }
     </style>
 """, unsafe_allow_html=True)
 
@@ -56,8 +98,13 @@ page = st.sidebar.radio(
 if st.sidebar.button("Return to Home"):
     st.switch_page("Home.py")
 
+module_timer = timed("dashboard." + page.lower().replace(' ', '_'))
+
 # ============ OVERVIEW PAGE ============
 if page == "Overview":
+    market = data.market
+    competitors = data.competitor_matrix
+
     st.title("CP Group - Strategic Market Analysis Dashboard")
     st.markdown("### Executive Summary")
     
@@ -85,10 +132,11 @@ if page == "Overview":
         )
     
     with col4:
+        names = [competitors.names[key] for key in competitors.keys]
         st.metric(
             "Key Competitors",
-            "2",
-            "Dingdong & Freshippo"
+            str(len(competitors)),
+            " & ".join(names) if len(names) <= 2 else f"{', '.join(names[:2])} +{len(names) - 2} more"
         )
     
     st.markdown("---")
@@ -125,25 +173,7 @@ if page == "Overview":
     # Quick Competitor Comparison
     st.markdown("### Quick Competitor Comparison")
     
-    comp_data = {
-        "": ["Business Model", "Cities", "SKU Count", "Traceability", "Fulfillment Cost"],
-        "Dingdong": [
-            competitors['dingdong']['model'],
-            f"{len(competitors['dingdong']['cities'])} (YRD focus)",
-            competitors['dingdong']['sku_count'],
-            "Partial (25%)",
-            "¥87.2M"
-        ],
-        "Freshippo": [
-            competitors['freshippo']['model'],
-            "10+ (Tier 1+2)",
-            competitors['freshippo']['sku_count'],
-            "Partial (30%)",
-            "¥82M"
-        ]
-    }
-    
-    st.table(pd.DataFrame(comp_data))
+    st.table(competitors.compare(competitors.keys, rows=ATTRIBUTES))
 
 # ============ COMPETITOR INTELLIGENCE PAGE ============
 elif page == "Competitor Intelligence":
@@ -156,78 +186,103 @@ elif page == "Competitor Intelligence":
     )
     
     if competitor == "Side-by-Side Comparison":
+        import numpy as np
+        import pandas as pd
+        import plotly.graph_objects as go
+        
+        competitors = data.competitor_matrix
+
         st.markdown("### Comprehensive Competitor Comparison")
         
-        col1, col2 = st.columns(2)
+        city = st.selectbox("City", ["All Cities"] + data.competitor_cities())
+        if city == "All Cities":
+            options = list(competitors.keys)
+        else:
+            present = set(data.competitors_in_city(city))
+            options = [key for key in competitors.keys if key in present]
+        
+        selected = st.multiselect(
+            "Competitors to Compare",
+            options,
+            default=options[:2],
+            format_func=competitors.names.get
+        )
         
-        with col1:
-            st.markdown("""
-            <div class='competitor-card'>
-            <h3>Dingdong</h3>
-            <p><strong>Model:</strong> Front Warehouse (Pure Online)</p>
-            <p><strong>Geographic Focus:</strong> Yangtze River Delta</p>
-            <p><strong>Strategy:</strong> Quality over expansion</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("#### Strengths")
-            for s in competitors['dingdong']['strengths']:
-                st.markdown(f"<span class='swot-positive'>✓ {s}</span>", unsafe_allow_html=True)
-            
-            st.markdown("#### Weaknesses")
-            for w in competitors['dingdong']['weaknesses']:
-                st.markdown(f"<span class='swot-negative'>✗ {w}</span>", unsafe_allow_html=True)
+        if selected:
+            st.table(competitors.compare(selected))
         
-        with col2:
-            st.markdown("""
-            <div class='competitor-card'>
-            <h3>Freshippo</h3>
-            <p><strong>Model:</strong> Store-Warehouse Integration</p>
-            <p><strong>Geographic Focus:</strong> National (Tier 1+2)</p>
-            <p><strong>Strategy:</strong> Omnichannel premium</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("#### Strengths")
-            for s in competitors['freshippo']['strengths']:
-                st.markdown(f"<span class='swot-positive'>✓ {s}</span>", unsafe_allow_html=True)
-            
-            st.markdown("#### Weaknesses")
-            for w in competitors['freshippo']['weaknesses']:
-                st.markdown(f"<span class='swot-negative'>✗ {w}</span>", unsafe_allow_html=True)
+        # Strengths and weaknesses side by side for small selections
+        if 0 < len(selected) <= MAX_COMPARISON_CARDS:
+            for col, key in zip(st.columns(len(selected)), selected):
+                comp_data = data.competitor(key)
+                with col:
+                    render_panel('competitor_card', data.number, key, lambda: competitor_card_html(comp_data))
+                    
+                    render_panel('strengths_weaknesses', data.number, key, lambda: strengths_weaknesses_html(comp_data))
         
         # Financial Performance - Dingdong
         st.markdown("---")
         st.markdown("### Dingdong Financial Performance (2021-2024)")
         
-        df_fin = pd.DataFrame(financials['annual_data'])
-        df_fin['period'] = df_fin['year'].astype(str) + ' ' + df_fin['quarter']
-        df_fin['net_loss_m'] = df_fin['net_loss'] / 1e6
+        analytics = data.financial_analytics
+        period_labels = analytics.labels()
         
-        fig = go.Figure()
-        
-        colors = ['red' if x < 0 else 'green' for x in df_fin['net_loss_m']]
+        # Long histories get a zoom range; the visible window is re-queried and downsampled
+        zoom = (0, len(period_labels) - 1)
+        if len(period_labels) > ZOOM_MIN_PERIODS:
+            zoom_start, zoom_end = st.select_slider(
+                "Zoom Range",
+                options=period_labels,
+                value=(period_labels[0], period_labels[-1])
+            )
+            zoom = (period_labels.index(zoom_start), period_labels.index(zoom_end))
         
-        fig.add_trace(go.Scatter(
-            x=df_fin['period'],
-            y=df_fin['net_loss_m'],
-            mode='lines+markers',
-            name='Net Profit/Loss',
-            line=dict(color='#2E7D32', width=3),
-            marker=dict(size=8, color=colors)
-        ))
+        def visible_points(row, n_points):
+            """Indices of the reported quarters in the zoom window, downsampled to n_points"""
+            window = np.arange(zoom[0], zoom[1] + 1)
+            window = window[~np.isnan(analytics.values[row][window])]
+            return window[downsample(analytics.periods[window], analytics.values[row][window], n_points)]
         
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Break-even")
+        def build_profit_trend_figure(window, n_points):
+            fig = go.Figure()
+            
+            for company in analytics.companies:
+                if company not in window:
+                    continue
+                periods, values = window[company]
+                points = downsample(periods, values, n_points)
+                net_loss_m = values[points] / 1e6
+                colors = ['red' if x < 0 else 'green' for x in net_loss_m]
+                
+                fig.add_trace(go.Scatter(
+                    x=[period_label(p) for p in periods[points]],
+                    y=net_loss_m,
+                    mode='lines+markers',
+                    name='Net Profit/Loss' if len(analytics.companies) == 1 else company.title(),
+                    line=dict(color='#2E7D32', width=3) if company == 'dingdong' else dict(width=2),
+                    marker=dict(size=8, color=colors)
+                ))
+            
+            fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Break-even")
+            
+            fig.update_layout(
+                title="Dingdong Profit/Loss Trend (Million CNY)" if len(analytics.companies) == 1 else "Profit/Loss Trend by Company (Million CNY)",
+                xaxis_title="Quarter",
+                yaxis_title="Net Profit/Loss (Million CNY)",
+                height=500,
+                hovermode='x unified',
+                xaxis=dict(categoryorder='array', categoryarray=period_labels[zoom[0]:zoom[1] + 1])
+            )
+            return fig
         
-        fig.update_layout(
-            title="Dingdong Profit/Loss Trend (Million CNY)",
-            xaxis_title="Quarter",
-            yaxis_title="Net Profit/Loss (Million CNY)",
-            height=500,
-            hovermode='x unified'
-        )
+        def build_profit_trend():
+            # Only the quarters inside the zoom range are fetched
+            window = (data.financial_window(analytics.periods[zoom[0]], analytics.periods[zoom[1]])
+                      if len(analytics.periods) else {})
+            return budgeted_figure(lambda n_points: build_profit_trend_figure(window, n_points),
+                                   max_points(len(window)))
         
-        st.plotly_chart(fig, use_container_width=True)
+        cached_plotly_chart('profit_trend', data.number, build_profit_trend, params=zoom)
         
         st.markdown("""
         <div class='insight-box'>
@@ -238,127 +293,199 @@ elif page == "Competitor Intelligence":
         </div>
         """, unsafe_allow_html=True)
         
-        # SKU Comparison
+        # Trend analytics and break-even forecast
         st.markdown("---")
-        st.markdown("### Product Portfolio Comparison")
+        st.markdown("### Profit/Loss Trend & Break-even Forecast")
         
-        col1, col2 = st.columns(2)
+        def build_break_even_forecast_figure(n_points):
+            fig = go.Figure()
+            
+            for row, company in enumerate(analytics.companies):
+                color = '#2E7D32' if company == 'dingdong' else None
+                points = visible_points(row, n_points)
+                
+                fig.add_trace(go.Scatter(
+                    x=[period_labels[i] for i in points],
+                    y=analytics.values[row][points] / 1e6,
+                    mode='markers',
+                    name=f"{company.title()} Actual",
+                    marker=dict(size=7, color=color)
+                ))
+                
+                fig.add_trace(go.Scatter(
+                    x=[period_labels[i] for i in points],
+                    y=analytics.rolling_mean[row][points] / 1e6,
+                    mode='lines',
+                    name=f"{company.title()} {ROLLING_WINDOW}Q Rolling Mean",
+                    line=dict(color=color, width=2)
+                ))
+                
+                forecast_labels = analytics.labels(analytics.forecast_periods[row])
+                fig.add_trace(go.Scatter(
+                    x=forecast_labels + forecast_labels[::-1],
+                    y=np.r_[analytics.forecast_upper[row], analytics.forecast_lower[row][::-1]] / 1e6,
+                    fill='toself',
+                    fillcolor='rgba(46, 125, 50, 0.15)',
+                    line=dict(width=0),
+                    hoverinfo='skip',
+                    name=f"{company.title()} 95% Band"
+                ))
+                fig.add_trace(go.Scatter(
+                    x=forecast_labels,
+                    y=analytics.forecast[row] / 1e6,
+                    mode='lines',
+                    name=f"{company.title()} Trend Forecast",
+                    line=dict(color=color, width=2, dash='dash')
+                ))
+            
+            fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Break-even")
+            
+            fig.update_layout(
+                title="Trend Forecast (Million CNY)",
+                xaxis_title="Quarter",
+                yaxis_title="Net Profit/Loss (Million CNY)",
+                height=500,
+                hovermode='x unified'
+            )
+            return fig
+        
+        cached_plotly_chart('break_even_forecast', data.number,
+                            lambda: budgeted_figure(build_break_even_forecast_figure,
+                                                    max_points(4 * len(analytics.companies))),
+                            params=zoom)
+        
+        def signed_millions(value):
+            if not np.isfinite(value):
+                return "n/a"
+            return f"{'+' if value >= 0 else '-'}¥{abs(value)/1e6:.1f}M"
+        
+        summary_rows = []
+        for row, company in enumerate(analytics.companies):
+            last = analytics.last_index[row]
+            if last < 0:
+                # No reported quarters for this company
+                continue
+            rolling_mean = analytics.rolling_mean[row][last]
+            outlook = analytics.break_even.get(company, {'status': 'not_projected'})
+            if outlook['status'] == 'reached':
+                break_even_text = f"Reached {period_label(outlook['period'])}"
+            elif outlook['status'] == 'projected':
+                band = " - ".join(period_label(p) if p is not None else "beyond horizon"
+                                  for p in (outlook['earliest'], outlook['latest']))
+                break_even_text = f"{period_label(outlook['period'])} (95% CI: {band})"
+            else:
+                break_even_text = "Not projected"
+            summary_rows.append({
+                'Company': company.title(),
+                'Latest Quarter': analytics.labels()[last],
+                'QoQ Change': signed_millions(analytics.qoq[row][last]),
+                'YoY Change': signed_millions(analytics.yoy[row][last]),
+                f'{ROLLING_WINDOW}Q Rolling Mean': f"¥{rolling_mean/1e6:.1f}M" if np.isfinite(rolling_mean) else "n/a",
+                'Trend per Quarter': signed_millions(analytics.slope[row]),
+                'Break-even': break_even_text,
+            })
+        st.dataframe(pd.DataFrame(summary_rows), hide_index=True, use_container_width=True)
         
-        with col1:
-            fig1 = go.Figure(data=[go.Pie(
-                labels=list(competitors['dingdong']['product_categories'].keys()),
-                values=list(competitors['dingdong']['product_categories'].values()),
-                hole=0.3,
-                marker_colors=['#2E7D32', '#66BB6A', '#A5D6A7', '#C8E6C9', '#E8F5E9']
-            )])
-            fig1.update_layout(title="Dingdong Product Mix", height=400)
-            st.plotly_chart(fig1, use_container_width=True)
+        # SKU Comparison
+        st.markdown("---")
+        st.markdown("### Product Portfolio Comparison")
         
-        with col2:
-            fig2 = go.Figure(data=[go.Pie(
-                labels=list(competitors['freshippo']['product_categories'].keys()),
-                values=list(competitors['freshippo']['product_categories'].values()),
-                hole=0.3,
-                marker_colors=['#1565C0', '#42A5F5', '#90CAF9', '#BBDEFB', '#E3F2FD']
-            )])
-            fig2.update_layout(title="Freshippo Product Mix", height=400)
-            st.plotly_chart(fig2, use_container_width=True)
+        if selected:
+            def build_product_mix_comparison_figure():
+                mix = competitors.mix(selected)
+                
+                fig = go.Figure()
+                
+                for name in mix.columns:
+                    fig.add_trace(go.Bar(
+                        name=name,
+                        x=mix.index,
+                        y=mix[name] * 100
+                    ))
+                
+                fig.update_layout(
+                    title="Product Mix Comparison (% of sales)",
+                    barmode='group',
+                    yaxis_title="Share (%)",
+                    height=400
+                )
+                return fig
+            
+            cached_plotly_chart('product_mix_comparison', data.number, build_product_mix_comparison_figure,
+                                params=tuple(selected))
         
         # Technology Capabilities
         st.markdown("---")
         st.markdown("### Technology & Innovation Capabilities")
         
-        tech_comparison = {
-            "Capability": ["AI Integration", "Traceability", "Membership System", "Omnichannel", "Supply Chain Digitization"],
-            "Dingdong": [0.75, 0.25, 0.85, 0.00, 0.70],
-            "Freshippo": [0.60, 0.30, 0.75, 0.95, 0.65]
-        }
-        
-        df_tech = pd.DataFrame(tech_comparison)
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            name='Dingdong',
-            x=df_tech['Capability'],
-            y=df_tech['Dingdong'],
-            marker_color='#2E7D32'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Freshippo',
-            x=df_tech['Capability'],
-            y=df_tech['Freshippo'],
-            marker_color='#1565C0'
-        ))
-        
-        fig.update_layout(
-            title="Technology Capability Comparison (0-1 scale)",
-            barmode='group',
-            height=400,
-            yaxis=dict(range=[0, 1])
-        )
+        def build_tech_comparison_figure():
+            tech_comparison = {
+                "Capability": ["AI Integration", "Traceability", "Membership System", "Omnichannel", "Supply Chain Digitization"],
+                "Dingdong": [0.75, 0.25, 0.85, 0.00, 0.70],
+                "Freshippo": [0.60, 0.30, 0.75, 0.95, 0.65]
+            }
+            
+            df_tech = pd.DataFrame(tech_comparison)
+            
+            fig = go.Figure()
+            
+            fig.add_trace(go.Bar(
+                name='Dingdong',
+                x=df_tech['Capability'],
+                y=df_tech['Dingdong'],
+                marker_color='#2E7D32'
+            ))
+            
+            fig.add_trace(go.Bar(
+                name='Freshippo',
+                x=df_tech['Capability'],
+                y=df_tech['Freshippo'],
+                marker_color='#1565C0'
+            ))
+            
+            fig.update_layout(
+                title="Technology Capability Comparison (0-1 scale)",
+                barmode='group',
+                height=400,
+                yaxis=dict(range=[0, 1])
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        cached_plotly_chart('tech_capabilities', data.number, build_tech_comparison_figure)
     
     elif competitor == "Dingdong":
-        comp_data = competitors['dingdong']
-        st.markdown(f"### {comp_data['name']} - Detailed Analysis")
+        comp_data = data.competitor('dingdong')
+        st.markdown(f"### {comp_data.name} - Detailed Analysis")
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Business Model", comp_data['model'])
+            st.metric("Business Model", comp_data.model)
         with col2:
-            st.metric("SKU Count", f"{comp_data['sku_count']:,}")
+            st.metric("SKU Count", f"{comp_data.sku_count:,}")
         with col3:
-            st.metric("City Coverage", len(comp_data['cities']))
+            st.metric("City Coverage", len(comp_data.cities))
         
         st.markdown("#### City Strategy")
-        st.info(comp_data['city_strategy'])
+        st.info(comp_data.city_strategy)
         
         st.markdown("#### Covered Cities")
-        st.write(", ".join(comp_data['cities']))
+        st.write(", ".join(comp_data.cities))
         
         # SWOT Analysis
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Strengths")
-            for s in comp_data['strengths']:
-                st.success(s)
-            
-            st.markdown("#### Opportunities")
-            for o in comp_data['opportunities']:
-                st.info(o)
+        render_panel('swot', data.number, comp_data.key, lambda: swot_html(comp_data))
         
-        with col2:
-            st.markdown("#### Weaknesses")
-            for w in comp_data['weaknesses']:
-                st.warning(w)
-            
-            st.markdown("#### Threats")
-            for t in comp_data['threats']:
-                st.error(t)
-        
-        # AI Features
-        st.markdown("#### AI Features")
-        for feature in comp_data['ai_features']:
-            st.markdown(f"- {feature}")
-        
-        # Membership Benefits
-        st.markdown("#### Membership Benefits")
-        for benefit in comp_data['membership_benefits']:
-            st.markdown(f"- {benefit}")
+        # AI Features and Membership Benefits
+        render_panel('features', data.number, comp_data.key, lambda: features_html(comp_data))
     
     else:  # Freshippo
-        comp_data = competitors['freshippo']
-        st.markdown(f"### {comp_data['name']} - Detailed Analysis")
+        comp_data = data.competitor('freshippo')
+        st.markdown(f"### {comp_data.name} - Detailed Analysis")
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Business Model", comp_data['model'])
+            st.metric("Business Model", comp_data.model)
         with col2:
-            st.metric("SKU Count", f"{comp_data['sku_count']:,}")
+            st.metric("SKU Count", f"{comp_data.sku_count:,}")
         with col3:
             st.metric("Formats", "2 (Fresh + NB)")
         
@@ -367,69 +494,31 @@ elif page == "Competitor Intelligence":
         
         with col1:
             st.markdown("**Freshippo Fresh**")
-            st.write(f"- Target: {comp_data['formats']['hema_fresh']['target']}")
-            st.write(f"- Positioning: {comp_data['formats']['hema_fresh']['positioning']}")
-            st.write(f"- Format: {comp_data['formats']['hema_fresh']['store_size']}")
+            st.write(f"- Target: {comp_data.formats['hema_fresh']['target']}")
+            st.write(f"- Positioning: {comp_data.formats['hema_fresh']['positioning']}")
+            st.write(f"- Format: {comp_data.formats['hema_fresh']['store_size']}")
         
         with col2:
             st.markdown("**Freshippo NB (Neighborhood)**")
-            st.write(f"- Target: {comp_data['formats']['hema_nb']['target']}")
-            st.write(f"- Positioning: {comp_data['formats']['hema_nb']['positioning']}")
-            st.write(f"- Format: {comp_data['formats']['hema_nb']['store_size']}")
+            st.write(f"- Target: {comp_data.formats['hema_nb']['target']}")
+            st.write(f"- Positioning: {comp_data.formats['hema_nb']['positioning']}")
+            st.write(f"- Format: {comp_data.formats['hema_nb']['store_size']}")
         
         # SWOT Analysis
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Strengths")
-            for s in comp_data['strengths']:
-                st.success(s)
-            
-            st.markdown("#### Opportunities")
-            for o in comp_data['opportunities']:
-                st.info(o)
-        
-        with col2:
-            st.markdown("#### Weaknesses")
-            for w in comp_data['weaknesses']:
-                st.warning(w)
-            
-            st.markdown("#### Threats")
-            for t in comp_data['threats']:
-                st.error(t)
+        render_panel('swot', data.number, comp_data.key, lambda: swot_html(comp_data))
 
 # ============ MARKET ANALYSIS PAGE ============
 elif page == "Market Analysis":
+    import pandas as pd
+    
+    market = data.market
+
     st.title("Market Analysis & Industry Trends")
     
     # Market Size Growth
     st.markdown("### Market Size & Growth Trajectory")
     
-    years = [2023, 2024, 2025]
-    sizes = [
-        market['market_size_2023']/1e9,
-        market['market_size_2024']/1e9,
-        market['market_size_2025_projected']/1e9
-    ]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=years,
-        y=sizes,
-        text=[f'¥{s:.1f}B' for s in sizes],
-        textposition='outside',
-        marker_color='#2E7D32'
-    ))
-    
-    fig.update_layout(
-        title=f"Chinese Fresh E-commerce Market Size (CAGR: {market['growth_rate_cagr']*100:.0f}%)",
-        xaxis_title="Year",
-        yaxis_title="Market Size (Billion CNY)",
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    cached_plotly_chart('market_size', data.number, lambda: market_size_figure(data))
     
     # City Tier Penetration
     st.markdown("### Instant Retail Penetration by City Tier")
@@ -437,25 +526,7 @@ elif page == "Market Analysis":
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        penetration_data = market['instant_retail_penetration']
-        
-        fig = go.Figure(go.Bar(
-            x=list(penetration_data.keys()),
-            y=[v*100 for v in penetration_data.values()],
-            text=[f'{v*100:.0f}%' for v in penetration_data.values()],
-            textposition='outside',
-            marker_color=['#1B5E20', '#2E7D32', '#66BB6A', '#A5D6A7']
-        ))
-        
-        fig.update_layout(
-            title="Instant Retail Market Penetration",
-            xaxis_title="City Tier",
-            yaxis_title="Penetration Rate (%)",
-            height=400,
-            yaxis=dict(range=[0, 50])
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        cached_plotly_chart('tier_penetration', data.number, lambda: tier_penetration_figure(data))
     
     with col2:
         st.markdown("""
@@ -474,22 +545,7 @@ elif page == "Market Analysis":
     st.markdown("---")
     st.markdown("### Consumer Segmentation")
     
-    segment_data = market['consumer_segments']
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=list(segment_data.keys()),
-        values=list(segment_data.values()),
-        hole=0.4,
-        marker_colors=['#2E7D32', '#FFA726', '#42A5F5'],
-        textinfo='label+percent'
-    )])
-    
-    fig.update_layout(
-        title="Consumer Segment Distribution",
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    cached_plotly_chart('consumer_segments', data.number, lambda: consumer_segments_figure(data))
     
     # Pain Points Analysis
     st.markdown("---")
@@ -506,25 +562,7 @@ elif page == "Market Analysis":
         for k, v in pain_points.items()
     ]).sort_values('Severity', ascending=True)
     
-    fig = go.Figure(go.Bar(
-        x=pain_df['Severity'],
-        y=pain_df['Pain Point'],
-        orientation='h',
-        text=[f'{s*100:.0f}%' for s in pain_df['Severity']],
-        textposition='outside',
-        marker_color=['#C62828' if s > 0.8 else '#F57C00' if s > 0.7 else '#FFA726' 
-                      for s in pain_df['Severity']]
-    ))
-    
-    fig.update_layout(
-        title="Industry Pain Points by Severity",
-        xaxis_title="Severity Score",
-        yaxis_title="",
-        height=500,
-        xaxis=dict(range=[0, 1])
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    cached_plotly_chart('pain_points', data.number, lambda: pain_points_figure(data))
     
     # Display descriptions
     with st.expander("View Pain Point Descriptions"):
@@ -571,105 +609,44 @@ elif page == "Market Analysis":
     st.markdown("---")
     st.markdown("### Industry Health Index")
     
-    health_metrics = {
-        'Market Growth': 0.85,
-        'Profitability': 0.45,
-        'Technology Adoption': 0.65,
-        'Supply Chain Maturity': 0.58,
-        'Customer Satisfaction': 0.62,
-        'Competitive Intensity': 0.75
-    }
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=list(health_metrics.values()),
-        theta=list(health_metrics.keys()),
-        fill='toself',
-        fillcolor='rgba(46, 125, 50, 0.3)',
-        line=dict(color='#2E7D32', width=2)
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(visible=True, range=[0, 1])
-        ),
-        title="Industry Health Assessment (0-1 scale)",
-        height=500
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    cached_plotly_chart('health_index', data.number, lambda: health_index_figure(data))
 
 # ============ CUSTOMER INSIGHTS PAGE ============
 elif page == "Customer Insights":
     st.title("Customer Insights & Segmentation Analysis")
     
     # Use fixed segment - Pragmatic Middle-Class Families
-    segment_key = 'pragmatic_middle_class'
-    segment = segments[segment_key]
+    segment_key = DEFAULT_SEGMENT
+    segment = data.segment(segment_key)
     
     # Segment Overview
-    st.markdown(f"### {segment['segment_name']}")
+    st.markdown(f"### {segment.segment_name}")
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Market Share", f"{segment['percentage']*100:.0f}%")
+        st.metric("Market Share", f"{segment.percentage*100:.0f}%")
     with col2:
-        st.metric("Income Range", f"¥{segment['income_range_cny']}")
+        st.metric("Income Range", f"¥{segment.income_range_cny}")
     with col3:
-        if 'age_range' in segment:
-            st.metric("Age Range", segment['age_range'])
+        if segment.age_range:
+            st.metric("Age Range", segment.age_range)
     with col4:
-        if 'household_size' in segment:
-            st.metric("Household", segment['household_size'])
+        if segment.household_size:
+            st.metric("Household", segment.household_size)
     
     # Jobs to Be Done
     st.markdown("---")
     st.markdown("### Jobs to Be Done (JTBD)")
-    st.info(segment['jobs_to_be_done'])
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("#### Functional Jobs")
-        for job in segment['functional_jobs']:
-            st.markdown(f"- {job}")
+    st.info(segment.jobs_to_be_done)
     
-    with col2:
-        st.markdown("#### Emotional Jobs")
-        for job in segment['emotional_jobs']:
-            st.markdown(f"- {job}")
-    
-    with col3:
-        st.markdown("#### Social Jobs")
-        for job in segment['social_jobs']:
-            st.markdown(f"- {job}")
+    render_panel('jobs', data.number, segment_key, lambda: jobs_html(segment))
     
     # Priorities
     st.markdown("---")
     st.markdown("### Customer Priorities")
     
-    priorities = segment['priorities']
-    
-    fig = go.Figure(go.Bar(
-        x=list(priorities.values()),
-        y=list(priorities.keys()),
-        orientation='h',
-        text=[f'{v*100:.0f}%' for v in priorities.values()],
-        textposition='outside',
-        marker_color='#2E7D32'
-    ))
-    
-    fig.update_layout(
-        title="Priority Rankings",
-        xaxis_title="Importance Score",
-        yaxis_title="",
-        height=400,
-        xaxis=dict(range=[0, 1])
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    cached_plotly_chart('priorities', data.number, lambda: priorities_figure(data, segment_key), params=segment_key)
     
     if segment_key == 'pragmatic_middle_class':
         # Pain Points
@@ -679,64 +656,28 @@ elif page == "Customer Insights":
         tab1, tab2, tab3 = st.tabs(["Functional Pains", "Emotional Pains", "Social Pains"])
         
         with tab1:
-            for pain in segment['pain_points']['functional']:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"**{pain['pain']}**")
-                with col2:
-                    severity_color = '#C62828' if pain['severity'] > 0.8 else '#F57C00'
-                    st.markdown(f"<span style='color: {severity_color}; font-weight: bold;'>{pain['severity']*100:.0f}% severity</span>", unsafe_allow_html=True)
-                st.caption(f"Frequency: {pain['frequency']}")
-                st.markdown("---")
+            render_panel('functional_pains', data.number, segment_key,
+                         lambda: pains_html(segment.pain_points['functional']))
         
         with tab2:
-            for pain in segment['pain_points']['emotional']:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"**{pain['pain']}**")
-                with col2:
-                    severity_color = '#C62828' if pain['severity'] > 0.8 else '#F57C00'
-                    st.markdown(f"<span style='color: {severity_color}; font-weight: bold;'>{pain['severity']*100:.0f}% severity</span>", unsafe_allow_html=True)
-                st.caption(f"Frequency: {pain['frequency']}")
-                st.markdown("---")
+            render_panel('emotional_pains', data.number, segment_key,
+                         lambda: pains_html(segment.pain_points['emotional']))
         
         with tab3:
-            for pain in segment['pain_points']['social']:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.markdown(f"**{pain['pain']}**")
-                with col2:
-                    severity_color = '#C62828' if pain['severity'] > 0.8 else '#F57C00'
-                    st.markdown(f"<span style='color: {severity_color}; font-weight: bold;'>{pain['severity']*100:.0f}% severity</span>", unsafe_allow_html=True)
-                st.caption(f"Frequency: {pain['frequency']}")
-                st.markdown("---")
+            render_panel('social_pains', data.number, segment_key,
+                         lambda: pains_html(segment.pain_points['social']))
         
         # Gains
         st.markdown("---")
         st.markdown("### Expected Gains")
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("#### Functional Gains")
-            for gain in segment['gains']['functional']:
-                st.success(gain)
-        
-        with col2:
-            st.markdown("#### Emotional Gains")
-            for gain in segment['gains']['emotional']:
-                st.success(gain)
-        
-        with col3:
-            st.markdown("#### Social Gains")
-            for gain in segment['gains']['social']:
-                st.success(gain)
+        render_panel('gains', data.number, segment_key, lambda: gains_html(segment))
         
         # Shopping Behavior
         st.markdown("---")
         st.markdown("### Shopping Behavior Profile")
         
-        behavior = segment['shopping_behavior']
+        behavior = segment.shopping_behavior
         
         col1, col2, col3 = st.columns(3)
         
@@ -755,21 +696,8 @@ elif page == "Customer Insights":
         st.markdown("---")
         st.markdown("### Product Preferences")
         
-        prefs = segment['product_preferences']
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=list(prefs.keys()),
-            values=list(prefs.values()),
-            hole=0.3,
-            textinfo='label+percent'
-        )])
-        
-        fig.update_layout(
-            title="Product Category Preferences",
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        cached_plotly_chart('product_preferences', data.number, lambda: product_preferences_figure(data, segment_key),
+                            params=segment_key)
 
 # ============ OPPORTUNITY ENGINE PAGE ============
 elif page == "Opportunity Engine":
@@ -788,92 +716,129 @@ elif page == "Opportunity Engine":
     # Opportunity Scoring
     st.markdown("### Market Opportunity Scoring")
     
-    opportunities = [
-        {
-            'Opportunity': 'Full Supply Chain Traceability',
-            'Market Need': 0.95,
-            'Competitor Gap': 0.75,
-            'CP Capability': 0.85,
-            'Market Size': 0.80,
-            'Score': 0
-        },
-        {
-            'Opportunity': 'Organic & Low-Pesticide Products',
-            'Market Need': 0.85,
-            'Competitor Gap': 0.90,
-            'CP Capability': 0.80,
-            'Market Size': 0.65,
-            'Score': 0
-        },
-        {
-            'Opportunity': 'Price-Quality Optimization Platform',
-            'Market Need': 0.90,
-            'Competitor Gap': 0.85,
-            'CP Capability': 0.75,
-            'Market Size': 0.90,
-            'Score': 0
-        },
-        {
-            'Opportunity': 'AI-Powered Personalization',
-            'Market Need': 0.75,
-            'Competitor Gap': 0.60,
-            'CP Capability': 0.70,
-            'Market Size': 0.85,
-            'Score': 0
-        },
-        {
-            'Opportunity': 'Community-Based Distribution',
-            'Market Need': 0.70,
-            'Competitor Gap': 0.50,
-            'CP Capability': 0.90,
-            'Market Size': 0.70,
-            'Score': 0
-        }
-    ]
+    # Bounds on the figures sent per rerun
+    MAX_RADAR_FIGURES = 3
+    MAX_SMALL_MULTIPLES = 12
     
-    # Calculate scores
-    for opp in opportunities:
-        opp['Score'] = (
-            opp['Market Need'] * 0.3 +
-            opp['Competitor Gap'] * 0.25 +
-            opp['CP Capability'] * 0.25 +
-            opp['Market Size'] * 0.2
-        )
-    
-    opportunities.sort(key=lambda x: x['Score'], reverse=True)
-    
-    # Display opportunity cards
-    for i, opp in enumerate(opportunities):
-        with st.expander(f"#{i+1} {opp['Opportunity']} - Score: {opp['Score']*100:.1f}/100"):
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Market Need", f"{opp['Market Need']*100:.0f}%")
-            with col2:
-                st.metric("Competitor Gap", f"{opp['Competitor Gap']*100:.0f}%")
-            with col3:
-                st.metric("CP Capability", f"{opp['CP Capability']*100:.0f}%")
-            with col4:
-                st.metric("Market Size", f"{opp['Market Size']*100:.0f}%")
-            
-            # Radar chart for this opportunity
-            fig = go.Figure()
+    @timed_fragment
+    def render_opportunity_scoring(data):
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
+        matrix = data.opportunities
+        
+        st.markdown("Adjust the criteria weights to re-score every candidate opportunity:")
+        
+        weights = []
+        for col, criterion, default in zip(st.columns(len(matrix.criteria)), matrix.criteria, matrix.default_weights):
+            with col:
+                weights.append(st.slider(f"{criterion} Weight", 0, 100, int(round(default * 100)),
+                                         key=f"opportunity_weight_{criterion}"))
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            regions = matrix.region_names
+            region = None
+            if len(regions) > 1:
+                region = st.selectbox("Region", ["All Regions"] + regions)
+                if region == "All Regions":
+                    region = None
+        
+        with col2:
+            top_n = 5
+            if len(matrix) > 5:
+                top_n = st.slider("Opportunities to Show", 1, min(len(matrix), 50), 5)
+        
+        top_indices, top_scores = matrix.top_k(top_n, weights, region)
+        
+        view = st.radio("View", ["Opportunity Cards", "Small Multiples"], horizontal=True,
+                        key="opportunity_view")
+        
+        if view == "Small Multiples":
+            # One combined figure for the top N instead of one figure per opportunity
+            n_panels = min(len(top_indices), MAX_SMALL_MULTIPLES)
             
-            fig.add_trace(go.Scatterpolar(
-                r=[opp['Market Need'], opp['Competitor Gap'], opp['CP Capability'], opp['Market Size']],
-                theta=['Market Need', 'Competitor Gap', 'CP Capability', 'Market Size'],
-                fill='toself',
-                fillcolor='rgba(46, 125, 50, 0.3)',
-                line=dict(color='#2E7D32', width=2)
-            ))
+            def build_opportunity_small_multiples_figure():
+                cols = min(n_panels, 4)
+                rows = -(-n_panels // cols)
+                fig = make_subplots(
+                    rows=rows,
+                    cols=cols,
+                    specs=[[{'type': 'polar'}] * cols for _ in range(rows)],
+                    subplot_titles=[f"#{rank+1} {matrix.names[i]} ({score*100:.1f})"
+                                    for rank, (i, score) in enumerate(zip(top_indices[:n_panels], top_scores))],
+                    vertical_spacing=0.12
+                )
+                
+                for panel, i in enumerate(top_indices[:n_panels]):
+                    fig.add_trace(go.Scatterpolar(
+                        r=list(matrix.values[i]),
+                        theta=list(matrix.criteria),
+                        fill='toself',
+                        fillcolor='rgba(46, 125, 50, 0.3)',
+                        line=dict(color='#2E7D32', width=2),
+                        name=matrix.names[i]
+                    ), row=panel // cols + 1, col=panel % cols + 1)
+                
+                fig.update_polars(radialaxis=dict(visible=True, range=[0, 1], showticklabels=False))
+                fig.update_annotations(font_size=12)
+                fig.update_layout(
+                    showlegend=False,
+                    height=320 * rows,
+                    margin=dict(l=40, r=40, t=60, b=20)
+                )
+                return fig
             
-            fig.update_layout(
-                polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
-                height=300,
-                margin=dict(l=80, r=80, t=20, b=20)
-            )
+            cached_plotly_chart('opportunity_small_multiples', data.number,
+                                build_opportunity_small_multiples_figure,
+                                params=(tuple(weights), region, n_panels))
+            if len(top_indices) > n_panels:
+                st.caption(f"Showing the top {n_panels} of {len(top_indices)} opportunities")
+        else:
+            # Radar charts are built only for opened cards, at most MAX_RADAR_FIGURES per rerun
+            figures_sent = 0
             
-            st.plotly_chart(fig, use_container_width=True)
+            for rank, (i, score) in enumerate(zip(top_indices, top_scores)):
+                name = matrix.names[i]
+                values = matrix.values[i]
+                
+                with st.expander(f"#{rank+1} {name} - Score: {score*100:.1f}/100"):
+                    for col, criterion, value in zip(st.columns(len(matrix.criteria)), matrix.criteria, values):
+                        with col:
+                            st.metric(criterion, f"{value*100:.0f}%")
+                    
+                    if not st.toggle("Show Radar Chart", key=f"opportunity_radar_{name}"):
+                        continue
+                    
+                    if figures_sent >= MAX_RADAR_FIGURES:
+                        st.caption(f"Up to {MAX_RADAR_FIGURES} radar charts are shown at once - "
+                                   f"hide another one or use the Small Multiples view")
+                        continue
+                    
+                    # Radar chart for this opportunity
+                    def build_opportunity_radar_figure():
+                        fig = go.Figure()
+                        
+                        fig.add_trace(go.Scatterpolar(
+                            r=list(values),
+                            theta=list(matrix.criteria),
+                            fill='toself',
+                            fillcolor='rgba(46, 125, 50, 0.3)',
+                            line=dict(color='#2E7D32', width=2)
+                        ))
+                        
+                        fig.update_layout(
+                            polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+                            height=300,
+                            margin=dict(l=80, r=80, t=20, b=20)
+                        )
+                        return fig
+                    
+                    cached_plotly_chart('opportunity_radar', data.number, build_opportunity_radar_figure, params=int(i))
+                    figures_sent += 1
+    
+    render_opportunity_scoring(data)
     
     # Strategic Recommendations
     st.markdown("---")
@@ -913,113 +878,255 @@ elif page == "Opportunity Engine":
     st.markdown("---")
     st.markdown("### City Entry Priority Ranking")
     
-    city_data = {
-        'City': ['Shanghai', 'Beijing', 'Hangzhou', 'Guangzhou', 'Shenzhen', 'Suzhou', 'Nanjing', 'Chengdu'],
-        'Market Size': [0.95, 0.90, 0.75, 0.85, 0.80, 0.65, 0.70, 0.75],
-        'Competition': [0.90, 0.85, 0.70, 0.80, 0.80, 0.60, 0.65, 0.70],
-        'Infrastructure': [0.95, 0.90, 0.85, 0.85, 0.85, 0.80, 0.75, 0.70],
-        'Target Segment': [0.90, 0.85, 0.80, 0.75, 0.75, 0.85, 0.80, 0.65]
-    }
-    
-    df_cities = pd.DataFrame(city_data)
-    df_cities['Priority Score'] = (
-        df_cities['Market Size'] * 0.3 +
-        (1 - df_cities['Competition']) * 0.2 +
-        df_cities['Infrastructure'] * 0.25 +
-        df_cities['Target Segment'] * 0.25
-    )
-    
-    df_cities = df_cities.sort_values('Priority Score', ascending=False)
-    
-    fig = go.Figure(go.Bar(
-        x=df_cities['Priority Score'],
-        y=df_cities['City'],
-        orientation='h',
-        text=[f'{s*100:.1f}' for s in df_cities['Priority Score']],
-        textposition='outside',
-        marker_color='#2E7D32'
-    ))
-    
-    fig.update_layout(
-        title="City Entry Priority Scores",
-        xaxis_title="Priority Score",
-        yaxis_title="",
-        height=400,
-        xaxis=dict(range=[0, 1])
-    )
+    @timed_fragment
+    def render_city_priority(data):
+        import pandas as pd
+        import plotly.graph_objects as go
+        
+        cities = data.cities
+        
+        top_cities = len(cities)
+        if len(cities) > 15:
+            top_cities = st.slider("Cities to Show", 5, min(len(cities), 100), 15)
+        
+        def build_city_priority_figure():
+            order, scores = cities.ranking()
+            order, scores = order[:top_cities][::-1], scores[:top_cities][::-1]
+            
+            fig = go.Figure(go.Bar(
+                x=scores,
+                y=cities.names[order],
+                orientation='h',
+                text=[f'{s*100:.1f}' for s in scores],
+                textposition='outside',
+                marker_color='#2E7D32'
+            ))
+            
+            fig.update_layout(
+                title="City Entry Priority Scores",
+                xaxis_title="Priority Score",
+                yaxis_title="",
+                height=max(400, 25 * top_cities),
+                xaxis=dict(range=[0, 1])
+            )
+            return fig
+        
+        cached_plotly_chart('city_priority', data.number, build_city_priority_figure, params=top_cities)
+        
+        if st.checkbox("Sensitivity Analysis", help="Re-rank every city under random perturbations of the criteria weights"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                n_samples = st.slider("Weight Perturbations", 1000, 20000, 5000, step=1000)
+            
+            with col2:
+                spread = st.slider("Perturbation Size (%)", 5, 100, 25, step=5)
+            
+            stability = cities.rank_stability(n_samples=n_samples, spread=spread / 100, top_k=3, seed=0)
+            
+            df_stability = pd.DataFrame({
+                'City': cities.names,
+                'Tier': cities.tiers,
+                'Base Rank': stability['base_rank'],
+                'Mean Rank': stability['mean_rank'].round(2),
+                '90% Rank Range': [f"{lo}-{hi}" for lo, hi in zip(stability['p5_rank'], stability['p95_rank'])],
+                'Same Rank': [f"{p*100:.0f}%" for p in stability['same_rank']],
+                'Top 3': [f"{p*100:.0f}%" for p in stability['top_k']],
+            }).sort_values('Base Rank')
+            
+            st.dataframe(df_stability, hide_index=True, use_container_width=True)
+            st.caption(f"{n_samples:,} weight perturbations x {len(cities)} cities ranked in {stability['elapsed_ms']:.0f} ms")
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_city_priority(data)
     
     # ROI Simulation
     st.markdown("---")
     st.markdown("### Market Entry Strategy Simulator")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        entry_model = st.selectbox(
-            "Business Model",
-            ["Front Warehouse", "Store-Warehouse Integration", "Hybrid Model"]
-        )
-        
-        initial_cities = st.slider("Initial City Coverage", 1, 5, 3)
+    @timed_fragment
+    def render_entry_simulator(data):
+        import pandas as pd
+        import plotly.graph_objects as go
         
-        traceability_level = st.slider("Traceability Coverage", 0, 100, 80)
-    
-    with col2:
-        organic_focus = st.slider("Organic Product Focus", 0, 100, 60)
-        
-        tech_investment = st.slider("AI/Tech Investment Level", 0, 100, 70)
-        
-        price_positioning = st.selectbox(
-            "Price Positioning",
-            ["Premium", "Mid-range", "Value"]
-        )
-    
-    if st.button("Calculate Entry Strategy ROI", type="primary"):
-        # Simple simulation
-        base_score = 50
-        
-        if entry_model == "Hybrid Model":
-            base_score += 15
-        elif entry_model == "Store-Warehouse Integration":
-            base_score += 10
-        else:
-            base_score += 5
-        
-        base_score += initial_cities * 3
-        base_score += traceability_level * 0.2
-        base_score += organic_focus * 0.15
-        base_score += tech_investment * 0.1
-        
-        if price_positioning == "Mid-range":
-            base_score += 10
+        col1, col2 = st.columns(2)
         
-        success_probability = min(base_score, 95)
+        with col1:
+            entry_model = st.selectbox(
+                "Business Model",
+                ["Front Warehouse", "Store-Warehouse Integration", "Hybrid Model"]
+            )
+            
+            initial_cities = st.slider("Initial City Coverage", 1, 5, 3)
+            
+            traceability_level = st.slider("Traceability Coverage", 0, 100, 80)
         
-        st.markdown("---")
-        st.markdown("### Simulation Results")
+        with col2:
+            organic_focus = st.slider("Organic Product Focus", 0, 100, 60)
+            
+            tech_investment = st.slider("AI/Tech Investment Level", 0, 100, 70)
+            
+            price_positioning = st.selectbox(
+                "Price Positioning",
+                ["Premium", "Mid-range", "Value"]
+            )
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Success Probability", f"{success_probability:.1f}%")
+            simulation_mode = st.radio("Simulation Mode", ["Deterministic", "Monte Carlo", "Optimize"], horizontal=True)
+        
         with col2:
-            est_market_share = success_probability * 0.08
-            st.metric("Est. Market Share (Y3)", f"{est_market_share:.1f}%")
-        with col3:
-            est_revenue = est_market_share * market['market_size_2025_projected'] / 100
-            st.metric("Est. Revenue (Y3)", f"¥{est_revenue/1e9:.2f}B")
-        
-        st.success(f"""
-        **Recommendation:** This configuration shows {success_probability:.1f}% success probability.
-        
-        Key factors:
-        - {entry_model} model provides operational flexibility
-        - {traceability_level}% traceability coverage addresses major pain point
-        - {organic_focus}% organic focus taps into underserved market
-        - {initial_cities} cities allows manageable scaling
-        """)
+            if simulation_mode == "Monte Carlo":
+                n_scenarios = st.select_slider(
+                    "Scenarios",
+                    options=[100_000, 250_000, 500_000, 1_000_000],
+                    value=1_000_000,
+                    format_func=lambda n: f"{n:,}"
+                )
+                use_pool = st.checkbox("Run batches on a process pool", value=(os.cpu_count() or 1) > 1)
+            elif simulation_mode == "Optimize":
+                slider_step = st.select_slider("Slider Step", options=[10, 5, 2, 1], value=1,
+                                               help="Grid resolution for the three 0-100 sliders")
+        
+        config = EntryConfig(entry_model, initial_cities, traceability_level, organic_focus,
+                             tech_investment, price_positioning)
+        
+        if st.button("Calculate Entry Strategy ROI", type="primary"):
+            market = data.market
+            
+            st.markdown("---")
+            st.markdown("### Simulation Results")
+            
+            if simulation_mode == "Deterministic":
+                success_probability, est_market_share, est_revenue = simulate(config, market)
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Success Probability", f"{success_probability:.1f}%")
+                with col2:
+                    st.metric("Est. Market Share (Y3)", f"{est_market_share:.1f}%")
+                with col3:
+                    st.metric("Est. Revenue (Y3)", f"¥{est_revenue/1e9:.2f}B")
+                
+                st.success(f"""
+                **Recommendation:** This configuration shows {success_probability:.1f}% success probability.
+                
+                Key factors:
+                - {entry_model} model provides operational flexibility
+                - {traceability_level}% traceability coverage addresses major pain point
+                - {organic_focus}% organic focus taps into underserved market
+                - {initial_cities} cities allows manageable scaling
+                """)
+            elif simulation_mode == "Monte Carlo":
+                result = run_monte_carlo(config, market, n_scenarios=n_scenarios, use_pool=use_pool)
+                revenue = result['revenue_percentiles']
+                success = result['success_percentiles']
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Median Success Probability", f"{success[50]:.1f}%")
+                with col2:
+                    st.metric("Median Revenue (Y3)", f"¥{revenue[50]/1e9:.2f}B")
+                with col3:
+                    st.metric("90% Revenue Band", f"¥{revenue[5]/1e9:.1f}B - ¥{revenue[95]/1e9:.1f}B")
+                
+                counts, edges = result['histogram']
+                centers = (edges[:-1] + edges[1:]) / 2 / 1e9
+                
+                fig = go.Figure(go.Bar(
+                    x=centers,
+                    y=counts / counts.sum() * 100,
+                    marker_color='#66BB6A'
+                ))
+                
+                for pct, dash in ((5, 'dot'), (50, 'solid'), (95, 'dot')):
+                    fig.add_vline(x=revenue[pct] / 1e9, line=dict(color='#1B5E20', dash=dash),
+                                  annotation_text=f"P{pct}")
+                
+                fig.update_layout(
+                    title="Year-3 Revenue Distribution",
+                    xaxis_title="Revenue (Billion CNY)",
+                    yaxis_title="Share of Scenarios (%)",
+                    bargap=0,
+                    height=400
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                df_bands = pd.DataFrame({
+                    'Percentile': [f"P{p}" for p in revenue],
+                    'Success Probability': [f"{v:.1f}%" for v in success.values()],
+                    'Revenue (Y3)': [f"¥{v/1e9:.2f}B" for v in revenue.values()],
+                })
+                st.dataframe(df_bands, hide_index=True, use_container_width=True)
+                st.caption(f"{result['n_scenarios']:,} scenarios over CAGR, penetration and fulfillment cost "
+                           f"in {result['elapsed_ms']:.0f} ms")
+            else:
+                result = optimize(slider_step)
+                front = result['front']
+                stats = result['stats']
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("Configurations Evaluated", f"{stats['n_evaluated']:,}")
+                with col2:
+                    st.metric("Pareto-Optimal Configurations", f"{len(front):,}")
+                with col3:
+                    if result['cached']:
+                        st.metric("Search Time", "Cached",
+                                  help=f"Reused from an earlier search that took {stats['elapsed_ms']/1000:.2f}s")
+                    else:
+                        st.metric("Search Time", f"{stats['elapsed_ms']/1000:.2f}s")
+                
+                fig = go.Figure()
+                
+                fig.add_trace(go.Scatter(
+                    x=[f['investment']/1e9 for f in front],
+                    y=[f['success'] for f in front],
+                    mode='lines+markers',
+                    name='Pareto Front',
+                    line=dict(color='#2E7D32', width=2),
+                    marker=dict(size=4)
+                ))
+                
+                fig.add_trace(go.Scatter(
+                    x=[config_investment(config)/1e9],
+                    y=[config_score(config)],
+                    mode='markers',
+                    name='Current Configuration',
+                    marker=dict(color='#C62828', size=12, symbol='x')
+                ))
+                
+                fig.update_layout(
+                    title="Success Probability vs Investment",
+                    xaxis_title="Investment (Billion CNY)",
+                    yaxis_title="Success Probability (%)",
+                    height=450
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                df_front = pd.DataFrame([{
+                    'Business Model': f['config'].entry_model,
+                    'Cities': f['config'].initial_cities,
+                    'Traceability': f['config'].traceability_level,
+                    'Organic Focus': f['config'].organic_focus,
+                    'Tech Investment': f['config'].tech_investment,
+                    'Price Positioning': f['config'].price_positioning,
+                    'Success Probability': f"{f['success']:.2f}%",
+                    'Investment': f"¥{f['investment']/1e9:.3f}B",
+                } for f in front])
+                st.dataframe(df_front, hide_index=True, use_container_width=True, height=300)
+                st.caption(f"{stats['n_chunks']} chunks of {stats['chunk_cells']:,} configurations, "
+                           f"mean {stats['mean_chunk_ms']:.1f} ms / max {stats['max_chunk_ms']:.1f} ms per chunk, "
+                           f"{stats['cells_per_second']/1e6:.1f}M configurations/s")
+    
+    render_entry_simulator(data)
+
+module_timer.stop()
 
 # Footer
 st.markdown("---")
@@ -1028,3 +1135,6 @@ st.markdown("""
 <p>CP Group Strategic Intelligence Dashboard | Data Updated: December 2024</p>
 </div>
 """, unsafe_allow_html=True)
+
+render_admin_panel()
+finish_page()
@@ -1,8 +1,12 @@
+import html
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
-import random
+from utils.rerun_timing import finish_page, start_page, timed_fragment
+from utils.metrics import timed
+from utils.admin import render_admin_panel
+from utils.refresher import current_data
 
 st.set_page_config(
     page_title="Fresh Grocery Shopping",
@@ -10,6 +14,8 @@ st.set_page_config(
     layout="wide"
 )
 
+start_page()
+
 # Custom CSS
 st.markdown("""
     <style>
@@ -126,81 +132,8 @@ if 'behavior_data' not in st.session_state:
         'confidence': 0
     }
 
-# Sample product data
-products = [
-    {
-        'name': 'Organic Baby Spinach',
-        'price': 18.9,
-        'original_price': 22.9,
-        'quality_score': 0.95,
-        'stability_score': 0.92,
-        'origin': 'Shandong Province, China',
-        'certification': 'Organic Certification',
-        'trace_completeness': 0.95,
-        'category': 'Vegetables',
-        'low_pesticide': True
-    },
-    {
-        'name': 'Grass-Fed Australian Beef',
-        'price': 89.9,
-        'original_price': 98.0,
-        'quality_score': 0.93,
-        'stability_score': 0.90,
-        'origin': 'Victoria, Australia',
-        'certification': 'Antibiotic-Free, Quality Certified',
-        'trace_completeness': 0.88,
-        'category': 'Meat',
-        'low_pesticide': False
-    },
-    {
-        'name': 'Fresh Norwegian Salmon',
-        'price': 68.0,
-        'original_price': 68.0,
-        'quality_score': 0.91,
-        'stability_score': 0.88,
-        'origin': 'Norway',
-        'certification': 'MSC Certified',
-        'trace_completeness': 0.90,
-        'category': 'Seafood',
-        'low_pesticide': False
-    },
-    {
-        'name': 'Low-Pesticide Cherry Tomatoes',
-        'price': 15.8,
-        'original_price': 19.8,
-        'quality_score': 0.89,
-        'stability_score': 0.87,
-        'origin': 'Shouguang, Shandong',
-        'certification': 'Low-Pesticide Certified',
-        'trace_completeness': 0.85,
-        'category': 'Vegetables',
-        'low_pesticide': True
-    },
-    {
-        'name': 'Free-Range Eggs (10pcs)',
-        'price': 25.9,
-        'original_price': 28.9,
-        'quality_score': 0.92,
-        'stability_score': 0.93,
-        'origin': 'Jiangsu Province',
-        'certification': 'Free-Range Certified',
-        'trace_completeness': 0.92,
-        'category': 'Eggs & Dairy',
-        'low_pesticide': False
-    },
-    {
-        'name': 'Organic Brown Rice (2kg)',
-        'price': 35.0,
-        'original_price': 42.0,
-        'quality_score': 0.90,
-        'stability_score': 0.95,
-        'origin': 'Heilongjiang',
-        'certification': 'Organic Certification',
-        'trace_completeness': 0.87,
-        'category': 'Grains',
-        'low_pesticide': True
-    }
-]
+# Shared product catalog, pinned to one data version for this rerun
+catalog = current_data().catalog
 
 # Main content tabs
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -212,16 +145,16 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 ])
 
 # TAB 1: Personalized Recommendations
-with tab1:
+with tab1, timed("consumer.recommendations"):
     st.markdown("### Recommended for You")
     
-    # Filter based on user type
+    # Rank based on user type (rankings are precomputed with the catalog)
     if user_type == "Quality Priority":
-        recommended = sorted(products, key=lambda x: x['quality_score'], reverse=True)[:4]
+        recommended = catalog.take(catalog.top('quality', 4))
     elif user_type == "Value Priority":
-        recommended = sorted(products, key=lambda x: (x['original_price'] - x['price'])/x['original_price'], reverse=True)[:4]
+        recommended = catalog.take(catalog.top('value', 4))
     else:
-        recommended = products[:4]
+        recommended = catalog.take(catalog.top('default', 4))
     
     # Display products
     for product in recommended:
@@ -230,17 +163,18 @@ with tab1:
         with col1:
             st.markdown(f"""
             <div class='product-card'>
-            <h4>{product['name']}</h4>
-            <p>Origin: {product['origin']}</p>
+            <h4>{html.escape(product['name'])}</h4>
+            <p>Origin: {html.escape(product.get('origin', 'Unknown'))}</p>
             <p><span class='quality-badge quality-high'>Quality: {product['quality_score']*100:.0f}%</span>
-               <span class='quality-badge quality-high'>Stability: {product['stability_score']*100:.0f}%</span></p>
-            <p>{product['certification']}</p>
+               <span class='quality-badge quality-high'>Stability: {product.get('stability_score', 0.0)*100:.0f}%</span></p>
+            <p>{html.escape(product.get('certification', ''))}</p>
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
-            if product['original_price'] > product['price']:
-                st.markdown(f"<p style='text-decoration: line-through; color: #999;'>¥{product['original_price']}</p>", unsafe_allow_html=True)
+            original_price = product.get('original_price', product['price'])
+            if original_price > product['price']:
+                st.markdown(f"<p style='text-decoration: line-through; color: #999;'>¥{original_price}</p>", unsafe_allow_html=True)
             st.markdown(f"<p class='price-tag'>¥{product['price']}</p>", unsafe_allow_html=True)
             
             if st.button(f"Add to Cart", key=f"cart_{product['name']}"):
@@ -282,21 +216,21 @@ with tab1:
         st.button("Reorder", key="reorder3")
 
 # TAB 2: Traceability System
-with tab2:
+with tab2, timed("consumer.traceability"):
     st.markdown("### Product Traceability System")
     
     selected_product = st.selectbox(
         "Select a product to view full traceability",
-        [p['name'] for p in products]
+        catalog.names
     )
     
-    product = next(p for p in products if p['name'] == selected_product)
+    product = catalog.get_by_name(selected_product)
     
     # Traceability Completeness Score
     st.markdown(f"""
     <div style='text-align: center; padding: 2rem; background-color: #E8F5E9; border-radius: 10px;'>
     <h2>Traceability Completeness</h2>
-    <h1 style='color: #2E7D32; font-size: 4rem;'>{product['trace_completeness']*100:.0f}%</h1>
+    <h1 style='color: #2E7D32; font-size: 4rem;'>{product.get('trace_completeness', 0.0)*100:.0f}%</h1>
     <p>All supply chain stages documented and verified</p>
     </div>
     """, unsafe_allow_html=True)
@@ -309,7 +243,7 @@ with tab2:
     stages = [
         {
             'stage': 'Origin',
-            'location': product['origin'],
+            'location': product.get('origin', 'Unknown'),
             'date': '2024-12-01',
             'status': 'Verified',
             'details': 'Farm/Producer certified and inspected'
@@ -354,7 +288,7 @@ with tab2:
             st.markdown(f"""
             <div class='trace-path'>
             <h4>{stage['stage']}</h4>
-            <p><strong>Location:</strong> {stage['location']}</p>
+            <p><strong>Location:</strong> {html.escape(stage['location'])}</p>
             <p><strong>Date:</strong> {stage['date']}</p>
             <p>{stage['details']}</p>
             {responsibility_html}
@@ -386,7 +320,7 @@ with tab2:
     with col3:
         st.markdown(f"""
         <div style='background-color: #F5F5F5; padding: 1rem; border-radius: 5px; text-align: center;'>
-        <h4>{product['certification']}</h4>
+        <h4>{html.escape(product.get('certification', ''))}</h4>
         <p>Valid</p>
         </div>
         """, unsafe_allow_html=True)
@@ -509,7 +443,7 @@ with tab2:
             """, unsafe_allow_html=True)
 
 # TAB 3: Price-Quality Balance Tool
-with tab3:
+with tab3, timed("consumer.price_quality"):
     st.markdown("### Price-Quality Balance Analysis")
     
     st.info("""
@@ -517,75 +451,79 @@ with tab3:
     Find products that offer the best value for your priorities.
     """)
     
-    # Interactive filter
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        max_price = st.slider("Maximum Price (CNY)", 0, 100, 50)
-    
-    with col2:
-        min_quality = st.slider("Minimum Quality Score", 0, 100, 80)
-    
-    # Filter products
-    filtered = [p for p in products if p['price'] <= max_price and p['quality_score']*100 >= min_quality]
-    
-    if filtered:
-        # Price-Quality Scatter Plot
-        fig = go.Figure()
-        
-        for product in filtered:
-            fig.add_trace(go.Scatter(
-                x=[product['price']],
-                y=[product['quality_score']*100],
-                mode='markers+text',
-                name=product['name'],
-                text=[product['name']],
-                textposition='top center',
-                marker=dict(
-                    size=15,
-                    color='#2E7D32' if product['low_pesticide'] else '#1565C0',
-                    line=dict(width=2, color='white')
-                ),
-                hovertemplate=f"<b>{product['name']}</b><br>" +
-                             f"Price: ¥{product['price']}<br>" +
-                             f"Quality: {product['quality_score']*100:.0f}%<br>" +
-                             f"Value Score: {(product['quality_score']*100/product['price']):.1f}<extra></extra>"
-            ))
+    @timed_fragment
+    def render_price_quality_tool():
+        # Interactive filter
+        col1, col2 = st.columns(2)
         
-        fig.update_layout(
-            title="Price vs Quality Balance",
-            xaxis_title="Price (CNY)",
-            yaxis_title="Quality Score (%)",
-            height=500,
-            showlegend=False,
-            yaxis=dict(range=[min_quality-5, 100])
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            max_price = st.slider("Maximum Price (CNY)", 0, 100, 50)
         
-        # Value Rankings
-        st.markdown("---")
-        st.markdown("### Best Value Products")
+        with col2:
+            min_quality = st.slider("Minimum Quality Score", 0, 100, 80)
         
-        filtered_sorted = sorted(filtered, key=lambda x: x['quality_score']/x['price'], reverse=True)
+        # Filter products
+        filtered = catalog.take(catalog.filter(max_price=max_price, min_quality=min_quality / 100))
         
-        for i, product in enumerate(filtered_sorted[:3]):
-            value_score = (product['quality_score']*100 / product['price']) * 10
+        if filtered:
+            # Price-Quality Scatter Plot
+            fig = go.Figure()
             
-            col1, col2, col3 = st.columns([2, 1, 1])
+            for product in filtered:
+                fig.add_trace(go.Scatter(
+                    x=[product['price']],
+                    y=[product['quality_score']*100],
+                    mode='markers+text',
+                    name=product['name'],
+                    text=[product['name']],
+                    textposition='top center',
+                    marker=dict(
+                        size=15,
+                        color='#2E7D32' if product.get('low_pesticide', False) else '#1565C0',
+                        line=dict(width=2, color='white')
+                    ),
+                    hovertemplate=f"<b>{html.escape(product['name'])}</b><br>" +
+                                 f"Price: ¥{product['price']}<br>" +
+                                 f"Quality: {product['quality_score']*100:.0f}%<br>" +
+                                 f"Value Score: {(product['quality_score']*100/product['price']):.1f}<extra></extra>"
+                ))
             
-            with col1:
-                st.markdown(f"**#{i+1} {product['name']}**")
-                st.caption(f"{product['origin']}")
+            fig.update_layout(
+                title="Price vs Quality Balance",
+                xaxis_title="Price (CNY)",
+                yaxis_title="Quality Score (%)",
+                height=500,
+                showlegend=False,
+                yaxis=dict(range=[min_quality-5, 100])
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
             
-            with col2:
-                st.metric("Price", f"¥{product['price']}")
+            # Value Rankings
+            st.markdown("---")
+            st.markdown("### Best Value Products")
             
-            with col3:
-                st.metric("Value Score", f"{value_score:.1f}/10")
+            filtered_sorted = sorted(filtered, key=lambda x: x['quality_score']/x['price'], reverse=True)
+            
+            for i, product in enumerate(filtered_sorted[:3]):
+                value_score = (product['quality_score']*100 / product['price']) * 10
+                
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    st.markdown(f"**#{i+1} {product['name']}**")
+                    st.caption(product.get('origin', 'Unknown'))
+                
+                with col2:
+                    st.metric("Price", f"¥{product['price']}")
+                
+                with col3:
+                    st.metric("Value Score", f"{value_score:.1f}/10")
+        
+        else:
+            st.warning("No products match your criteria. Try adjusting the filters.")
     
-    else:
-        st.warning("No products match your criteria. Try adjusting the filters.")
+    render_price_quality_tool()
     
     # Price Stability Promise
     st.markdown("---")
@@ -602,7 +540,7 @@ with tab3:
     """, unsafe_allow_html=True)
 
 # TAB 4: AI Shopping Assistant
-with tab4:
+with tab4, timed("consumer.assistant"):
     st.markdown("### AI Shopping Assistant")
     
     st.markdown("""
@@ -670,7 +608,7 @@ Currently 60% of our customers choose organic options for their families."""
                 response = f"""I'd be happy to help with that! Here are some insights:
 
 Based on your question about "{user_input}", I recommend checking our product catalog. 
-We have {len(products)} fresh products available today, all with quality scores above 85%.
+We have {len(catalog)} fresh products available today, all with quality scores above 85%.
 
 Would you like specific recommendations based on:
 - Nutritional needs
@@ -712,7 +650,7 @@ Would you like specific recommendations based on:
     st.info(today_tip)
 
 # TAB 5: Auto-Detect Demo
-with tab5:
+with tab5, timed("consumer.auto_detect"):
     st.markdown("### 🧪 Auto-Detect User Preference Demo")
     
     st.markdown("""
@@ -723,97 +661,99 @@ with tab5:
     </div>
     """, unsafe_allow_html=True)
     
-    # Reset behavior button
-    if st.button("🔄 Reset Behavior Data", key="reset_behavior"):
-        st.session_state.behavior_data = {
-            'quality_clicks': 0,
-            'price_clicks': 0,
-            'trace_views': 0,
-            'discount_views': 0,
-            'organic_views': 0,
-            'detected_type': None,
-            'confidence': 0
-        }
-        st.rerun()
-    
-    st.markdown("---")
-    
-    # Interactive Behavior Simulation
-    st.markdown("### 📊 Simulate Your Browsing Behavior")
-    st.markdown("Click the buttons below to simulate different browsing behaviors:")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div style='background-color: #E8F5E9; padding: 1rem; border-radius: 10px;'>
-        <h4 style='color: #1B5E20;'>🌿 Quality-Related Actions</h4>
-        </div>
-        """, unsafe_allow_html=True)
+    @timed_fragment
+    def render_auto_detect_demo():
+        # Reset behavior button
+        if st.button("🔄 Reset Behavior Data", key="reset_behavior"):
+            st.session_state.behavior_data = {
+                'quality_clicks': 0,
+                'price_clicks': 0,
+                'trace_views': 0,
+                'discount_views': 0,
+                'organic_views': 0,
+                'detected_type': None,
+                'confidence': 0
+            }
+            st.rerun(scope="fragment")
         
-        if st.button("👆 Click on Quality Score", key="demo_quality_click"):
-            st.session_state.behavior_data['quality_clicks'] += 1
-            st.toast("Recorded: Quality score click")
+        st.markdown("---")
         
-        if st.button("🔍 View Traceability Info", key="demo_trace_view"):
-            st.session_state.behavior_data['trace_views'] += 1
-            st.toast("Recorded: Traceability view")
+        # Interactive Behavior Simulation
+        st.markdown("### 📊 Simulate Your Browsing Behavior")
+        st.markdown("Click the buttons below to simulate different browsing behaviors:")
         
-        if st.button("🥬 Browse Organic Products", key="demo_organic_view"):
-            st.session_state.behavior_data['organic_views'] += 1
-            st.toast("Recorded: Organic product view")
+        col1, col2 = st.columns(2)
         
-        if st.button("📋 Check Certifications", key="demo_cert_click"):
-            st.session_state.behavior_data['quality_clicks'] += 1
-            st.session_state.behavior_data['trace_views'] += 1
-            st.toast("Recorded: Certification check")
-    
-    with col2:
-        st.markdown("""
-        <div style='background-color: #FFF3E0; padding: 1rem; border-radius: 10px;'>
-        <h4 style='color: #E65100;'>💰 Value-Related Actions</h4>
-        </div>
-        """, unsafe_allow_html=True)
+        with col1:
+            st.markdown("""
+            <div style='background-color: #E8F5E9; padding: 1rem; border-radius: 10px;'>
+            <h4 style='color: #1B5E20;'>🌿 Quality-Related Actions</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if st.button("👆 Click on Quality Score", key="demo_quality_click"):
+                st.session_state.behavior_data['quality_clicks'] += 1
+                st.toast("Recorded: Quality score click")
+            
+            if st.button("🔍 View Traceability Info", key="demo_trace_view"):
+                st.session_state.behavior_data['trace_views'] += 1
+                st.toast("Recorded: Traceability view")
+            
+            if st.button("🥬 Browse Organic Products", key="demo_organic_view"):
+                st.session_state.behavior_data['organic_views'] += 1
+                st.toast("Recorded: Organic product view")
+            
+            if st.button("📋 Check Certifications", key="demo_cert_click"):
+                st.session_state.behavior_data['quality_clicks'] += 1
+                st.session_state.behavior_data['trace_views'] += 1
+                st.toast("Recorded: Certification check")
         
-        if st.button("👆 Click on Price Tag", key="demo_price_click"):
-            st.session_state.behavior_data['price_clicks'] += 1
-            st.toast("Recorded: Price click")
+        with col2:
+            st.markdown("""
+            <div style='background-color: #FFF3E0; padding: 1rem; border-radius: 10px;'>
+            <h4 style='color: #E65100;'>💰 Value-Related Actions</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if st.button("👆 Click on Price Tag", key="demo_price_click"):
+                st.session_state.behavior_data['price_clicks'] += 1
+                st.toast("Recorded: Price click")
+            
+            if st.button("🏷️ View Discount Offers", key="demo_discount_view"):
+                st.session_state.behavior_data['discount_views'] += 1
+                st.toast("Recorded: Discount view")
+            
+            if st.button("📉 Sort by Price (Low to High)", key="demo_sort_price"):
+                st.session_state.behavior_data['price_clicks'] += 2
+                st.toast("Recorded: Price sorting")
+            
+            if st.button("🛒 Add Sale Item to Cart", key="demo_sale_add"):
+                st.session_state.behavior_data['price_clicks'] += 1
+                st.session_state.behavior_data['discount_views'] += 1
+                st.toast("Recorded: Sale item added")
         
-        if st.button("🏷️ View Discount Offers", key="demo_discount_view"):
-            st.session_state.behavior_data['discount_views'] += 1
-            st.toast("Recorded: Discount view")
+        st.markdown("---")
         
-        if st.button("📉 Sort by Price (Low to High)", key="demo_sort_price"):
-            st.session_state.behavior_data['price_clicks'] += 2
-            st.toast("Recorded: Price sorting")
+        # Detection Algorithm Visualization
+        st.markdown("### 🤖 Detection Algorithm (Real-time)")
         
-        if st.button("🛒 Add Sale Item to Cart", key="demo_sale_add"):
-            st.session_state.behavior_data['price_clicks'] += 1
-            st.session_state.behavior_data['discount_views'] += 1
-            st.toast("Recorded: Sale item added")
-    
-    st.markdown("---")
-    
-    # Detection Algorithm Visualization
-    st.markdown("### 🤖 Detection Algorithm (Real-time)")
-    
-    # Calculate scores
-    quality_score = (
-        st.session_state.behavior_data['quality_clicks'] * 2 +
-        st.session_state.behavior_data['trace_views'] * 3 +
-        st.session_state.behavior_data['organic_views'] * 2.5
-    )
-    
-    value_score = (
-        st.session_state.behavior_data['price_clicks'] * 2 +
-        st.session_state.behavior_data['discount_views'] * 3
-    )
-    
-    total_score = quality_score + value_score
-    
-    # Show algorithm code
-    with st.expander("📝 View Detection Algorithm Code", expanded=True):
-        st.code('''
+        # Calculate scores
+        quality_score = (
+            st.session_state.behavior_data['quality_clicks'] * 2 +
+            st.session_state.behavior_data['trace_views'] * 3 +
+            st.session_state.behavior_data['organic_views'] * 2.5
+        )
+        
+        value_score = (
+            st.session_state.behavior_data['price_clicks'] * 2 +
+            st.session_state.behavior_data['discount_views'] * 3
+        )
+        
+        total_score = quality_score + value_score
+        
+        # Show algorithm code
+        with st.expander("📝 View Detection Algorithm Code", expanded=True):
+            st.code('''
 def detect_user_preference(behavior_data):
     """
     Auto-detect user preference based on browsing behavior.
@@ -885,201 +825,203 @@ def get_personalized_recommendation(preference_type):
             'filters': {'max_price': 50}
         }
 ''', language='python')
-    
-    st.markdown("---")
-    
-    # Real-time Detection Results
-    st.markdown("### 📈 Detection Results")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric(
-            "Quality Score", 
-            f"{quality_score:.1f}",
-            delta=f"+{st.session_state.behavior_data['quality_clicks'] + st.session_state.behavior_data['trace_views'] + st.session_state.behavior_data['organic_views']} actions"
-        )
-    
-    with col2:
-        st.metric(
-            "Value Score", 
-            f"{value_score:.1f}",
-            delta=f"+{st.session_state.behavior_data['price_clicks'] + st.session_state.behavior_data['discount_views']} actions"
-        )
-    
-    with col3:
-        if total_score > 0:
-            confidence = abs(quality_score - value_score) / total_score * 100
-            confidence = min(confidence, 95)
-        else:
-            confidence = 0
-        st.metric("Confidence", f"{confidence:.0f}%")
-    
-    # Visualization - Score Comparison Bar
-    if total_score > 0:
-        fig = go.Figure()
         
-        fig.add_trace(go.Bar(
-            x=['Quality Priority', 'Value Priority'],
-            y=[quality_score, value_score],
-            marker_color=['#2E7D32', '#E65100'],
-            text=[f'{quality_score:.1f}', f'{value_score:.1f}'],
-            textposition='outside'
-        ))
+        st.markdown("---")
         
-        fig.update_layout(
-            title="Behavior Score Comparison",
-            yaxis_title="Weighted Score",
-            height=300,
-            showlegend=False
-        )
+        # Real-time Detection Results
+        st.markdown("### 📈 Detection Results")
         
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Detection Result Display
-    st.markdown("### 🎯 Detected User Type")
-    
-    if total_score == 0:
-        st.warning("""
-        **Status: Collecting Data...**
+        col1, col2, col3 = st.columns(3)
         
-        We haven't detected enough browsing behavior yet. Try clicking on some of the action buttons above to simulate your shopping behavior!
-        """)
-    elif total_score > 0 and confidence < 30:
-        st.info(f"""
-        **Status: Still Learning...**
+        with col1:
+            st.metric(
+                "Quality Score", 
+                f"{quality_score:.1f}",
+                delta=f"+{st.session_state.behavior_data['quality_clicks'] + st.session_state.behavior_data['trace_views'] + st.session_state.behavior_data['organic_views']} actions"
+            )
         
-        Current tendency: {"Quality Priority" if quality_score > value_score else "Value Priority"}
+        with col2:
+            st.metric(
+                "Value Score", 
+                f"{value_score:.1f}",
+                delta=f"+{st.session_state.behavior_data['price_clicks'] + st.session_state.behavior_data['discount_views']} actions"
+            )
         
-        Confidence is still low ({confidence:.0f}%). We need more browsing data to make a confident prediction.
-        Keep interacting with the simulation!
-        """)
-    else:
-        detected_type = "Quality Priority" if quality_score > value_score else "Value Priority"
+        with col3:
+            if total_score > 0:
+                confidence = abs(quality_score - value_score) / total_score * 100
+                confidence = min(confidence, 95)
+            else:
+                confidence = 0
+            st.metric("Confidence", f"{confidence:.0f}%")
         
-        if detected_type == "Quality Priority":
-            st.success(f"""
-            **🌿 Detected: Quality Priority Shopper**
+        # Visualization - Score Comparison Bar
+        if total_score > 0:
+            fig = go.Figure()
             
-            Confidence: {confidence:.0f}%
+            fig.add_trace(go.Bar(
+                x=['Quality Priority', 'Value Priority'],
+                y=[quality_score, value_score],
+                marker_color=['#2E7D32', '#E65100'],
+                text=[f'{quality_score:.1f}', f'{value_score:.1f}'],
+                textposition='outside'
+            ))
             
-            **Based on your behavior, we've identified that you prioritize:**
-            - Food safety and quality assurance
-            - Full supply chain traceability
-            - Organic and certified products
-            - Quality stability over price fluctuations
+            fig.update_layout(
+                title="Behavior Score Comparison",
+                yaxis_title="Weighted Score",
+                height=300,
+                showlegend=False
+            )
             
-            **Personalized Experience Activated:**
-            - Products sorted by quality score
-            - Quality badges and certifications highlighted
-            - Traceability information prominently displayed
-            - Organic products recommended first
-            """)
-        else:
-            st.success(f"""
-            **💰 Detected: Value Priority Shopper**
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Detection Result Display
+        st.markdown("### 🎯 Detected User Type")
+        
+        if total_score == 0:
+            st.warning("""
+            **Status: Collecting Data...**
             
-            Confidence: {confidence:.0f}%
+            We haven't detected enough browsing behavior yet. Try clicking on some of the action buttons above to simulate your shopping behavior!
+            """)
+        elif total_score > 0 and confidence < 30:
+            st.info(f"""
+            **Status: Still Learning...**
             
-            **Based on your behavior, we've identified that you prioritize:**
-            - Competitive pricing and good deals
-            - Discount offers and promotions
-            - Value for money ratio
-            - Budget-conscious shopping
+            Current tendency: {"Quality Priority" if quality_score > value_score else "Value Priority"}
             
-            **Personalized Experience Activated:**
-            - Products sorted by discount percentage
-            - Price tags and savings highlighted
-            - Best value recommendations shown first
-            - Price alerts for favorite products
+            Confidence is still low ({confidence:.0f}%). We need more browsing data to make a confident prediction.
+            Keep interacting with the simulation!
             """)
-    
-    # Behavior Data Summary
-    st.markdown("---")
-    st.markdown("### 📋 Behavior Data Log")
-    
-    behavior_df_data = {
-        'Behavior Type': [
-            'Quality Score Clicks',
-            'Traceability Views', 
-            'Organic Product Views',
-            'Price Clicks',
-            'Discount Views'
-        ],
-        'Count': [
-            int(st.session_state.behavior_data['quality_clicks']),
-            int(st.session_state.behavior_data['trace_views']),
-            int(st.session_state.behavior_data['organic_views']),
-            int(st.session_state.behavior_data['price_clicks']),
-            int(st.session_state.behavior_data['discount_views'])
-        ],
-        'Weight': ['2.0', '3.0', '2.5', '2.0', '3.0'],
-        'Category': ['Quality', 'Quality', 'Quality', 'Value', 'Value']
-    }
-    
-    behavior_df = pd.DataFrame(behavior_df_data)
-    # Calculate weighted score as string to avoid type issues
-    weighted_scores = [
-        float(behavior_df_data['Count'][i]) * float(behavior_df_data['Weight'][i]) 
-        for i in range(5)
-    ]
-    behavior_df['Weighted Score'] = [f"{s:.1f}" for s in weighted_scores]
-    
-    st.dataframe(behavior_df, use_container_width=True, hide_index=True)
-    
-    # Technical Implementation Note
-    st.markdown("---")
-    with st.expander("🔧 Technical Implementation Details"):
-        st.markdown("""
-        ### How This Would Work in Production
+        else:
+            detected_type = "Quality Priority" if quality_score > value_score else "Value Priority"
+            
+            if detected_type == "Quality Priority":
+                st.success(f"""
+                **🌿 Detected: Quality Priority Shopper**
+                
+                Confidence: {confidence:.0f}%
+                
+                **Based on your behavior, we've identified that you prioritize:**
+                - Food safety and quality assurance
+                - Full supply chain traceability
+                - Organic and certified products
+                - Quality stability over price fluctuations
+                
+                **Personalized Experience Activated:**
+                - Products sorted by quality score
+                - Quality badges and certifications highlighted
+                - Traceability information prominently displayed
+                - Organic products recommended first
+                """)
+            else:
+                st.success(f"""
+                **💰 Detected: Value Priority Shopper**
+                
+                Confidence: {confidence:.0f}%
+                
+                **Based on your behavior, we've identified that you prioritize:**
+                - Competitive pricing and good deals
+                - Discount offers and promotions
+                - Value for money ratio
+                - Budget-conscious shopping
+                
+                **Personalized Experience Activated:**
+                - Products sorted by discount percentage
+                - Price tags and savings highlighted
+                - Best value recommendations shown first
+                - Price alerts for favorite products
+                """)
         
-        **1. Data Collection Points:**
-        - Click events on product cards (quality badges, price tags, etc.)
-        - Time spent viewing traceability information
-        - Filter and sort preferences
-        - Cart additions and purchase history
-        - Search queries analysis
+        # Behavior Data Summary
+        st.markdown("---")
+        st.markdown("### 📋 Behavior Data Log")
         
-        **2. Machine Learning Model:**
-        ```python
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.preprocessing import StandardScaler
+        behavior_df_data = {
+            'Behavior Type': [
+                'Quality Score Clicks',
+                'Traceability Views', 
+                'Organic Product Views',
+                'Price Clicks',
+                'Discount Views'
+            ],
+            'Count': [
+                int(st.session_state.behavior_data['quality_clicks']),
+                int(st.session_state.behavior_data['trace_views']),
+                int(st.session_state.behavior_data['organic_views']),
+                int(st.session_state.behavior_data['price_clicks']),
+                int(st.session_state.behavior_data['discount_views'])
+            ],
+            'Weight': ['2.0', '3.0', '2.5', '2.0', '3.0'],
+            'Category': ['Quality', 'Quality', 'Quality', 'Value', 'Value']
+        }
         
-        class UserPreferenceDetector:
-            def __init__(self):
-                self.model = RandomForestClassifier(n_estimators=100)
-                self.scaler = StandardScaler()
-            
-            def extract_features(self, user_session):
-                return {
-                    'quality_click_ratio': user_session.quality_clicks / max(user_session.total_clicks, 1),
-                    'trace_view_time_pct': user_session.trace_view_time / max(user_session.total_time, 1),
-                    'organic_browse_ratio': user_session.organic_views / max(user_session.total_views, 1),
-                    'price_sort_count': user_session.price_sort_events,
-                    'discount_click_ratio': user_session.discount_clicks / max(user_session.total_clicks, 1),
-                    'avg_cart_item_price': user_session.avg_cart_price,
-                    'cart_discount_items_pct': user_session.discount_items / max(user_session.cart_size, 1)
-                }
-            
-            def predict(self, features):
-                scaled_features = self.scaler.transform([features])
-                prediction = self.model.predict(scaled_features)
-                confidence = max(self.model.predict_proba(scaled_features)[0])
-                return prediction[0], confidence
-        ```
+        behavior_df = pd.DataFrame(behavior_df_data)
+        # Calculate weighted score as string to avoid type issues
+        weighted_scores = [
+            float(behavior_df_data['Count'][i]) * float(behavior_df_data['Weight'][i]) 
+            for i in range(5)
+        ]
+        behavior_df['Weighted Score'] = [f"{s:.1f}" for s in weighted_scores]
         
-        **3. Real-time Updates:**
-        - Behavior tracked via event stream (Kafka/Redis)
-        - Model inference at edge for low latency
-        - A/B testing for recommendation strategies
-        - Continuous model retraining with new data
+        st.dataframe(behavior_df, use_container_width=True, hide_index=True)
         
-        **4. Privacy Considerations:**
-        - All behavior data anonymized
-        - User consent for personalization
-        - Option to reset preferences
-        - Transparent algorithm explanation
-        """)
+        # Technical Implementation Note
+        st.markdown("---")
+        with st.expander("🔧 Technical Implementation Details"):
+            st.markdown("""
+            ### How This Would Work in Production
+            
+            **1. Data Collection Points:**
+            - Click events on product cards (quality badges, price tags, etc.)
+            - Time spent viewing traceability information
+            - Filter and sort preferences
+            - Cart additions and purchase history
+            - Search queries analysis
+            
+            **2. Machine Learning Model:**
+            ```python
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.preprocessing import StandardScaler
+            
+            class UserPreferenceDetector:
+                def __init__(self):
+                    self.model = RandomForestClassifier(n_estimators=100)
+                    self.scaler = StandardScaler()
+                
+                def extract_features(self, user_session):
+                    return {
+                        'quality_click_ratio': user_session.quality_clicks / max(user_session.total_clicks, 1),
+                        'trace_view_time_pct': user_session.trace_view_time / max(user_session.total_time, 1),
+                        'organic_browse_ratio': user_session.organic_views / max(user_session.total_views, 1),
+                        'price_sort_count': user_session.price_sort_events,
+                        'discount_click_ratio': user_session.discount_clicks / max(user_session.total_clicks, 1),
+                        'avg_cart_item_price': user_session.avg_cart_price,
+                        'cart_discount_items_pct': user_session.discount_items / max(user_session.cart_size, 1)
+                    }
+                
+                def predict(self, features):
+                    scaled_features = self.scaler.transform([features])
+                    prediction = self.model.predict(scaled_features)
+                    confidence = max(self.model.predict_proba(scaled_features)[0])
+                    return prediction[0], confidence
+            ```
+            
+            **3. Real-time Updates:**
+            - Behavior tracked via event stream (Kafka/Redis)
+            - Model inference at edge for low latency
+            - A/B testing for recommendation strategies
+            - Continuous model retraining with new data
+            
+            **4. Privacy Considerations:**
+            - All behavior data anonymized
+            - User consent for personalization
+            - Option to reset preferences
+            - Transparent algorithm explanation
+            """)
+    
+    render_auto_detect_demo()
 
 # Shopping Cart in Sidebar
 with st.sidebar:
@@ -1108,3 +1050,6 @@ st.markdown("""
 <p>Delivery within 30 minutes | 100% Traceability | Quality Guaranteed</p>
 </div>
 """, unsafe_allow_html=True)
+
+render_admin_panel()
+finish_page()
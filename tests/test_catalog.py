@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from utils.catalog import RANKING_DEPTH, build_catalog, top_k
+
+def _products(n, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ['Vegetables', 'Fruits', 'Meat']
+    products = []
+    for i in range(n):
+        price = float(rng.integers(5, 60))
+        products.append({
+            'sku': f"SKU-{i:05d}",
+            'name': f"Product {i}",
+            'price': price,
+            'original_price': price + float(rng.integers(0, 20)),
+            # Coarse scores so rankings are full of ties
+            'quality_score': float(rng.integers(0, 10)) / 10,
+            'category': categories[i % len(categories)],
+        })
+    return {'products': products}
+
+def test_lookups_by_sku_and_name():
+    raw = _products(30)
+    catalog = build_catalog(raw)
+    assert len(catalog) == 30
+    assert catalog.get('SKU-00007') is raw['products'][7]
+    assert catalog.get_by_name('Product 12') is raw['products'][12]
+    assert catalog.get('SKU-99999') is None
+    assert catalog.get_by_name('Unknown') is None
+    np.testing.assert_array_equal(catalog.rows('Fruits'), np.arange(1, 30, 3))
+    assert len(catalog.rows('Unknown')) == 0
+
+@pytest.mark.parametrize('category', [None, 'Meat', 'Unknown'])
+def test_filter_matches_records(category):
+    raw = _products(200)
+    catalog = build_catalog(raw)
+    expected = [i for i, p in enumerate(raw['products'])
+                if p['price'] <= 30 and p['quality_score'] >= 0.5
+                and category in (None, p['category'])]
+    np.testing.assert_array_equal(catalog.filter(max_price=30, min_quality=0.5, category=category), expected)
+
+def test_invalid_products_are_skipped():
+    raw = _products(4)
+    del raw['products'][1]['category']
+    raw['products'][2]['price'] = 0
+    raw['products'][3]['sku'] = raw['products'][0]['sku']
+    catalog = build_catalog(raw)
+    assert [p['name'] for p in catalog.records] == ['Product 0']
+
+def test_optional_fields_default():
+    raw = {'products': [{'sku': 'A', 'name': 'Bare', 'price': 10.0, 'quality_score': 0.8, 'category': 'Fruits'}]}
+    catalog = build_catalog(raw)
+    np.testing.assert_array_equal(catalog.original_price, [10.0])
+    np.testing.assert_array_equal(catalog.discount, [0.0])
+    np.testing.assert_array_equal(catalog.stability, [0.0])
+    np.testing.assert_array_equal(catalog.low_pesticide, [False])
+
+@pytest.mark.parametrize('k', [0, 1, 3, 7, 10, 25, 40])
+def test_top_k_ties_keep_index_order(k):
+    scores = np.array([3, 1, 3, 2, 3, 2, 1, 3, 0, 2] * 4, dtype=np.float64)
+    expected = np.argsort(-scores, kind='stable')[:k]
+    np.testing.assert_array_equal(top_k(scores, k), expected)
+
+def test_top_k_all_equal():
+    np.testing.assert_array_equal(top_k(np.ones(10), 4), [0, 1, 2, 3])
+
+def test_top_beyond_ranking_depth():
+    catalog = build_catalog(_products(3 * RANKING_DEPTH))
+    k = RANKING_DEPTH + 50
+    for profile, column in (('quality', catalog.quality), ('value', catalog.discount)):
+        expected = np.argsort(-column, kind='stable')[:k]
+        np.testing.assert_array_equal(catalog.top(profile, k), expected)
+
+        rows = catalog.rows('Fruits')
+        expected = rows[np.argsort(-column[rows], kind='stable')][:k]
+        np.testing.assert_array_equal(catalog.top(profile, k, 'Fruits'), expected)
+    np.testing.assert_array_equal(catalog.top('default', k), np.arange(k))
+
+def test_top_within_ranking_depth_matches_on_demand():
+    catalog = build_catalog(_products(500))
+    expected = np.argsort(-catalog.quality, kind='stable')[:4]
+    np.testing.assert_array_equal(catalog.top('quality', 4), expected)
+    assert len(catalog.top('quality', 4, 'Unknown')) == 0
@@ -0,0 +1,49 @@
+import numpy as np
+
+from utils import city_priority
+from utils.city_priority import build_matrix
+
+RAW = {
+    'criteria': {
+        'Market Size': {'weight': 0.5, 'direction': 'benefit'},
+        'Competition': {'weight': 0.5, 'direction': 'cost'},
+    },
+    'cities': [
+        {'name': 'Alpha', 'tier': 'tier1', 'Market Size': 0.9, 'Competition': 0.9},
+        {'name': 'Beta', 'tier': 'tier2', 'Market Size': 0.7, 'Competition': 0.2},
+        {'name': 'Gamma', 'tier': 'tier2', 'Market Size': 0.5, 'Competition': 0.5},
+        {'name': 'Delta', 'tier': 'tier3', 'Market Size': 0.2, 'Competition': 0.1},
+    ],
+}
+
+def test_ranking_inverts_cost_criteria():
+    cities = build_matrix(RAW)
+    order, scores = cities.ranking()
+    # Utilities: Alpha 0.5, Beta 0.75, Gamma 0.5, Delta 0.55; ties keep file order
+    assert list(cities.names[order]) == ['Beta', 'Delta', 'Alpha', 'Gamma']
+    np.testing.assert_allclose(scores, [0.75, 0.55, 0.5, 0.5])
+
+def test_ranking_with_custom_weights():
+    cities = build_matrix(RAW)
+    order, _ = cities.ranking([1, 0])
+    assert list(cities.names[order]) == ['Alpha', 'Beta', 'Gamma', 'Delta']
+
+def test_rank_stability_without_spread_keeps_base_ranks():
+    cities = build_matrix(RAW)
+    stability = cities.rank_stability(n_samples=200, spread=0.0, top_k=2, seed=0)
+    np.testing.assert_array_equal(stability['base_rank'], [3, 1, 4, 2])
+    np.testing.assert_array_equal(stability['mean_rank'], stability['base_rank'])
+    np.testing.assert_array_equal(stability['same_rank'], np.ones(4))
+    np.testing.assert_array_equal(stability['top_k'], [0, 1, 0, 1])
+
+def test_rank_stability_distributions(monkeypatch):
+    cities = build_matrix(RAW)
+    stability = cities.rank_stability(n_samples=5000, spread=0.5, top_k=1, seed=1)
+    assert np.all(stability['p5_rank'] <= stability['p95_rank'])
+    assert np.all((1 <= stability['mean_rank']) & (stability['mean_rank'] <= len(cities)))
+    # Every sample has exactly one city ranked first
+    np.testing.assert_allclose(stability['top_k'].sum(), 1.0)
+    # Batching does not change the result
+    monkeypatch.setattr(city_priority, 'MAX_BATCH_CELLS', 8)
+    batched = cities.rank_stability(n_samples=5000, spread=0.5, top_k=1, seed=1)
+    np.testing.assert_array_equal(batched['mean_rank'], stability['mean_rank'])
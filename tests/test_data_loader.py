@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from utils import data_loader
+from utils.data_loader import get_cache_stats, load_json
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """An empty data directory with a fresh process cache and no snapshot"""
+    monkeypatch.setattr(data_loader, 'get_data_path', lambda filename: tmp_path / filename)
+    monkeypatch.setattr(data_loader, '_cache', {})
+    monkeypatch.setattr(data_loader, '_file_locks', {})
+    monkeypatch.setattr(data_loader, '_snapshot', {'mtime': None, 'snapshot': None})
+    monkeypatch.setattr(data_loader, '_cache_stats', dict.fromkeys(data_loader._cache_stats, 0))
+    return tmp_path
+
+def _write(path, data, mtime):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+def test_parsed_once_and_shared(data_dir):
+    _write(data_dir / 'a.json', {'x': 1}, 1_000_000)
+    first = load_json('a.json')
+    assert first == {'x': 1}
+    assert load_json('a.json') is first
+    stats = get_cache_stats()
+    assert (stats['misses'], stats['hits']) == (1, 1)
+
+def test_changed_file_is_reloaded(data_dir):
+    path = data_dir / 'a.json'
+    _write(path, {'x': 1}, 1_000_000)
+    load_json('a.json')
+    _write(path, {'x': 2}, 1_000_100)
+    assert load_json('a.json') == {'x': 2}
+
+def test_touched_but_unchanged_file_is_not_reparsed(data_dir):
+    path = data_dir / 'a.json'
+    _write(path, {'x': 1}, 1_000_000)
+    first = load_json('a.json')
+    os.utime(path, (1_000_100, 1_000_100))
+    assert load_json('a.json') is first
+    assert get_cache_stats()['reloads_skipped'] == 1
+
+def test_missing_file_is_cached_until_it_appears(data_dir):
+    assert load_json('a.json') == {}
+    assert load_json('a.json') == {}
+    assert get_cache_stats()['files'] == {'a.json': 'missing'}
+    _write(data_dir / 'a.json', {'x': 1}, 1_000_000)
+    assert load_json('a.json') == {'x': 1}
+
+def test_invalid_json_loads_as_empty(data_dir):
+    (data_dir / 'a.json').write_text('{"x": ', encoding='utf-8')
+    assert load_json('a.json') == {}
@@ -0,0 +1,38 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from utils.downsample import MIN_POINTS, budgeted_figure, lttb, max_points, minmax
+
+@pytest.mark.parametrize('n_out', [3, 10, 100, 999])
+def test_lttb_keeps_endpoints_and_budget(n_out):
+    rng = np.random.default_rng(0)
+    x = np.arange(1000)
+    y = np.cumsum(rng.normal(size=1000))
+    idx = lttb(x, y, n_out)
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+def test_lttb_short_series_unchanged():
+    np.testing.assert_array_equal(lttb(np.arange(5), np.arange(5), 10), np.arange(5))
+
+def test_minmax_keeps_endpoints_and_extremes():
+    y = np.sin(np.linspace(0, 20, 1000))
+    idx = minmax(y, 50)
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert len(idx) <= 50 + 2
+    assert np.argmin(y) in idx and np.argmax(y) in idx
+
+def test_max_points_scales_with_traces():
+    assert max_points(1) >= max_points(4) >= MIN_POINTS
+
+def test_budgeted_figure_fits_budget():
+    y = np.random.default_rng(0).normal(size=20_000)
+
+    def build(n_points):
+        idx = lttb(np.arange(len(y)), y, n_points)
+        return go.Figure(go.Scatter(x=idx, y=y[idx]))
+
+    fig = budgeted_figure(build, 20_000, byte_budget=50_000)
+    assert len(fig.to_json()) <= 50_000
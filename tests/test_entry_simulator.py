@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from utils import entry_simulator
+from utils.entry_simulator import EntryConfig, optimize, run_monte_carlo, shutdown_pool
+
+CONFIG = EntryConfig('Hybrid Model', 3, 50, 40, 30, 'Mid-range')
+MARKET = {
+    'market_size_2024': 6.4e11,
+    'market_size_2025_projected': 7.5e11,
+    'growth_rate_cagr': 0.15,
+    'instant_retail_penetration': {'tier1': 0.35},
+}
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv('CP_SIM_WORKERS', '2')
+    yield
+    shutdown_pool()
+
+def test_pool_results_match_in_process(pool):
+    kwargs = dict(n_scenarios=50_000, batch_size=10_000, seed=42)
+    pooled = run_monte_carlo(CONFIG, MARKET, use_pool=True, **kwargs)
+    local = run_monte_carlo(CONFIG, MARKET, use_pool=False, **kwargs)
+    assert pooled['success_percentiles'] == local['success_percentiles']
+    assert pooled['revenue_percentiles'] == local['revenue_percentiles']
+    assert pooled['revenue_mean'] == local['revenue_mean']
+    np.testing.assert_array_equal(pooled['histogram'][0], local['histogram'][0])
+
+def test_seeded_runs_are_reproducible():
+    kwargs = dict(n_scenarios=20_000, batch_size=7_000, seed=7)
+    first = run_monte_carlo(CONFIG, MARKET, **kwargs)
+    assert first['revenue_percentiles'] == run_monte_carlo(CONFIG, MARKET, **kwargs)['revenue_percentiles']
+    assert first['histogram'][0].sum() == 20_000
+    p = list(first['revenue_percentiles'].values())
+    assert p == sorted(p)
+
+def test_optimize_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(entry_simulator, '_optimize_cache', type(entry_simulator._optimize_cache)())
+    monkeypatch.setattr(entry_simulator, 'OPTIMIZE_CACHE_ENTRIES', 2)
+    first = optimize(20)
+    assert not first['cached']
+    assert optimize(20)['cached']
+    optimize(25)
+    optimize(50)
+    assert list(entry_simulator._optimize_cache) == [25, 50]
+    assert not optimize(20)['cached']
+
+def test_optimize_front_is_pareto():
+    front = optimize(20)['front']
+    success = [f['success'] for f in front]
+    cost = [f['investment'] for f in front]
+    assert cost == sorted(cost)
+    assert all(a < b for a, b in zip(success, success[1:]))
@@ -0,0 +1,42 @@
+from streamlit.testing.v1 import AppTest
+
+from utils import figure_cache
+
+def _cached_script():
+    import plotly.graph_objects as go
+
+    from utils.figure_cache import cached_plotly_chart
+
+    cached_plotly_chart('test_chart', 1, lambda: go.Figure(go.Bar(x=['a', 'b'], y=[1, 2]),
+                                                           layout=dict(height=320)))
+
+def _reference_script():
+    import plotly.graph_objects as go
+    import streamlit as st
+
+    st.plotly_chart(go.Figure(go.Bar(x=['a', 'b'], y=[1, 2]), layout=dict(height=320)), width='stretch')
+
+def _without_id(proto):
+    proto = type(proto).FromString(proto.SerializeToString())
+    proto.ClearField('id')
+    return proto
+
+def test_cached_chart_renders_as_plotly_chart(monkeypatch):
+    # The fast path uses private Streamlit API; after an upgrade it must
+    # still produce the same element as st.plotly_chart
+    monkeypatch.setattr(figure_cache, '_entries', type(figure_cache._entries)())
+    monkeypatch.setattr(figure_cache, '_stats', dict.fromkeys(figure_cache._stats, 0))
+    monkeypatch.setattr(figure_cache, '_fast_path', {'broken': False})
+    reference = _without_id(AppTest.from_function(_reference_script).run().get('plotly_chart')[0].proto)
+
+    at = AppTest.from_function(_cached_script)
+    for expected_stats in ((0, 1), (1, 1)):
+        at.run()
+        assert not at.exception
+        assert not figure_cache._fast_path['broken']
+        charts = at.get('plotly_chart')
+        assert len(charts) == 1
+        # Element ids also hash the script, so compare everything else
+        assert _without_id(charts[0].proto) == reference
+        stats = figure_cache.get_figure_cache_stats()
+        assert (stats['hits'], stats['misses']) == expected_stats
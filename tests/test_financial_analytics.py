@@ -0,0 +1,56 @@
+import numpy as np
+
+from utils.financial_analytics import _rolling_mean, analyze, period_label
+from utils.financials import FinancialsStore
+
+def _store(rows):
+    """rows: (company, year, quarter, net_loss)"""
+    store = FinancialsStore()
+    store.append([store.company_code(r[0]) for r in rows], [r[1] for r in rows],
+                 [r[2] for r in rows], [r[3] for r in rows])
+    return store
+
+def test_pivot_aligns_companies_on_periods():
+    analytics = analyze(_store([
+        ('a', 2023, 4, -3.0), ('a', 2024, 2, -1.0),
+        ('b', 2024, 1, 5.0),
+    ]))
+    assert analytics.companies == ('a', 'b')
+    assert analytics.labels() == ['2023 Q4', '2024 Q1', '2024 Q2']
+    np.testing.assert_array_equal(analytics.values, [[-3.0, np.nan, -1.0], [np.nan, 5.0, np.nan]])
+    np.testing.assert_array_equal(analytics.last_index, [2, 1])
+    assert period_label(2024 * 4 + 2) == '2024 Q3'
+
+def test_rolling_mean_skips_unreported_quarters():
+    nan = np.nan
+    values = np.array([[2, nan, 4, 6, nan, nan, nan, nan, 8]], dtype=np.float64)
+    np.testing.assert_array_equal(
+        _rolling_mean(values, 2)[0], [2, 2, 4, 5, 6, nan, nan, nan, 8])
+    np.testing.assert_array_equal(
+        _rolling_mean(values, 2, min_periods=2)[0], [nan, nan, nan, 5, nan, nan, nan, nan, nan])
+
+def test_company_without_reported_quarters():
+    store = _store([('a', 2024, q, -5.0 + q) for q in (1, 2, 3, 4)])
+    store.company_code('silent')
+    analytics = analyze(store)
+    assert analytics.last_index[analytics.row('silent')] == -1
+    assert analytics.last_index[analytics.row('a')] == 3
+    assert 'silent' not in analytics.break_even
+    assert 'a' in analytics.break_even
+
+def test_empty_store():
+    analytics = analyze(FinancialsStore())
+    assert analytics.companies == ()
+    assert analytics.break_even == {}
+
+def test_break_even_projection():
+    # Loss shrinking by 1 per quarter from -8 in 2023 Q1 to -2 in 2024 Q3: zero in 2025 Q1
+    rows = [('a', 2023 + i // 4, i % 4 + 1, -8.0 + i) for i in range(7)]
+    analytics = analyze(_store(rows))
+    forecast = analytics.break_even['a']
+    assert forecast['status'] == 'projected'
+    assert period_label(forecast['period']) == '2025 Q1'
+
+def test_break_even_reached():
+    analytics = analyze(_store([('a', 2024, 1, -2.0), ('a', 2024, 2, 1.0), ('a', 2024, 3, 2.0)]))
+    assert analytics.break_even['a'] == {'status': 'reached', 'period': 2024 * 4 + 1}
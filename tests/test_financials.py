@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.financial_analytics import analyze
+from utils.financials import FinancialsStore, ingest_json, iter_json_array_chunks
+
+RECORDS = [
+    {'year': 2021 + i // 4, 'quarter': f"Q{i % 4 + 1}", 'net_loss': -100.5 + i,
+     'note': "brackets ] and commas , inside [strings]"}
+    for i in range(40)
+]
+
+def _write(tmp_path, records, name='financials.json'):
+    path = tmp_path / name
+    path.write_text(json.dumps({'company': 'x', 'annual_data': records}, indent=2), encoding='utf-8')
+    return path
+
+@pytest.mark.parametrize('read_size', [1, 7, 64, 1000, 1 << 16])
+def test_json_chunks_across_block_boundaries(tmp_path, read_size):
+    path = _write(tmp_path, RECORDS)
+    chunks = list(iter_json_array_chunks(path, 'annual_data', chunk_size=6, read_size=read_size))
+    assert [len(c) for c in chunks] == [6] * 6 + [4]
+    assert [r for chunk in chunks for r in chunk] == RECORDS
+
+def test_json_chunks_empty_array(tmp_path):
+    path = _write(tmp_path, [])
+    assert list(iter_json_array_chunks(path, 'annual_data', read_size=8)) == []
+
+def test_ingest_empty_array_adds_no_company(tmp_path):
+    store = FinancialsStore()
+    ingest_json(store, _write(tmp_path, []), 'empty')
+    assert store.companies == []
+    assert analyze(store).companies == ()
+
+def test_duplicate_quarters_are_dropped(tmp_path):
+    store = FinancialsStore()
+    path = _write(tmp_path, RECORDS[:8])
+    ingest_json(store, path, 'dingdong')
+    ingest_json(store, path, 'dingdong')
+    assert len(store) == 8
+    assert store.duplicates == 8
+    # Not double-counted in the (company, period) pivot
+    analytics = analyze(store)
+    np.testing.assert_array_equal(analytics.values[analytics.row('dingdong')],
+                                  [r['net_loss'] for r in RECORDS[:8]])
+
+def test_duplicates_within_a_chunk_keep_the_first():
+    store = FinancialsStore()
+    a = store.company_code('a')
+    store.append([a, a, a], [2024, 2024, 2024], [1, 2, 1], [-1.0, -2.0, -9.0])
+    assert store.duplicates == 1
+    np.testing.assert_array_equal(store.columns['net_loss'], [-1.0, -2.0])
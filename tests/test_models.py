@@ -0,0 +1,54 @@
+import dataclasses
+
+import pytest
+
+from utils.models import Competitor, Segment, _build_keyed, get_competitor_models, get_segment_models
+
+COMPETITOR = {
+    'name': 'Fresh Co', 'model': 'Front Warehouse', 'cities': ['Shanghai', 'Beijing'],
+    'sku_count': '1200', 'strengths': ['Speed'], 'weaknesses': ['Losses'],
+    'product_categories': {'vegetables': 1},
+    'formats': {'mini': {'target': 'Families', 'sizes': [80, 120]}},
+}
+SEGMENT = {
+    'segment_name': 'Young Families', 'percentage': 0.3,
+    'pain_points': {'functional': [{'pain': 'Wilted greens', 'severity': '0.8'}]},
+    'gains': {'functional': ['Fresh produce']},
+    'priorities': {'freshness': 1},
+}
+
+def test_competitor_conversion():
+    c = Competitor.from_dict('fresh', COMPETITOR)
+    assert c.cities == ('Shanghai', 'Beijing')
+    assert c.sku_count == 1200
+    assert c.product_categories == {'vegetables': 1.0}
+    assert c.formats['mini']['sizes'] == (80, 120)
+    assert c.product_loss_2024 is None
+    assert c.opportunities == ()
+
+def test_records_are_immutable():
+    c = Competitor.from_dict('fresh', COMPETITOR)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        c.name = 'Other'
+    with pytest.raises(TypeError):
+        c.product_categories['fruit'] = 0.5
+    with pytest.raises(TypeError):
+        c.formats['mini']['target'] = 'Students'
+
+def test_segment_conversion():
+    s = Segment.from_dict('families', SEGMENT)
+    pain = s.pain_points['functional'][0]
+    assert (pain.pain, pain.severity, pain.frequency) == ('Wilted greens', 0.8, '')
+    assert s.gains['functional'] == ('Fresh produce',)
+    assert s.priorities == {'freshness': 1.0}
+    assert s.shopping_behavior == {}
+    assert s.age_range is None
+
+def test_invalid_entries_are_skipped(capsys):
+    records = _build_keyed('competitor', {'ok': COMPETITOR, 'bad': {'name': 'No model'}}, Competitor)
+    assert list(records) == ['ok']
+    assert "skipping invalid competitor 'bad'" in capsys.readouterr().out
+
+def test_shipped_data_converts():
+    assert get_competitor_models()
+    assert get_segment_models()
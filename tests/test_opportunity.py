@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from utils.opportunity import build_matrix, normalize_weights
+
+def _raw(n, seed=0):
+    rng = np.random.default_rng(seed)
+    criteria = {'Need': 0.4, 'Gap': 0.3, 'Capability': 0.2, 'Size': 0.1}
+    opportunities = [
+        dict({'name': f"Opportunity {i}", 'region': ['East', 'North', 'South'][i % 3]},
+             **{c: float(v) for c, v in zip(criteria, rng.random(len(criteria)))})
+        for i in range(n)
+    ]
+    return {'criteria': criteria, 'opportunities': opportunities}
+
+def test_normalize_weights():
+    np.testing.assert_allclose(normalize_weights([2, 1, 1]), [0.5, 0.25, 0.25])
+    # All-zero weights fall back to equal weights
+    np.testing.assert_allclose(normalize_weights([0, 0, 0, 0]), [0.25] * 4)
+
+def test_score_matches_weighted_sum():
+    matrix = build_matrix(_raw(50))
+    weights = [4, 3, 2, 1]
+    expected = [sum(w / 10 * r[c] for w, c in zip(weights, matrix.criteria)) for r in _raw(50)['opportunities']]
+    np.testing.assert_allclose(matrix.score(weights), expected)
+    np.testing.assert_allclose(matrix.score(), expected)
+
+@pytest.mark.parametrize('k', [1, 5, 50, 500])
+@pytest.mark.parametrize('region', [None, 'North'])
+def test_top_k_matches_full_sort(k, region):
+    matrix = build_matrix(_raw(300))
+    weights = [1, 2, 3, 4]
+    scores = matrix.score(weights)
+    candidates = np.flatnonzero(matrix.region_mask(region))
+    expected = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+
+    order, top_scores = matrix.top_k(k, weights, region)
+    np.testing.assert_array_equal(order, expected)
+    np.testing.assert_array_equal(top_scores, scores[expected])
+
+def test_invalid_opportunities_are_skipped():
+    raw = _raw(3)
+    del raw['opportunities'][1]['Gap']
+    matrix = build_matrix(raw)
+    assert list(matrix.names) == ['Opportunity 0', 'Opportunity 2']
@@ -0,0 +1,39 @@
+import pytest
+
+from utils import refresher
+from utils.refresher import DataVersion, current_data, refresh_now
+
+@pytest.fixture
+def fingerprint(monkeypatch):
+    """Controllable data fingerprint, with no background refresher"""
+    monkeypatch.setenv('CP_DATA_REFRESH_SECONDS', '0')
+    monkeypatch.setattr(refresher, '_current', None)
+    value = {'fingerprint': ('json', 'generation-1')}
+    monkeypatch.setattr(refresher, 'data_fingerprint', lambda: value['fingerprint'])
+    return value
+
+def test_unchanged_sources_keep_the_version(fingerprint):
+    version = current_data()
+    assert refresh_now() is version
+    assert current_data() is version
+
+def test_changed_sources_swap_in_a_primed_version(fingerprint):
+    pinned = current_data()
+    market = pinned.market
+
+    fingerprint['fingerprint'] = ('json', 'generation-2')
+    new_version = refresh_now()
+    assert new_version is not pinned
+    assert new_version.number == pinned.number + 1
+    assert current_data() is new_version
+    # Built off the request path: everything is memoized before the swap
+    assert {'market', 'catalog', 'competitor_matrix'} <= set(new_version._values)
+    # A rerun that pinned the old version keeps reading it
+    assert pinned.market is market
+
+def test_memoized_values_are_built_once(fingerprint):
+    version = DataVersion(1, ('json', 'x'))
+    calls = []
+    build = lambda: calls.append(1) or object()
+    assert version._memo('value', build) is version._memo('value', build)
+    assert len(calls) == 1
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from utils import snapshot
+from utils.data_loader import get_data_path
+from utils.snapshot import SOURCES, Snapshot, build_snapshot
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A copy of the shipped sources that build_snapshot reads instead of data/"""
+    for filename in SOURCES:
+        shutil.copy(get_data_path(filename), tmp_path / filename)
+    monkeypatch.setattr(snapshot, 'get_data_path', lambda filename: tmp_path / filename)
+    return tmp_path
+
+def test_round_trip_matches_json_load(data_dir):
+    snap = Snapshot(build_snapshot(data_dir / 'test.snapshot'))
+    for filename in SOURCES:
+        with open(data_dir / filename, encoding='utf-8') as f:
+            assert snap.load(filename) == json.load(f), filename
+
+def test_optional_keys_and_ints_survive(data_dir):
+    # Records with differing keys and mixed int/float values used to come
+    # back with absent keys as None and ints as floats
+    path = data_dir / 'products.json'
+    products = json.loads(path.read_text(encoding='utf-8'))
+    products['products'][0].pop('original_price', None)
+    products['products'][1]['price'] = 12
+    products['products'][1]['extra'] = {'nested': [1, 2.5]}
+    path.write_text(json.dumps(products), encoding='utf-8')
+
+    loaded = Snapshot(build_snapshot(data_dir / 'test.snapshot')).load('products.json')
+    assert loaded == products
+    assert 'original_price' not in loaded['products'][0]
+    assert type(loaded['products'][1]['price']) is int
+    assert 'extra' not in loaded['products'][2]
+
+def test_freshness_checks_mtime_and_size(data_dir):
+    snap = Snapshot(build_snapshot(data_dir / 'test.snapshot'))
+    stat = os.stat(data_dir / 'market_data.json')
+    assert snap.is_fresh('market_data.json', stat.st_mtime, stat.st_size)
+    assert not snap.is_fresh('market_data.json', stat.st_mtime, stat.st_size + 1)
+    assert not snap.is_fresh('market_data.json', stat.st_mtime + 1, stat.st_size)
+    assert not snap.is_fresh('unknown.json', stat.st_mtime, stat.st_size)
+    # A deleted source has no mtime
+    assert not snap.is_fresh('market_data.json', None, None)
+
+def test_invalid_source_fails_the_build(data_dir):
+    (data_dir / 'products.json').write_text(json.dumps({'products': [{'sku': 'A'}]}), encoding='utf-8')
+    with pytest.raises(ValueError, match='products'):
+        build_snapshot(data_dir / 'test.snapshot')
+
+def test_deleted_source_is_not_served_from_the_snapshot(data_dir, monkeypatch):
+    from utils import data_loader
+
+    build_snapshot(data_dir / data_loader.SNAPSHOT_FILE)
+    monkeypatch.setattr(data_loader, 'get_data_path', lambda filename: data_dir / filename)
+    monkeypatch.setattr(data_loader, '_cache', {})
+    monkeypatch.setattr(data_loader, '_file_locks', {})
+    monkeypatch.setattr(data_loader, '_snapshot', {'mtime': None, 'snapshot': None})
+    assert data_loader.load_json('market_data.json')
+
+    os.remove(data_dir / 'market_data.json')
+    assert data_loader.load_json('market_data.json') == {}
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from utils.refresher import DataVersion
+from utils.sqlite_store import SQLiteStore, import_json
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    return SQLiteStore(import_json(str(tmp_path_factory.mktemp('db') / 'test.sqlite')))
+
+@pytest.fixture(scope='module')
+def json_data():
+    return DataVersion(1, ('json',))
+
+def test_records_match_json(store, json_data):
+    assert store.competitor_keys() == json_data.competitor_keys()
+    for key in store.competitor_keys():
+        assert store.competitor(key) == json_data.competitor(key)
+    for key in store.segment_keys():
+        assert store.segment(key) == json_data.segment(key)
+
+def test_city_lookup_matches_json(store, json_data):
+    cities = store.competitor_cities()
+    assert cities == json_data.competitor_cities()
+    for city in cities:
+        assert store.competitors_in_city(city) == json_data.competitors_in_city(city)
+    assert store.competitors_in_city('Atlantis') == []
+
+@pytest.mark.parametrize('bounds', [(None, None), (2, 9), (5, 5), (-8, -1)])
+def test_financial_window_matches_json(store, json_data, bounds):
+    periods = json_data.financial_analytics.periods
+    first = periods[0] + bounds[0] if bounds[0] is not None else periods[0]
+    last = periods[0] + bounds[1] if bounds[1] is not None else periods[-1]
+    expected = json_data.financial_window(first, last)
+    window = store.financial_window(first, last)
+    assert window.keys() == expected.keys()
+    for company, (periods, values) in expected.items():
+        np.testing.assert_array_equal(window[company][0], periods)
+        np.testing.assert_array_equal(window[company][1], values)
+
+@pytest.mark.parametrize('query, index', [
+    ("SELECT competitor FROM competitor_cities WHERE city = 'Shanghai'", 'idx_competitor_cities_city'),
+    ("SELECT company FROM financials WHERE year BETWEEN 2022 AND 2023", 'idx_financials_period'),
+])
+def test_queries_use_indexes(store, query, index):
+    plan = ' '.join(str(row) for row in store._conn().execute(f"EXPLAIN QUERY PLAN {query}"))
+    assert index in plan
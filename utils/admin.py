@@ -0,0 +1,79 @@
+"""Hidden admin panel with live section latency.
+
+Disabled unless configured. With ``CP_ADMIN_TOKEN`` set, the panel is shown
+at the bottom of a page whose URL carries ``?admin=<token>``; for local
+development ``CP_ADMIN_ENABLED=1`` unlocks it with ``?admin=1``. The panel
+refreshes itself every ``REFRESH_SECONDS`` without rerunning the page.
+"""
+import hmac
+import os
+
+import streamlit as st
+
+from utils.data_loader import get_cache_stats
+from utils.figure_cache import get_figure_cache_stats
+from utils.metrics import get_section_stats, prometheus_text, reset_metrics
+from utils.rerun_timing import get_fragment_stats
+
+REFRESH_SECONDS = 5
+
+def admin_enabled():
+    """True if this session's URL unlocks the admin panel"""
+    value = st.query_params.get('admin')
+    if value is None:
+        return False
+    token = os.environ.get('CP_ADMIN_TOKEN')
+    if token:
+        return hmac.compare_digest(value, token)
+    # No token: only an explicit local-development opt-in enables the panel
+    return os.environ.get('CP_ADMIN_ENABLED') == '1' and value == '1'
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def _admin_panel():
+    import pandas as pd
+
+    from utils.refresher import current_data
+
+    st.markdown("---")
+    st.markdown("### 🔧 Admin: Section Latency")
+
+    stats = get_section_stats()
+    if stats:
+        df = pd.DataFrame([{
+            'Section': name,
+            'Runs': s['count'],
+            'p50 (ms)': round(s['p50_ms'], 1),
+            'p95 (ms)': round(s['p95_ms'], 1),
+            'Max (ms)': round(s['max_ms'], 1),
+            'Total (s)': round(s['total_ms'] / 1000, 2),
+        } for name, s in sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)])
+        st.dataframe(df, hide_index=True, width='stretch')
+    else:
+        st.caption("No sections recorded yet")
+
+    figures = get_figure_cache_stats()
+    data_cache = get_cache_stats()
+    financials = current_data().financials_store
+    page_ms = get_fragment_stats()['page_ms']
+    parts = [
+        f"Figure cache: {figures['hits']} hits / {figures['misses']} misses, {figures['entries']} entries",
+        f"Data cache: {data_cache['hits']} hits / {data_cache['misses']} misses",
+        f"Financials: {len(financials):,} rows, {financials.duplicates:,} duplicates dropped",
+    ]
+    if page_ms is not None:
+        parts.append(f"Last full run of this page: {page_ms:.0f} ms")
+    st.caption(" | ".join(parts))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Export Prometheus Metrics", prometheus_text(), file_name='cp_metrics.prom',
+                           mime='text/plain', key='admin_export')
+    with col2:
+        if st.button("Reset Metrics", key='admin_reset'):
+            reset_metrics()
+            st.rerun(scope='fragment')
+
+def render_admin_panel():
+    """Render the admin panel if this session has unlocked it"""
+    if admin_enabled():
+        _admin_panel()
@@ -0,0 +1,185 @@
+"""Indexed product catalog for the consumer app.
+
+``data/products.json`` is converted once per loaded data version into
+columnar arrays (price, original price, quality, stability, discount) plus
+hash indexes by SKU and by name and a category index of row positions.
+Lookups are dict hits and filters are vectorized masks over the columns, so
+both stay well under a millisecond at 100k SKUs. The catalog and its record
+dicts are shared by every session and must not be mutated.
+
+Recommendation rankings are precomputed when the catalog is built: for
+every shopper profile, over the whole catalog and per category, the best
+``RANKING_DEPTH`` rows are selected with a partial partition and sorted.
+Serving the top k of a profile is then a slice of that ranking.
+"""
+import threading
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from utils.data_loader import get_products
+
+REQUIRED_KEYS = ('sku', 'name', 'price', 'quality_score', 'category')
+
+# Shopper profile -> column ranked highest first (None keeps catalog order)
+PROFILE_SCORES = {'quality': 'quality', 'value': 'discount', 'default': None}
+# Rows kept per precomputed ranking; deeper requests are selected on demand
+RANKING_DEPTH = 100
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    records: tuple          # product dicts, in file order
+    skus: np.ndarray
+    names: np.ndarray
+    categories: np.ndarray
+    price: np.ndarray
+    original_price: np.ndarray
+    quality: np.ndarray
+    stability: np.ndarray
+    discount: np.ndarray    # (original_price - price) / original_price
+    low_pesticide: np.ndarray
+    by_sku: dict            # sku -> row
+    by_name: dict           # name -> row
+    by_category: dict       # category -> row positions (ascending)
+    rankings: dict          # (profile, category or None) -> best RANKING_DEPTH rows, best first
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, sku):
+        """Product record for a SKU, or None"""
+        row = self.by_sku.get(sku)
+        return None if row is None else self.records[row]
+
+    def get_by_name(self, name):
+        """Product record for a display name, or None"""
+        row = self.by_name.get(name)
+        return None if row is None else self.records[row]
+
+    def rows(self, category=None):
+        """Row positions of every product, or of one category"""
+        if category is None:
+            return np.arange(len(self.records))
+        return self.by_category.get(category, np.empty(0, dtype=np.int64))
+
+    def filter(self, max_price=None, min_quality=None, category=None):
+        """Row positions matching every given bound (quality on a 0-1 scale)"""
+        if category is None:
+            # Mask the full columns directly instead of gathering them first
+            mask = np.ones(len(self.records), dtype=bool)
+            if max_price is not None:
+                mask &= self.price <= max_price
+            if min_quality is not None:
+                mask &= self.quality >= min_quality
+            return np.flatnonzero(mask)
+        rows = self.rows(category)
+        mask = np.ones(len(rows), dtype=bool)
+        if max_price is not None:
+            mask &= self.price[rows] <= max_price
+        if min_quality is not None:
+            mask &= self.quality[rows] >= min_quality
+        return rows[mask]
+
+    def top(self, profile, k, category=None):
+        """Row positions of the k best products for a shopper profile, best first"""
+        if category is not None and category not in self.by_category:
+            return np.empty(0, dtype=np.int64)
+        ranking = self.rankings[profile, category]
+        available = len(self.records) if category is None else len(self.by_category[category])
+        if k <= len(ranking) or len(ranking) == available:
+            return ranking[:k]
+        # Deeper than the precomputed ranking: select from every row
+        return _ranking(self, profile, self.rows(category), k)
+
+    def take(self, rows):
+        """Product records at the given row positions"""
+        return [self.records[i] for i in rows]
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first; ties keep index order"""
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    # Partial selection: everything above the k-th largest score, then ties at it
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    selected = np.concatenate([above, ties])
+    return selected[np.argsort(-scores[selected], kind='stable')]
+
+def _ranking(catalog, profile, rows, k):
+    """The k best of rows for a profile"""
+    column = PROFILE_SCORES[profile]
+    if column is None:
+        return rows[:k]
+    return rows[top_k(getattr(catalog, column)[rows], k)]
+
+def _build_rankings(catalog):
+    rankings = {}
+    for profile in PROFILE_SCORES:
+        rankings[profile, None] = _ranking(catalog, profile, catalog.rows(), RANKING_DEPTH)
+        for category, rows in catalog.by_category.items():
+            rankings[profile, category] = _ranking(catalog, profile, rows, RANKING_DEPTH)
+    return rankings
+
+def build_catalog(raw):
+    """Convert the products dataset into a Catalog"""
+    records = []
+    seen = set()
+    for i, record in enumerate(raw.get('products', [])):
+        missing = [k for k in REQUIRED_KEYS if k not in record]
+        if missing:
+            print(f"Warning: skipping invalid product {i} (missing {', '.join(missing)})")
+            continue
+        if record['sku'] in seen:
+            print(f"Warning: skipping duplicate product sku '{record['sku']}'")
+            continue
+        if record['price'] <= 0:
+            print(f"Warning: skipping product '{record['sku']}' (price must be positive)")
+            continue
+        seen.add(record['sku'])
+        records.append(record)
+
+    price = np.array([r['price'] for r in records], dtype=np.float64)
+    original_price = np.array([r.get('original_price', r['price']) for r in records], dtype=np.float64)
+    original_price = np.maximum(original_price, price)
+    categories = np.array([r['category'] for r in records], dtype=object)
+
+    by_name = {}
+    by_category = {}
+    for row, record in enumerate(records):
+        by_name.setdefault(record['name'], row)
+        by_category.setdefault(record['category'], []).append(row)
+
+    catalog = Catalog(
+        records=tuple(records),
+        skus=np.array([r['sku'] for r in records], dtype=object),
+        names=np.array([r['name'] for r in records], dtype=object),
+        categories=categories,
+        price=price,
+        original_price=original_price,
+        quality=np.array([r['quality_score'] for r in records], dtype=np.float64),
+        stability=np.array([r.get('stability_score', 0.0) for r in records], dtype=np.float64),
+        discount=(original_price - price) / original_price,
+        low_pesticide=np.array([bool(r.get('low_pesticide', False)) for r in records], dtype=bool),
+        by_sku={r['sku']: row for row, r in enumerate(records)},
+        by_name=by_name,
+        by_category={c: np.array(rows, dtype=np.int64) for c, rows in by_category.items()},
+        rankings={},
+    )
+    return replace(catalog, rankings=_build_rankings(catalog))
+
+# (raw object the catalog was built from, catalog)
+_catalog = {'raw': None, 'catalog': None}
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Process-wide catalog, rebuilt when the products file changes"""
+    raw = get_products()
+    with _catalog_lock:
+        if _catalog['raw'] is not raw:
+            _catalog['catalog'] = build_catalog(raw)
+            _catalog['raw'] = raw
+        return _catalog['catalog']
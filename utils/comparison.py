@@ -0,0 +1,75 @@
+"""N-way competitor comparison.
+
+The attribute matrix (model, city count, SKU count, traceability coverage,
+fulfillment cost and product mix) is pivoted once per data version for every
+competitor in ``competitors.json``. Comparing any subset is then a column
+slice of the pre-built tables.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+ATTRIBUTES = ['Business Model', 'Cities', 'SKU Count', 'Traceability', 'Fulfillment Cost']
+
+@dataclass(frozen=True, slots=True)
+class CompetitorMatrix:
+    keys: tuple
+    names: dict
+    values: pd.DataFrame    # numeric attributes, one row per competitor key
+    product_mix: pd.DataFrame  # category shares, one row per competitor key
+    display: pd.DataFrame   # formatted attributes and mix, one column per competitor key
+
+    def __len__(self):
+        return len(self.keys)
+
+    def compare(self, keys, rows=None):
+        """Formatted comparison table (attributes x competitors) for the given competitors"""
+        keys = [k for k in keys if k in self.names]
+        table = self.display[keys] if rows is None else self.display.loc[rows, keys]
+        return table.rename(columns=self.names).rename_axis(columns=None)
+
+    def mix(self, keys):
+        """Product mix shares (categories x competitors) for the given competitors"""
+        keys = [k for k in keys if k in self.names]
+        return self.product_mix.loc[keys].T.rename(columns=self.names).rename_axis(columns=None)
+
+def _category_label(category):
+    return category.replace('_', ' ').title()
+
+def build_matrix(competitors):
+    """Pivot Competitor records into a CompetitorMatrix"""
+    competitors = list(competitors)
+    keys = tuple(c.key for c in competitors)
+    values = pd.DataFrame({
+        'model': [c.model for c in competitors],
+        'cities': [len(c.cities) for c in competitors],
+        'sku_count': [c.sku_count for c in competitors],
+        'traceability': [c.traceability.split(' - ')[0] for c in competitors],
+        'traceability_coverage': [c.traceability_coverage for c in competitors],
+        'fulfillment_cost': [c.fulfillment_cost_2024 for c in competitors],
+    }, index=pd.Index(keys, name='competitor'))
+
+    # Union of categories in first-seen order; missing categories are 0
+    product_mix = pd.DataFrame.from_records(
+        [c.product_categories for c in competitors], index=pd.Index(keys, name='competitor')
+    ).fillna(0.0)
+    product_mix.columns = [_category_label(c) for c in product_mix.columns]
+
+    formatted = pd.DataFrame({
+        'Business Model': values['model'],
+        'Cities': values['cities'].map(str),
+        'SKU Count': values['sku_count'].map('{:,}'.format),
+        'Traceability': [f"{label} ({coverage:.0%})" if label else f"{coverage:.0%}"
+                         for label, coverage in zip(values['traceability'], values['traceability_coverage'])],
+        'Fulfillment Cost': [f"¥{cost/1e6:.1f}M" if cost else "n/a" for cost in values['fulfillment_cost']],
+    }, index=values.index)
+    mix_formatted = product_mix.apply(lambda col: col.map('{:.0%}'.format))
+    mix_formatted.columns = [f"Mix: {c}" for c in mix_formatted.columns]
+
+    return CompetitorMatrix(
+        keys=keys,
+        names={c.key: c.name for c in competitors},
+        values=values,
+        product_mix=product_mix,
+        display=pd.concat([formatted, mix_formatted], axis=1).T,
+    )
@@ -1,29 +1,181 @@
+import hashlib
 import json
 import os
+import threading
+import time
 from pathlib import Path
 
+from utils.metrics import record
+
+# Process-wide cache shared by every Streamlit session.
+# filename -> {'stat': (mtime, size) or None if missing, 'hash': str or None, 'data': parsed JSON}
+_cache = {}
+# Guards _cache and the counters only; reads and parses run under a per-file lock
+_cache_lock = threading.Lock()
+_file_locks = {}
+_cache_stats = {'hits': 0, 'misses': 0, 'reloads_skipped': 0, 'snapshot_loads': 0}
+
+# Dataset name -> source file, fetched lazily through the accessors below
+DATASETS = {
+    'competitors': 'competitors.json',
+    'market': 'market_data.json',
+    'segments': 'customer_segments.json',
+    'financials': 'dingdong_financials.json',
+    'opportunities': 'opportunities.json',
+    'cities': 'cities.json',
+    'products': 'products.json',
+}
+# Compiled snapshot (see utils/snapshot.py), reopened when its mtime changes
+SNAPSHOT_FILE = 'cp_data.snapshot'
+_snapshot = {'mtime': None, 'snapshot': None}
+_snapshot_lock = threading.Lock()
+
 def get_data_path(filename):
     """Get the absolute path to a data file"""
     current_dir = Path(__file__).parent.parent
     return current_dir / "data" / filename
 
-def load_json(filename):
-    """Load JSON data from data directory"""
+def _parse_json(filename, raw):
+    """Parse raw JSON bytes, returning an empty dict on invalid content"""
     try:
-        with open(get_data_path(filename), 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Warning: {filename} not found")
-        return {}
-    except json.JSONDecodeError:
+        return json.loads(raw.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
         print(f"Warning: {filename} contains invalid JSON")
         return {}
 
-def load_all_data():
-    """Load all required data files"""
-    competitors = load_json('competitors.json')
-    market = load_json('market_data.json')
-    segments = load_json('customer_segments.json')
-    financials = load_json('dingdong_financials.json')
-    
-    return competitors, market, segments, financials
+def _get_snapshot():
+    """Return the compiled data snapshot if one has been built, else None"""
+    path = get_data_path(SNAPSHOT_FILE)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    with _snapshot_lock:
+        if _snapshot['mtime'] != mtime:
+            from utils.snapshot import Snapshot
+            try:
+                _snapshot['snapshot'] = Snapshot(path)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring data snapshot ({e})")
+                _snapshot['snapshot'] = None
+            _snapshot['mtime'] = mtime
+        return _snapshot['snapshot']
+
+def _cached(filename, stat):
+    """Cached data for filename if it was loaded at this stat (caller holds _cache_lock)"""
+    entry = _cache.get(filename)
+    if entry is not None and entry['stat'] == stat:
+        _cache_stats['hits'] += 1
+        return entry
+    return None
+
+def load_json(filename):
+    """Load JSON data from data directory.
+
+    Parsed results are cached for the whole process. A file is only re-read
+    when its mtime or size changes, and only re-parsed when its content hash
+    changes. When a compiled snapshot matches the source file it is used
+    instead of parsing JSON. A missing file is cached as ``{}`` until it
+    appears. The returned object is shared between sessions and must not
+    be mutated.
+
+    Files are read and parsed under a per-file lock, so a slow load only
+    blocks sessions waiting for the same file.
+    """
+    path = get_data_path(filename)
+    try:
+        info = os.stat(path)
+        stat = (info.st_mtime, info.st_size)
+    except FileNotFoundError:
+        stat = None
+
+    with _cache_lock:
+        entry = _cached(filename, stat)
+        if entry is not None:
+            return entry['data']
+        file_lock = _file_locks.setdefault(filename, threading.Lock())
+
+    with file_lock:
+        with _cache_lock:
+            # Another session may have loaded it while this one waited
+            entry = _cached(filename, stat)
+            if entry is not None:
+                return entry['data']
+            entry = _cache.get(filename)
+
+        mtime, size = stat if stat is not None else (None, None)
+        snapshot = _get_snapshot()
+        if snapshot is not None and snapshot.is_fresh(filename, mtime, size):
+            data = snapshot.load(filename)
+            content_hash = snapshot.sources[filename]['sha1']
+            counters = ('misses', 'snapshot_loads')
+        elif stat is None:
+            print(f"Warning: {filename} not found")
+            data, content_hash = {}, None
+            counters = ('misses',)
+        else:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            content_hash = hashlib.sha1(raw).hexdigest()
+            if entry is not None and entry['hash'] == content_hash:
+                # Touched but unchanged - keep the parsed data
+                data = entry['data']
+                counters = ('hits', 'reloads_skipped')
+            elif snapshot is not None and snapshot.sources.get(filename, {}).get('sha1') == content_hash:
+                data = snapshot.load(filename)
+                counters = ('misses', 'snapshot_loads')
+            else:
+                data = _parse_json(filename, raw)
+                counters = ('misses',)
+
+        with _cache_lock:
+            _cache[filename] = {'stat': stat, 'hash': content_hash, 'data': data}
+            for counter in counters:
+                _cache_stats[counter] += 1
+        return data
+
+def get_cache_stats():
+    """Return hit/miss counters and the files currently cached"""
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['files'] = {name: (entry['hash'] or 'missing')[:12] for name, entry in _cache.items()}
+    return stats
+
+def get_backend():
+    """Configured data backend: 'json' (default) or 'sqlite'"""
+    return os.environ.get('CP_DATA_BACKEND', 'json').strip().lower()
+
+def load_dataset(name):
+    """Load one dataset by name and record how long it took"""
+    start = time.perf_counter()
+    data = load_json(DATASETS[name])
+    record(f"data.load.{name}", (time.perf_counter() - start) * 1000)
+    return data
+
+def get_competitors():
+    """Competitor profiles keyed by competitor id"""
+    return load_dataset('competitors')
+
+def get_market():
+    """Market size, penetration and trend data"""
+    return load_dataset('market')
+
+def get_segments():
+    """Customer segment profiles keyed by segment id"""
+    return load_dataset('segments')
+
+def get_financials():
+    """Quarterly financial results"""
+    return load_dataset('financials')
+
+def get_opportunities():
+    """Scoring criteria with default weights and candidate opportunities"""
+    return load_dataset('opportunities')
+
+def get_cities():
+    """City entry criteria with default weights and per-city scores"""
+    return load_dataset('cities')
+
+def get_products():
+    """Consumer app product catalog records"""
+    return load_dataset('products')
@@ -0,0 +1,80 @@
+"""Server-side downsampling for long time series.
+
+Charts send at most ``max_points()`` points per trace: one per pixel of the
+expected chart width, and fewer when several traces would push the payload
+over ``MAX_CHART_BYTES``. ``budgeted_figure`` checks the serialized size and
+halves the point cap until the figure fits, so payloads stay bounded no
+matter how long the history gets. Pages re-query a narrower window (the
+zoom range) at full resolution.
+
+Both reducers return sorted indices that always include the first and last
+point, so callers can slice labels, colors and values alike.
+"""
+import numpy as np
+
+DEFAULT_WIDTH_PX = 1200
+MAX_CHART_BYTES = 150_000
+# Rough serialized size of one (label, value, marker color) point
+BYTES_PER_POINT = 40
+MIN_POINTS = 16
+
+def max_points(n_traces=1, width_px=DEFAULT_WIDTH_PX, byte_budget=MAX_CHART_BYTES):
+    """Points allowed per trace for a chart of the given width and byte budget"""
+    by_bytes = byte_budget // (BYTES_PER_POINT * max(n_traces, 1))
+    return int(max(MIN_POINTS, min(width_px, by_bytes)))
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out visually representative points"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are fixed; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+def minmax(y, n_out):
+    """Indices of the min and max of each bucket (n_out // 2 buckets)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    padded = np.full(size * n_buckets, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    lo = offsets + np.nanargmin(buckets[valid], axis=1)
+    hi = offsets + np.nanargmax(buckets[valid], axis=1)
+    return np.unique(np.r_[0, lo, hi, n - 1])
+
+def downsample(x, y, n_out, method='lttb'):
+    """Indices of at most about n_out points of (x, y)"""
+    if method == 'minmax':
+        return minmax(y, n_out)
+    return lttb(x, y, n_out)
+
+def budgeted_figure(build, n_points, byte_budget=MAX_CHART_BYTES):
+    """Build a figure with build(n_points), halving n_points until its JSON fits the budget"""
+    while True:
+        fig = build(n_points)
+        if n_points <= MIN_POINTS or len(fig.to_json()) <= byte_budget:
+            return fig
+        n_points //= 2
@@ -0,0 +1,279 @@
+"""Market Entry Strategy Simulator.
+
+``success_score`` is the simulator's scoring rule written with array
+operations, so the same code scores one slider configuration or millions of
+them. ``run_monte_carlo`` draws scenarios over the uncertain market inputs
+(CAGR, instant retail penetration and fulfillment cost) in vectorized
+batches, optionally spread across a process pool, and summarizes the
+resulting revenue distribution. ``optimize`` evaluates the full
+configuration grid and returns the Pareto front of success probability
+versus investment.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+BUSINESS_MODELS = ["Front Warehouse", "Store-Warehouse Integration", "Hybrid Model"]
+PRICE_POSITIONS = ["Premium", "Mid-range", "Value"]
+
+MODEL_BONUS = {"Front Warehouse": 5, "Store-Warehouse Integration": 10, "Hybrid Model": 15}
+PRICE_BONUS = {"Premium": 0, "Mid-range": 10, "Value": 0}
+
+BASE_SCORE = 50
+MAX_SUCCESS = 95
+# Year-3 market share (%) per point of success probability
+SHARE_PER_POINT = 0.08
+# Success points lost per 1% fulfillment cost overrun
+COST_SENSITIVITY = 0.5
+
+# Indicative investment model (CNY): setup per city by business model,
+# per slider point (per city for traceability and organic sourcing,
+# company-wide for tech) and price positioning subsidies per city
+CITY_SETUP_COST = {"Front Warehouse": 0.6e9, "Store-Warehouse Integration": 1.2e9, "Hybrid Model": 0.9e9}
+TRACEABILITY_COST_PER_POINT = 4e6
+ORGANIC_COST_PER_POINT = 3e6
+TECH_COST_PER_POINT = 10e6
+PRICE_SUBSIDY_PER_CITY = {"Premium": 0, "Mid-range": 0.1e9, "Value": 0.25e9}
+
+CITY_COUNTS = (1, 2, 3, 4, 5)
+
+# Monte Carlo input uncertainty
+CAGR_SD = 0.05
+PENETRATION_SD = 0.05
+COST_SIGMA = 0.15
+
+BATCH_SIZE = 100_000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Optimizer results kept, one per slider step (least recently used evicted)
+OPTIMIZE_CACHE_ENTRIES = 4
+
+@dataclass(frozen=True, slots=True)
+class EntryConfig:
+    entry_model: str
+    initial_cities: int
+    traceability_level: int
+    organic_focus: int
+    tech_investment: int
+    price_positioning: str
+
+def success_score(model_bonus, initial_cities, traceability_level, organic_focus,
+                  tech_investment, price_bonus):
+    """Success probability (%) for scalars or broadcastable arrays"""
+    score = (BASE_SCORE + model_bonus + initial_cities * 3 + traceability_level * 0.2
+             + organic_focus * 0.15 + tech_investment * 0.1 + price_bonus)
+    return np.minimum(score, MAX_SUCCESS)
+
+def config_score(config):
+    return float(success_score(
+        MODEL_BONUS[config.entry_model], config.initial_cities, config.traceability_level,
+        config.organic_focus, config.tech_investment, PRICE_BONUS[config.price_positioning],
+    ))
+
+def investment(city_setup_cost, initial_cities, traceability_level, organic_focus,
+               tech_investment, price_subsidy):
+    """Indicative entry investment (CNY) for scalars or broadcastable arrays"""
+    per_city = (city_setup_cost + traceability_level * TRACEABILITY_COST_PER_POINT
+                + organic_focus * ORGANIC_COST_PER_POINT + price_subsidy)
+    return initial_cities * per_city + tech_investment * TECH_COST_PER_POINT
+
+def config_investment(config):
+    return float(investment(
+        CITY_SETUP_COST[config.entry_model], config.initial_cities, config.traceability_level,
+        config.organic_focus, config.tech_investment, PRICE_SUBSIDY_PER_CITY[config.price_positioning],
+    ))
+
+def simulate(config, market):
+    """Deterministic point estimate: (success %, market share %, revenue CNY)"""
+    success = config_score(config)
+    share = success * SHARE_PER_POINT
+    return success, share, share * market['market_size_2025_projected'] / 100
+
+def market_inputs(market):
+    """Baseline values of the uncertain inputs, taken from market_data.json"""
+    return {
+        'market_size_2024': float(market['market_size_2024']),
+        'cagr': float(market['growth_rate_cagr']),
+        'penetration': float(market['instant_retail_penetration']['tier1']),
+    }
+
+def _simulate_batch(base_success, inputs, size, seed):
+    """Draw one batch of scenarios; returns (success %, revenue CNY) arrays"""
+    rng = np.random.default_rng(seed)
+    cagr = rng.normal(inputs['cagr'], CAGR_SD, size)
+    penetration = np.clip(rng.normal(inputs['penetration'], PENETRATION_SD, size), 0.01, 1)
+    cost_ratio = rng.lognormal(0, COST_SIGMA, size)
+
+    success = np.clip(base_success - COST_SENSITIVITY * (cost_ratio - 1) * 100, 0, MAX_SUCCESS)
+    share = success * SHARE_PER_POINT * (penetration / inputs['penetration'])
+    market_size = inputs['market_size_2024'] * (1 + np.maximum(cagr, -0.99))
+    return success, share * market_size / 100
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(workers=None):
+    """Shared worker pool, started on first use (size from CP_SIM_WORKERS or the CPU count)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = workers or int(os.environ.get('CP_SIM_WORKERS', 0)) or os.cpu_count()
+            # spawn, not fork: the Streamlit server process is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(shutdown_pool)
+        return _pool
+
+def shutdown_pool():
+    """Stop the worker pool if it was started; the next get_pool() starts a new one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def run_monte_carlo(config, market, n_scenarios=1_000_000, batch_size=BATCH_SIZE,
+                    use_pool=False, seed=None):
+    """Simulate n_scenarios and summarize the success and revenue distributions.
+
+    Every batch gets an independent child seed, so results are identical
+    whether batches run in-process or on the pool.
+    """
+    start = time.perf_counter()
+    base_success = config_score(config)
+    inputs = market_inputs(market)
+    sizes = [min(batch_size, n_scenarios - offset) for offset in range(0, n_scenarios, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if use_pool and len(sizes) > 1:
+        pool = get_pool()
+        results = list(pool.map(_simulate_batch, [base_success] * len(sizes),
+                                [inputs] * len(sizes), sizes, seeds))
+    else:
+        results = [_simulate_batch(base_success, inputs, size, s) for size, s in zip(sizes, seeds)]
+
+    success = np.concatenate([r[0] for r in results])
+    revenue = np.concatenate([r[1] for r in results])
+    counts, edges = np.histogram(revenue, bins=60)
+    return {
+        'n_scenarios': n_scenarios,
+        'base_success': base_success,
+        'success_percentiles': dict(zip(PERCENTILES, np.percentile(success, PERCENTILES))),
+        'revenue_percentiles': dict(zip(PERCENTILES, np.percentile(revenue, PERCENTILES))),
+        'revenue_mean': float(revenue.mean()),
+        'histogram': (counts, edges),
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+    }
+
+def _chunk_front(success, cost):
+    """Cheapest grid cell for every distinct success level in one chunk.
+
+    Success values are multiples of 0.05, so they are bucketed as integers
+    and grouped with a stable (radix) sort instead of a float sort.
+    Returns (flat cell indices, success, cost).
+    """
+    levels = np.rint(success.ravel() * 20).astype(np.int16)
+    cost = cost.ravel()
+    order = np.argsort(levels, kind='stable')
+    sorted_levels = levels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_levels[1:] != sorted_levels[:-1]])
+    sorted_cost = cost[order]
+    min_cost = np.minimum.reduceat(sorted_cost, starts)
+    # First cell in each group that attains the group minimum
+    sizes = np.diff(np.r_[starts, len(order)])
+    hits = np.flatnonzero(sorted_cost == np.repeat(min_cost, sizes))
+    first = hits[np.searchsorted(hits, starts)]
+    cells = order[first]
+    return cells, sorted_levels[starts] / 20, min_cost
+
+def _pareto(success, cost):
+    """Indices of points not dominated on (max success, min cost), cheapest first"""
+    order = np.lexsort((-success, cost))
+    best = np.maximum.accumulate(success[order])
+    keep = np.r_[True, success[order][1:] > best[:-1]]
+    return order[keep]
+
+_optimize_cache = OrderedDict()
+_optimize_lock = threading.Lock()
+
+def optimize(slider_step=1):
+    """Evaluate every configuration and return its success/investment Pareto front.
+
+    Business model, city count and price position are enumerated, one chunk
+    each. Inside a chunk the three sliders form a broadcast
+    (traceability, organic, tech) cube, so peak memory is bounded by one
+    cube regardless of the total grid size. Results depend only on the step;
+    the last OPTIMIZE_CACHE_ENTRIES steps are cached, and a cached result is
+    returned with ``cached=True`` (its stats are those of the original
+    search).
+    """
+    with _optimize_lock:
+        result = _optimize_cache.get(slider_step)
+        if result is not None:
+            _optimize_cache.move_to_end(slider_step)
+            return dict(result, cached=True)
+
+    start = time.perf_counter()
+    levels = np.arange(0, 101, slider_step, dtype=np.float64)
+    trace = levels[:, None, None]
+    organic = levels[None, :, None]
+    tech = levels[None, None, :]
+    cube_shape = (len(levels),) * 3
+
+    chunk_ms = []
+    candidates = []
+    for model in BUSINESS_MODELS:
+        for cities in CITY_COUNTS:
+            for price in PRICE_POSITIONS:
+                chunk_start = time.perf_counter()
+                success = success_score(MODEL_BONUS[model], cities, trace, organic, tech,
+                                        PRICE_BONUS[price])
+                cost = investment(CITY_SETUP_COST[model], cities, trace, organic, tech,
+                                  PRICE_SUBSIDY_PER_CITY[price])
+                success, cost = np.broadcast_arrays(success, cost)
+                cells, chunk_success, chunk_cost = _chunk_front(success, cost)
+                t, o, c = np.unravel_index(cells, cube_shape)
+                for i in _pareto(chunk_success, chunk_cost):
+                    candidates.append((model, cities, price, levels[t[i]], levels[o[i]],
+                                       levels[c[i]], chunk_success[i], chunk_cost[i]))
+                chunk_ms.append((time.perf_counter() - chunk_start) * 1000)
+
+    cand_success = np.array([c[6] for c in candidates])
+    cand_cost = np.array([c[7] for c in candidates])
+    front = []
+    for i in _pareto(cand_success, cand_cost):
+        model, cities, price, t, o, c, success, cost = candidates[i]
+        front.append({
+            'config': EntryConfig(model, cities, int(t), int(o), int(c), price),
+            'success': float(success),
+            'investment': float(cost),
+        })
+
+    elapsed = time.perf_counter() - start
+    n_evaluated = len(chunk_ms) * len(levels) ** 3
+    result = {
+        'front': front,
+        'stats': {
+            'n_evaluated': n_evaluated,
+            'n_chunks': len(chunk_ms),
+            'chunk_cells': len(levels) ** 3,
+            'elapsed_ms': elapsed * 1000,
+            'mean_chunk_ms': float(np.mean(chunk_ms)),
+            'max_chunk_ms': float(np.max(chunk_ms)),
+            'cells_per_second': n_evaluated / elapsed,
+        },
+        'cached': False,
+    }
+    with _optimize_lock:
+        _optimize_cache[slider_step] = result
+        _optimize_cache.move_to_end(slider_step)
+        while len(_optimize_cache) > OPTIMIZE_CACHE_ENTRIES:
+            _optimize_cache.popitem(last=False)
+    return result
@@ -0,0 +1,114 @@
+"""Process-wide LRU cache of serialized Plotly figures.
+
+Figures are keyed by (figure id, data version, parameters). On a hit the
+stored JSON spec is sent to the browser directly, so repeat views skip both
+figure construction and serialization. Usage:
+
+    cached_plotly_chart('market_size', data.number, build_market_size_figure)
+"""
+import json
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.metrics import timed
+
+MAX_ENTRIES = 256
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+# Set once the private fast path has failed; later charts use st.plotly_chart directly
+_fast_path = {'broken': False}
+
+def _freeze(value):
+    """Turn params into a hashable cache-key component"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _serialize(fig):
+    """Serialize exactly as st.plotly_chart does; returns (spec, natural height)"""
+    import plotly.io
+
+    figure = fig.to_dict()
+    height = figure.get('layout', {}).get('height')
+    if not isinstance(height, (int, float)) or height <= 0:
+        height = 450  # plotly.js default, as used by st.plotly_chart
+    return plotly.io.to_json(figure, validate=False), int(height)
+
+def get_figure_spec(figure_id, version, build, params=None):
+    """Return the cached (spec, height) for a figure, building it on a miss"""
+    key = (figure_id, version, _freeze(params))
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats['hits'] += 1
+            return entry
+
+    # Build outside the lock so slow figures don't block other sessions
+    with timed(f"figure.{figure_id}"):
+        entry = _serialize(build())
+    with _lock:
+        _stats['misses'] += 1
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats['evictions'] += 1
+    return entry
+
+def _enqueue_spec(spec, height, config):
+    """Send a pre-serialized spec as a plotly_chart element (Streamlit 1.52 internals).
+
+    tests/test_figure_cache.py checks the element against st.plotly_chart.
+    """
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    dg = st._main
+    proto = PlotlyChartProto()
+    proto.theme = 'streamlit'
+    proto.form_id = current_form_id(dg)
+    proto.spec = spec
+    proto.config = json.dumps(config or {})
+    proto.id = compute_and_register_element_id(
+        'plotly_chart',
+        user_key=None,
+        key_as_main_identity=False,
+        dg=dg,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=('points', 'box', 'lasso'),
+        is_selection_activated=False,
+        theme='streamlit',
+        width='stretch',
+        height='content',
+    )
+    dg._enqueue('plotly_chart', proto, layout_config=LayoutConfig(width='stretch', height=height))
+
+def cached_plotly_chart(figure_id, version, build, params=None, config=None):
+    """Render a full-width Plotly chart from the figure cache"""
+    spec, height = get_figure_spec(figure_id, version, build, params)
+    if not _fast_path['broken']:
+        try:
+            _enqueue_spec(spec, height, config)
+            return
+        except Exception as e:
+            # Streamlit internals changed - fall back to the public API from now on
+            _fast_path['broken'] = True
+            print(f"Warning: cached chart fast path unavailable, using st.plotly_chart ({e!r})")
+    st.plotly_chart(json.loads(spec), width='stretch', config=config)
+
+def get_figure_cache_stats():
+    """Return hit/miss/eviction counters and the current entry count"""
+    with _lock:
+        stats = dict(_stats)
+        stats['entries'] = len(_entries)
+    return stats
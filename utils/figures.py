@@ -0,0 +1,183 @@
+"""Dashboard figures that depend only on the data version.
+
+The Market Analysis and Customer Insights charts take no widget input, so
+their builders live here instead of in the page. The dashboard renders them
+through ``cached_plotly_chart`` and ``utils.warmup`` builds the same cache
+entries (same figure id, version and params) up front, so their first view
+is a cache hit.
+"""
+import plotly.graph_objects as go
+
+DEFAULT_SEGMENT = 'pragmatic_middle_class'
+
+def market_size_figure(data):
+    market = data.market
+    years = [2023, 2024, 2025]
+    sizes = [
+        market['market_size_2023']/1e9,
+        market['market_size_2024']/1e9,
+        market['market_size_2025_projected']/1e9
+    ]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=years,
+        y=sizes,
+        text=[f'¥{s:.1f}B' for s in sizes],
+        textposition='outside',
+        marker_color='#2E7D32'
+    ))
+
+    fig.update_layout(
+        title=f"Chinese Fresh E-commerce Market Size (CAGR: {market['growth_rate_cagr']*100:.0f}%)",
+        xaxis_title="Year",
+        yaxis_title="Market Size (Billion CNY)",
+        height=400
+    )
+    return fig
+
+def tier_penetration_figure(data):
+    penetration_data = data.market['instant_retail_penetration']
+
+    fig = go.Figure(go.Bar(
+        x=list(penetration_data.keys()),
+        y=[v*100 for v in penetration_data.values()],
+        text=[f'{v*100:.0f}%' for v in penetration_data.values()],
+        textposition='outside',
+        marker_color=['#1B5E20', '#2E7D32', '#66BB6A', '#A5D6A7']
+    ))
+
+    fig.update_layout(
+        title="Instant Retail Market Penetration",
+        xaxis_title="City Tier",
+        yaxis_title="Penetration Rate (%)",
+        height=400,
+        yaxis=dict(range=[0, 50])
+    )
+    return fig
+
+def consumer_segments_figure(data):
+    segment_data = data.market['consumer_segments']
+
+    fig = go.Figure(data=[go.Pie(
+        labels=list(segment_data.keys()),
+        values=list(segment_data.values()),
+        hole=0.4,
+        marker_colors=['#2E7D32', '#FFA726', '#42A5F5'],
+        textinfo='label+percent'
+    )])
+
+    fig.update_layout(
+        title="Consumer Segment Distribution",
+        height=400
+    )
+    return fig
+
+def pain_points_figure(data):
+    # Least severe first, so the most severe bar is drawn on top
+    pain_points = sorted(data.market['key_pain_points'].items(), key=lambda item: item[1]['severity'])
+    severities = [v['severity'] for _, v in pain_points]
+
+    fig = go.Figure(go.Bar(
+        x=severities,
+        y=[k.replace('_', ' ').title() for k, _ in pain_points],
+        orientation='h',
+        text=[f'{s*100:.0f}%' for s in severities],
+        textposition='outside',
+        marker_color=['#C62828' if s > 0.8 else '#F57C00' if s > 0.7 else '#FFA726'
+                      for s in severities]
+    ))
+
+    fig.update_layout(
+        title="Industry Pain Points by Severity",
+        xaxis_title="Severity Score",
+        yaxis_title="",
+        height=500,
+        xaxis=dict(range=[0, 1])
+    )
+    return fig
+
+def health_index_figure(data):
+    health_metrics = {
+        'Market Growth': 0.85,
+        'Profitability': 0.45,
+        'Technology Adoption': 0.65,
+        'Supply Chain Maturity': 0.58,
+        'Customer Satisfaction': 0.62,
+        'Competitive Intensity': 0.75
+    }
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=list(health_metrics.values()),
+        theta=list(health_metrics.keys()),
+        fill='toself',
+        fillcolor='rgba(46, 125, 50, 0.3)',
+        line=dict(color='#2E7D32', width=2)
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(visible=True, range=[0, 1])
+        ),
+        title="Industry Health Assessment (0-1 scale)",
+        height=500
+    )
+    return fig
+
+def priorities_figure(data, segment_key):
+    priorities = data.segment(segment_key).priorities
+
+    fig = go.Figure(go.Bar(
+        x=list(priorities.values()),
+        y=list(priorities.keys()),
+        orientation='h',
+        text=[f'{v*100:.0f}%' for v in priorities.values()],
+        textposition='outside',
+        marker_color='#2E7D32'
+    ))
+
+    fig.update_layout(
+        title="Priority Rankings",
+        xaxis_title="Importance Score",
+        yaxis_title="",
+        height=400,
+        xaxis=dict(range=[0, 1])
+    )
+    return fig
+
+def product_preferences_figure(data, segment_key):
+    prefs = data.segment(segment_key).product_preferences
+
+    fig = go.Figure(data=[go.Pie(
+        labels=list(prefs.keys()),
+        values=list(prefs.values()),
+        hole=0.3,
+        textinfo='label+percent'
+    )])
+
+    fig.update_layout(
+        title="Product Category Preferences",
+        height=400
+    )
+    return fig
+
+# (figure id, params, builder) of every chart above as the dashboard shows it
+FIGURES = [
+    ('market_size', None, market_size_figure),
+    ('tier_penetration', None, tier_penetration_figure),
+    ('consumer_segments', None, consumer_segments_figure),
+    ('pain_points', None, pain_points_figure),
+    ('health_index', None, health_index_figure),
+    ('priorities', DEFAULT_SEGMENT, lambda data: priorities_figure(data, DEFAULT_SEGMENT)),
+    ('product_preferences', DEFAULT_SEGMENT, lambda data: product_preferences_figure(data, DEFAULT_SEGMENT)),
+]
+
+def prime_figures(data):
+    """Build and cache every figure in FIGURES for a data version"""
+    from utils.figure_cache import get_figure_spec
+
+    for figure_id, params, build in FIGURES:
+        get_figure_spec(figure_id, data.number, lambda: build(data), params)
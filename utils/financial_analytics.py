@@ -0,0 +1,187 @@
+"""Vectorized time-series analytics over the financials store.
+
+All companies are pivoted into one (companies, periods) matrix, with NaN
+for quarters a company did not report, and every metric is computed for
+all of them at once:
+
+- QoQ and YoY deltas and a rolling mean
+- a least-squares linear trend over the most recent quarters
+- a break-even projection with a confidence interval, taken from where the
+  trend's confidence band crosses zero
+
+Results are built once per data version (``DataVersion.financial_analytics``).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+ROLLING_WINDOW = 4
+ROLLING_MIN_PERIODS = 1
+TREND_WINDOW = 8
+FORECAST_HORIZON = 12
+Z_SCORE = 1.96  # 95% confidence band
+
+@dataclass(frozen=True, slots=True)
+class FinancialAnalytics:
+    companies: tuple
+    periods: np.ndarray      # period index: year * 4 + quarter - 1
+    values: np.ndarray       # (companies, periods) net profit/loss, NaN if missing
+    qoq: np.ndarray
+    yoy: np.ndarray
+    rolling_mean: np.ndarray
+    last_index: np.ndarray   # column of each company's last reported quarter, -1 if none
+    slope: np.ndarray        # per quarter
+    intercept: np.ndarray    # at period index 0 of the trend window
+    trend_start: np.ndarray  # period index where each company's trend window starts
+    forecast_periods: np.ndarray
+    forecast: np.ndarray     # (companies, horizon) fitted trend beyond the last period
+    forecast_lower: np.ndarray
+    forecast_upper: np.ndarray
+    break_even: dict         # company -> break-even summary
+
+    def labels(self, periods=None):
+        periods = self.periods if periods is None else periods
+        return [period_label(p) for p in periods]
+
+    def row(self, company):
+        return self.companies.index(company)
+
+def period_label(period):
+    return f"{period // 4} Q{period % 4 + 1}"
+
+def _pivot(store):
+    """(companies, period indices, values matrix) from the store's columns"""
+    cols = store.columns
+    if len(cols['year']) == 0:
+        return (), np.empty(0, dtype=np.int64), np.empty((0, 0))
+    period = cols['year'].astype(np.int64) * 4 + (cols['quarter'].astype(np.int64) - 1)
+    first, last = period.min(), period.max()
+    n_periods = last - first + 1
+    n_companies = len(store.companies)
+
+    flat = cols['company'].astype(np.int64) * n_periods + (period - first)
+    sums = np.bincount(flat, weights=cols['net_loss'], minlength=n_companies * n_periods)
+    counts = np.bincount(flat, minlength=n_companies * n_periods)
+    values = np.where(counts > 0, sums, np.nan).reshape(n_companies, n_periods)
+    return tuple(store.companies), np.arange(first, last + 1), values
+
+def _rolling_mean(values, window, min_periods=ROLLING_MIN_PERIODS):
+    """Trailing mean over the last `window` quarters, skipping unreported ones.
+
+    NaN where fewer than `min_periods` quarters in the window were reported.
+    """
+    filled = np.nan_to_num(values)
+    present = ~np.isnan(values)
+    csum = np.cumsum(filled, axis=1)
+    ccount = np.cumsum(present, axis=1)
+    csum[:, window:] = csum[:, window:] - csum[:, :-window]
+    ccount[:, window:] = ccount[:, window:] - ccount[:, :-window]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = csum / ccount
+    return np.where(ccount >= max(min_periods, 1), mean, np.nan)
+
+def _last_valid_index(values):
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], -1)
+    present = ~np.isnan(values)
+    last = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    return np.where(present.any(axis=1), last, -1)
+
+def _fit_trends(values, window):
+    """Least-squares line per company over its last `window` columns with data.
+
+    Returns slope, intercept (relative to the window start), the window
+    start column, residual standard error and the sufficient statistics
+    needed for confidence bands.
+    """
+    n_companies, n_periods = values.shape
+    last = _last_valid_index(values)
+    start = np.maximum(last - window + 1, 0)
+    cols = np.arange(n_periods)
+    in_window = (cols >= start[:, None]) & (cols <= last[:, None]) & ~np.isnan(values)
+
+    x = np.where(in_window, cols - start[:, None], 0.0)
+    y = np.where(in_window, values, 0.0)
+    n = in_window.sum(axis=1).astype(np.float64)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = sx / n
+        ssx = sxx - n * x_mean ** 2
+        slope = (sxy - n * x_mean * (sy / n)) / ssx
+        intercept = sy / n - slope * x_mean
+        residuals = np.where(in_window, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / (n - 2))
+    return slope, intercept, start, last, n, x_mean, ssx, sigma
+
+def analyze(store, trend_window=TREND_WINDOW, horizon=FORECAST_HORIZON):
+    """Compute all analytics for every company in a FinancialsStore"""
+    companies, periods, values = _pivot(store)
+    n_companies, n_periods = values.shape
+
+    qoq = np.full_like(values, np.nan)
+    qoq[:, 1:] = values[:, 1:] - values[:, :-1]
+    yoy = np.full_like(values, np.nan)
+    yoy[:, 4:] = values[:, 4:] - values[:, :-4]
+    rolling_mean = _rolling_mean(values, ROLLING_WINDOW)
+
+    slope, intercept, start, last, n, x_mean, ssx, sigma = _fit_trends(values, trend_window)
+
+    # Forecast from the quarter after each company's last reported quarter
+    steps = np.arange(1, horizon + 1)
+    x_future = (last - start)[:, None] + steps[None, :]
+    forecast = intercept[:, None] + slope[:, None] * x_future
+    with np.errstate(invalid='ignore', divide='ignore'):
+        half_width = Z_SCORE * sigma[:, None] * np.sqrt(1 / n[:, None] + (x_future - x_mean[:, None]) ** 2 / ssx[:, None])
+    forecast_lower = forecast - half_width
+    forecast_upper = forecast + half_width
+    first_period = periods[0] if n_periods else 0
+    forecast_periods = first_period + last[:, None] + steps[None, :]
+
+    def first_crossing(band):
+        hit = band >= 0
+        return np.where(hit.any(axis=1), np.argmax(hit, axis=1), -1)
+
+    expected_idx = first_crossing(forecast)
+    earliest_idx = first_crossing(forecast_upper)
+    latest_idx = first_crossing(forecast_lower)
+
+    break_even = {}
+    for row, company in enumerate(companies):
+        if last[row] < 0:
+            continue
+        series = values[row, :last[row] + 1]
+        if series[-1] >= 0:
+            # Already profitable: report the start of the current non-negative run
+            negative = np.flatnonzero(~(series >= 0))
+            run_start = negative[-1] + 1 if len(negative) else 0
+            break_even[company] = {'status': 'reached', 'period': int(periods[run_start])}
+        elif not slope[row] > 0 or expected_idx[row] < 0:
+            break_even[company] = {'status': 'not_projected'}
+        else:
+            periods_row = forecast_periods[row]
+            break_even[company] = {
+                'status': 'projected',
+                'period': int(periods_row[expected_idx[row]]),
+                'earliest': int(periods_row[earliest_idx[row]]) if earliest_idx[row] >= 0 else None,
+                'latest': int(periods_row[latest_idx[row]]) if latest_idx[row] >= 0 else None,
+            }
+
+    return FinancialAnalytics(
+        companies=companies,
+        periods=periods,
+        values=values,
+        qoq=qoq,
+        yoy=yoy,
+        rolling_mean=rolling_mean,
+        last_index=last,
+        slope=slope,
+        intercept=intercept,
+        trend_start=(periods[0] if n_periods else 0) + start,
+        forecast_periods=forecast_periods,
+        forecast=forecast,
+        forecast_lower=forecast_lower,
+        forecast_upper=forecast_upper,
+        break_even=break_even,
+    )
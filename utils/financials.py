@@ -0,0 +1,255 @@
+"""Streaming ingestion of quarterly financials into a columnar store.
+
+Sources are read in fixed-size chunks and appended to NumPy columns, so the
+store never holds one Python dict per record. Supported inputs:
+
+- ``data/dingdong_financials.json`` (single company, ``annual_data`` array)
+- ``data/financials/*.csv`` with a header ``company,year,quarter,net_loss``
+- ``data/financials/*.jsonl`` with one ``{"company", "year", "quarter", "net_loss"}`` object per line
+- the ``financials`` table when ``CP_DATA_BACKEND=sqlite``
+"""
+import csv
+import json
+import os
+import threading
+
+import numpy as np
+
+from utils.data_loader import get_backend, get_data_path
+
+CHUNK_SIZE = 50_000
+
+# Single-company JSON sources: company id -> filename
+JSON_SOURCES = {
+    'dingdong': 'dingdong_financials.json',
+}
+MULTI_COMPANY_DIR = 'financials'
+
+def _quarter_number(quarter):
+    """'Q3' -> 3"""
+    return int(str(quarter).strip().upper().lstrip('Q'))
+
+class FinancialsStore:
+    """Append-only columnar store of (company, year, quarter, net_loss) rows"""
+
+    def __init__(self):
+        self.companies = []
+        self._company_codes = {}
+        self._chunks = {'company': [], 'year': [], 'quarter': [], 'net_loss': []}
+        self._columns = None
+        # Sorted (company, period) keys already stored, and rows dropped as repeats
+        self._keys = np.empty(0, dtype=np.int64)
+        self.duplicates = 0
+
+    def company_code(self, company):
+        code = self._company_codes.get(company)
+        if code is None:
+            code = len(self.companies)
+            self._company_codes[company] = code
+            self.companies.append(company)
+        return code
+
+    def append(self, company, year, quarter, net_loss):
+        """Append one chunk of equally sized columns (company codes, not names).
+
+        A (company, year, quarter) that is already stored or repeats within
+        the chunk is dropped and counted in ``duplicates`` (shown in the
+        admin panel); the first occurrence wins, so a company found in
+        several sources is not double-counted.
+        """
+        company = np.asarray(company, dtype=np.int32)
+        year = np.asarray(year, dtype=np.int16)
+        quarter = np.asarray(quarter, dtype=np.int8)
+        net_loss = np.asarray(net_loss, dtype=np.float64)
+
+        key = (company.astype(np.int64) << 20) | (year.astype(np.int64) * 4 + quarter - 1)
+        keep = np.zeros(len(key), dtype=bool)
+        keep[np.unique(key, return_index=True)[1]] = True
+        keep &= ~np.isin(key, self._keys)
+        if not keep.all():
+            self.duplicates += int(len(key) - keep.sum())
+            company, year, quarter, net_loss = company[keep], year[keep], quarter[keep], net_loss[keep]
+        self._keys = np.union1d(self._keys, key[keep])
+
+        self._chunks['company'].append(company)
+        self._chunks['year'].append(year)
+        self._chunks['quarter'].append(quarter)
+        self._chunks['net_loss'].append(net_loss)
+        self._columns = None
+
+    @property
+    def columns(self):
+        """Concatenated columns, rebuilt only after new chunks arrive"""
+        if self._columns is None:
+            self._columns = {
+                name: np.concatenate(chunks) if chunks else np.empty(0)
+                for name, chunks in self._chunks.items()
+            }
+            # Keep one consolidated chunk so later appends stay cheap
+            self._chunks = {name: [col] for name, col in self._columns.items()}
+        return self._columns
+
+    def __len__(self):
+        return len(self.columns['year'])
+
+def iter_json_array_chunks(path, array_key, chunk_size=CHUNK_SIZE, read_size=1 << 16):
+    """Yield lists of records from a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        # Advance to the opening bracket of the requested array
+        marker = f'"{array_key}"'
+        while True:
+            idx = buf.find(marker)
+            if idx != -1:
+                bracket = buf.find('[', idx + len(marker))
+                if bracket != -1:
+                    buf = buf[bracket + 1:]
+                    break
+            block = f.read(read_size)
+            if not block:
+                return
+            buf += block
+
+        chunk = []
+        idx = 0
+        eof = False
+        while True:
+            # Walk the buffer by index; it is only trimmed when a block is read
+            while idx < len(buf) and buf[idx] in ' \t\r\n,':
+                idx += 1
+            if buf.startswith(']', idx):
+                break
+            try:
+                record, idx = decoder.raw_decode(buf, idx)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                block = f.read(read_size)
+                eof = not block
+                buf = buf[idx:] + block
+                idx = 0
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def ingest_json(store, path, company, array_key='annual_data', chunk_size=CHUNK_SIZE):
+    """Stream a single-company JSON file into the store"""
+    for chunk in iter_json_array_chunks(path, array_key, chunk_size):
+        # Registered with its first rows, so an empty array adds no company
+        code = store.company_code(company)
+        store.append(
+            np.full(len(chunk), code),
+            [r['year'] for r in chunk],
+            [_quarter_number(r['quarter']) for r in chunk],
+            [r['net_loss'] for r in chunk],
+        )
+
+def ingest_jsonl(store, path, chunk_size=CHUNK_SIZE):
+    """Stream a multi-company JSON Lines file into the store"""
+    with open(path, 'r', encoding='utf-8') as f:
+        chunk = []
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                _append_records(store, chunk)
+                chunk = []
+        if chunk:
+            _append_records(store, chunk)
+
+def _append_records(store, records):
+    store.append(
+        [store.company_code(r['company']) for r in records],
+        [r['year'] for r in records],
+        [_quarter_number(r['quarter']) for r in records],
+        [r['net_loss'] for r in records],
+    )
+
+def ingest_csv(store, path, chunk_size=CHUNK_SIZE):
+    """Stream a multi-company CSV file into the store"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        i_company, i_year, i_quarter, i_loss = (
+            header.index(name) for name in ('company', 'year', 'quarter', 'net_loss')
+        )
+        columns = ([], [], [], [])
+        for row in reader:
+            if not row:
+                continue
+            columns[0].append(store.company_code(row[i_company]))
+            columns[1].append(int(row[i_year]))
+            columns[2].append(_quarter_number(row[i_quarter]))
+            columns[3].append(float(row[i_loss]))
+            if len(columns[0]) >= chunk_size:
+                store.append(*columns)
+                columns = ([], [], [], [])
+        if columns[0]:
+            store.append(*columns)
+
+def ingest_sqlite(store, chunk_size=CHUNK_SIZE):
+    """Stream the SQLite financials table into the store"""
+    from utils.sqlite_store import get_store
+
+    for rows in get_store().iter_financial_rows(chunk_size):
+        companies, years, quarters, losses = zip(*rows)
+        store.append(
+            [store.company_code(c) for c in companies],
+            years,
+            [_quarter_number(q) for q in quarters],
+            losses,
+        )
+
+def _source_files():
+    """All file-based sources with their mtimes, used to detect changes"""
+    files = []
+    for company, filename in JSON_SOURCES.items():
+        path = get_data_path(filename)
+        if path.exists():
+            files.append((str(path), company, os.stat(path).st_mtime))
+    directory = get_data_path(MULTI_COMPANY_DIR)
+    if directory.is_dir():
+        for path in sorted(directory.iterdir()):
+            if path.suffix in ('.csv', '.jsonl'):
+                files.append((str(path), None, os.stat(path).st_mtime))
+    return files
+
+def build_store():
+    """Ingest every configured source into a new FinancialsStore"""
+    store = FinancialsStore()
+    if get_backend() == 'sqlite':
+        ingest_sqlite(store)
+    else:
+        for path, company, _ in _source_files():
+            if path.endswith('.csv'):
+                ingest_csv(store, path)
+            elif path.endswith('.jsonl'):
+                ingest_jsonl(store, path)
+            else:
+                ingest_json(store, path, company)
+    # Consolidate before the store is shared between sessions
+    store.columns
+    return store
+
+_store = {'signature': None, 'store': None}
+_store_lock = threading.Lock()
+
+def get_financials_store():
+    """Process-wide store, rebuilt when a source file changes"""
+    if get_backend() == 'sqlite':
+        from utils.sqlite_store import get_db_path
+        db_path = get_db_path()
+        signature = ('sqlite', db_path, os.stat(db_path).st_mtime)
+    else:
+        signature = tuple(_source_files())
+
+    with _store_lock:
+        if _store['signature'] != signature:
+            _store['store'] = build_store()
+            _store['signature'] = signature
+        return _store['store']
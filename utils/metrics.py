@@ -0,0 +1,123 @@
+"""Process-wide latency metrics per app section.
+
+Sections are timed with ``timed(name)``, either as a context manager or via
+``stop()`` for blocks that can't be indented into a ``with``:
+
+    with tab1, timed('consumer.recommendations'):
+        ...
+
+    module_timer = timed('dashboard.overview')
+    ...
+    module_timer.stop()
+
+Every session records into one shared registry. Each section keeps its most
+recent ``WINDOW`` samples for p50/p95 plus lifetime count and sum, so the
+numbers reflect current traffic. ``prometheus_text()`` exports the registry
+as a Prometheus summary.
+"""
+import threading
+import time
+
+WINDOW = 1024
+QUANTILES = (0.5, 0.95)
+METRIC_NAME = 'cp_section_duration_seconds'
+
+# section -> {'samples': ring buffer (ms), 'count': int, 'total_ms': float, 'max_ms': float}
+# Plain lists keep this module free of NumPy, so light pages don't pay for importing it
+_sections = {}
+_lock = threading.Lock()
+
+def record(section, elapsed_ms):
+    """Add one run-time sample (ms) for a section"""
+    with _lock:
+        entry = _sections.get(section)
+        if entry is None:
+            entry = _sections[section] = {'samples': [], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        if entry['count'] < WINDOW:
+            entry['samples'].append(elapsed_ms)
+        else:
+            entry['samples'][entry['count'] % WINDOW] = elapsed_ms
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+
+class SectionTimer:
+    """Times one section run; records on ``stop()`` or when the ``with`` block exits"""
+    __slots__ = ('section', 'start', 'stopped')
+
+    def __init__(self, section):
+        self.section = section
+        self.start = time.perf_counter()
+        self.stopped = False
+
+    def stop(self):
+        """Record the time since the timer started; later calls are no-ops"""
+        elapsed_ms = (time.perf_counter() - self.start) * 1000
+        if not self.stopped:
+            self.stopped = True
+            record(self.section, elapsed_ms)
+        return elapsed_ms
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+def timed(section):
+    """Start timing a section (see module docstring)"""
+    return SectionTimer(section)
+
+def _percentile(ordered, q):
+    """Linearly interpolated percentile (as numpy.percentile) of a sorted list"""
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def get_section_stats():
+    """Per-section count, p50/p95 over the recent window, mean, max and total (ms)"""
+    with _lock:
+        snapshot = {
+            name: (list(entry['samples']), entry['count'], entry['total_ms'], entry['max_ms'])
+            for name, entry in _sections.items()
+        }
+    stats = {}
+    for name, (samples, count, total_ms, max_ms) in snapshot.items():
+        samples.sort()
+        p50, p95 = (_percentile(samples, q) for q in QUANTILES)
+        stats[name] = {
+            'count': count,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'mean_ms': total_ms / count,
+            'max_ms': max_ms,
+            'total_ms': total_ms,
+        }
+    return stats
+
+def reset_metrics():
+    """Drop every recorded sample"""
+    with _lock:
+        _sections.clear()
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text():
+    """The registry in Prometheus text exposition format (a summary in seconds)"""
+    stats = get_section_stats()
+    lines = [
+        f"# HELP {METRIC_NAME} Run time of app sections (recent-window quantiles)",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    for name in sorted(stats):
+        s = stats[name]
+        section = _label(name)
+        for q, key in zip(QUANTILES, ('p50_ms', 'p95_ms')):
+            lines.append(f'{METRIC_NAME}{{section="{section}",quantile="{q}"}} {s[key] / 1000:.6f}')
+        lines.append(f'{METRIC_NAME}_sum{{section="{section}"}} {s["total_ms"] / 1000:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{section="{section}"}} {s["count"]}')
+    return '\n'.join(lines) + '\n'
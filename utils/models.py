@@ -0,0 +1,181 @@
+"""Typed, slotted records for competitor, segment and financial data.
+
+The raw JSON is validated and converted once per loaded data version; the
+resulting records are immutable and shared by every session.
+"""
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional
+
+from utils.data_loader import get_competitors, get_segments
+
+def _frozen(value):
+    """Read-only view of nested JSON: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+@dataclass(frozen=True, slots=True)
+class PainPoint:
+    pain: str
+    severity: float
+    frequency: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            pain=str(data['pain']),
+            severity=float(data['severity']),
+            frequency=str(data.get('frequency', '')),
+        )
+
+@dataclass(frozen=True, slots=True)
+class Competitor:
+    key: str
+    name: str
+    model: str
+    description: str
+    cities: tuple
+    city_strategy: str
+    sku_count: int
+    fulfillment_cost_2024: float
+    strengths: tuple
+    weaknesses: tuple
+    opportunities: tuple
+    threats: tuple
+    traceability: str
+    traceability_coverage: float
+    membership: bool
+    membership_benefits: tuple
+    ai_features: tuple
+    product_categories: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    formats: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    product_loss_2024: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, key, data):
+        return cls(
+            key=key,
+            name=str(data['name']),
+            model=str(data['model']),
+            description=str(data.get('description', '')),
+            cities=tuple(data['cities']),
+            city_strategy=str(data.get('city_strategy', '')),
+            sku_count=int(data['sku_count']),
+            fulfillment_cost_2024=float(data.get('fulfillment_cost_2024', 0)),
+            strengths=tuple(data['strengths']),
+            weaknesses=tuple(data['weaknesses']),
+            opportunities=tuple(data.get('opportunities', [])),
+            threats=tuple(data.get('threats', [])),
+            traceability=str(data.get('traceability', '')),
+            traceability_coverage=float(data.get('traceability_coverage', 0)),
+            membership=bool(data.get('membership', False)),
+            membership_benefits=tuple(data.get('membership_benefits', [])),
+            ai_features=tuple(data.get('ai_features', [])),
+            product_categories=MappingProxyType(
+                {k: float(v) for k, v in data.get('product_categories', {}).items()}),
+            formats=_frozen(dict(data.get('formats', {}))),
+            product_loss_2024=data.get('product_loss_2024'),
+        )
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    key: str
+    segment_name: str
+    percentage: float
+    income_range_cny: str
+    cities: tuple
+    jobs_to_be_done: str
+    functional_jobs: tuple
+    emotional_jobs: tuple
+    social_jobs: tuple
+    pain_points: MappingProxyType
+    gains: MappingProxyType
+    priorities: MappingProxyType
+    shopping_behavior: MappingProxyType
+    product_preferences: MappingProxyType
+    age_range: Optional[str] = None
+    household_size: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, key, data):
+        return cls(
+            key=key,
+            segment_name=str(data['segment_name']),
+            percentage=float(data['percentage']),
+            income_range_cny=str(data.get('income_range_cny', '')),
+            cities=tuple(data.get('cities', [])),
+            jobs_to_be_done=str(data.get('jobs_to_be_done', '')),
+            functional_jobs=tuple(data.get('functional_jobs', [])),
+            emotional_jobs=tuple(data.get('emotional_jobs', [])),
+            social_jobs=tuple(data.get('social_jobs', [])),
+            pain_points=MappingProxyType({
+                category: tuple(PainPoint.from_dict(p) for p in pains)
+                for category, pains in data.get('pain_points', {}).items()
+            }),
+            gains=MappingProxyType(
+                {category: tuple(items) for category, items in data.get('gains', {}).items()}),
+            priorities=MappingProxyType({k: float(v) for k, v in data.get('priorities', {}).items()}),
+            shopping_behavior=_frozen(dict(data.get('shopping_behavior', {}))),
+            product_preferences=MappingProxyType(
+                {k: float(v) for k, v in data.get('product_preferences', {}).items()}),
+            age_range=data.get('age_range'),
+            household_size=data.get('household_size'),
+        )
+
+@dataclass(frozen=True, slots=True)
+class FinancialQuarter:
+    year: int
+    quarter: str
+    net_loss: float
+    net_loss_attributable: Optional[float] = None
+
+    @property
+    def period(self):
+        return f"{self.year} {self.quarter}"
+
+    @classmethod
+    def from_dict(cls, data):
+        attributable = data.get('net_loss_attributable')
+        return cls(
+            year=int(data['year']),
+            quarter=str(data['quarter']),
+            net_loss=float(data['net_loss']),
+            net_loss_attributable=None if attributable is None else float(attributable),
+        )
+
+# name -> (raw object the models were built from, models)
+_model_cache = {}
+_model_lock = threading.Lock()
+
+def _build_keyed(kind, raw, record_cls):
+    records = {}
+    for key, entry in raw.items():
+        try:
+            records[key] = record_cls.from_dict(key, entry)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warning: skipping invalid {kind} '{key}' ({e!r})")
+    return records
+
+def _cached_models(name, raw, build):
+    """Build models once per raw data object; reuse them while it is current"""
+    with _model_lock:
+        cached = _model_cache.get(name)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        models = build(raw)
+        _model_cache[name] = (raw, models)
+        return models
+
+def get_competitor_models():
+    """Validated Competitor records keyed by competitor id"""
+    return _cached_models('competitors', get_competitors(),
+                          lambda raw: _build_keyed('competitor', raw, Competitor))
+
+def get_segment_models():
+    """Validated Segment records keyed by segment id"""
+    return _cached_models('segments', get_segments(),
+                          lambda raw: _build_keyed('segment', raw, Segment))
@@ -0,0 +1,95 @@
+"""Vectorized opportunity scoring.
+
+Candidate opportunities are held as one (n_opportunities, n_criteria) float
+matrix built once per data version. Scoring a weight vector is a single
+matrix product, and the top k are found with a partial selection, so
+re-scoring thousands of candidates when a weight slider moves is
+effectively free.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.data_loader import get_opportunities
+
+@dataclass(frozen=True, slots=True)
+class OpportunityMatrix:
+    criteria: tuple
+    default_weights: np.ndarray
+    names: np.ndarray
+    regions: np.ndarray
+    values: np.ndarray
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def region_names(self):
+        return sorted(set(self.regions.tolist()))
+
+    def region_mask(self, region=None):
+        """Boolean row mask for one region (all rows if region is None)"""
+        if region is None:
+            return np.ones(len(self.names), dtype=bool)
+        return self.regions == region
+
+    def score(self, weights=None):
+        """Weighted score of every opportunity; weights are normalized to sum to 1"""
+        w = self.default_weights if weights is None else normalize_weights(weights)
+        return self.values @ w
+
+    def top_k(self, k, weights=None, region=None):
+        """Indices and scores of the k best opportunities, best first"""
+        scores = self.score(weights)
+        candidates = np.flatnonzero(self.region_mask(region))
+        k = min(k, len(candidates))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        if k < len(candidates):
+            # O(n) partial selection; only the k winners are fully sorted
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return order, scores[order]
+
+def normalize_weights(weights):
+    w = np.asarray(weights, dtype=np.float64)
+    total = w.sum()
+    if total <= 0:
+        return np.full(len(w), 1.0 / len(w))
+    return w / total
+
+def build_matrix(raw):
+    """Convert the opportunities dataset into an OpportunityMatrix"""
+    criteria = tuple(raw.get('criteria', {}))
+    records = []
+    for i, record in enumerate(raw.get('opportunities', [])):
+        missing = [k for k in ('name',) + criteria if k not in record]
+        if missing:
+            print(f"Warning: skipping invalid opportunity {i} (missing {', '.join(missing)})")
+            continue
+        records.append(record)
+    values = np.empty((len(records), len(criteria)), dtype=np.float64)
+    for j, criterion in enumerate(criteria):
+        values[:, j] = [r[criterion] for r in records]
+    return OpportunityMatrix(
+        criteria=criteria,
+        default_weights=normalize_weights(list(raw['criteria'].values())) if criteria else np.empty(0),
+        names=np.array([r['name'] for r in records], dtype=object),
+        regions=np.array([r.get('region', 'National') for r in records], dtype=object),
+        values=values,
+    )
+
+# (raw object the matrix was built from, matrix)
+_matrix = {'raw': None, 'matrix': None}
+_matrix_lock = threading.Lock()
+
+def get_opportunity_matrix():
+    """Process-wide matrix, rebuilt when the opportunities file changes"""
+    raw = get_opportunities()
+    with _matrix_lock:
+        if _matrix['raw'] is not raw:
+            _matrix['matrix'] = build_matrix(raw)
+            _matrix['raw'] = raw
+        return _matrix['matrix']
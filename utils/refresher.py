@@ -0,0 +1,250 @@
+"""Background data refresh with an atomic version swap.
+
+Pages pin one ``DataVersion`` at the top of each rerun with
+``current_data()`` and read everything through it, so a rerun never mixes
+two generations of data. A daemon thread polls ``data/`` (or the configured
+SQLite database), builds and primes a complete new version off the request
+path, and then swaps it in with a single reference assignment.
+
+Set ``CP_DATA_REFRESH_SECONDS`` to change the poll interval (0 disables the
+background thread).
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.catalog import get_catalog
+from utils.city_priority import get_city_matrix
+from utils.comparison import build_matrix as build_competitor_matrix
+from utils.data_loader import get_backend, get_data_path, get_market
+from utils.financial_analytics import analyze as analyze_financials
+from utils.financials import MULTI_COMPANY_DIR, get_financials_store
+from utils.metrics import timed
+from utils.models import get_competitor_models, get_segment_models
+from utils.opportunity import get_opportunity_matrix
+
+DEFAULT_REFRESH_SECONDS = 5.0
+
+def data_fingerprint():
+    """Cheap summary of every data source: backend plus file mtimes and sizes"""
+    entries = [get_backend()]
+    for directory in (get_data_path(''), get_data_path(MULTI_COMPANY_DIR)):
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    if get_backend() == 'sqlite':
+        from utils.sqlite_store import get_db_path
+        db_path = get_db_path()
+        if os.path.exists(db_path):
+            stat = os.stat(db_path)
+            entries.append((db_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries, key=str))
+
+class DataVersion:
+    """One consistent generation of parsed and derived data.
+
+    Values are built on first access and then memoized for the lifetime of
+    the version. Versions built by the refresher are fully primed before
+    they are published.
+    """
+
+    def __init__(self, number, fingerprint):
+        self.number = number
+        self.fingerprint = fingerprint
+        self.backend = fingerprint[0] if fingerprint else get_backend()
+        self.loaded_at = time.time()
+        self._values = {}
+        # Re-entrant: derived values may be built from other memoized values
+        self._lock = threading.RLock()
+
+    def _memo(self, name, build):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._values:
+                with timed(f"data.build.{name if isinstance(name, str) else name[0]}"):
+                    self._values[name] = build()
+            return self._values[name]
+
+    @property
+    def market(self):
+        return self._memo('market', get_market)
+
+    @property
+    def financials_store(self):
+        return self._memo('financials_store', get_financials_store)
+
+    @property
+    def financial_analytics(self):
+        return self._memo('financial_analytics', lambda: analyze_financials(self.financials_store))
+
+    @property
+    def opportunities(self):
+        return self._memo('opportunities', get_opportunity_matrix)
+
+    @property
+    def cities(self):
+        return self._memo('cities', get_city_matrix)
+
+    @property
+    def catalog(self):
+        return self._memo('catalog', get_catalog)
+
+    def competitor(self, key):
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo(('competitor', key), lambda: get_store().competitor(key))
+        return self._memo('competitors', get_competitor_models).get(key)
+
+    def segment(self, key):
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo(('segment', key), lambda: get_store().segment(key))
+        return self._memo('segments', get_segment_models).get(key)
+
+    def competitor_cities(self):
+        """Every city with at least one competitor, sorted"""
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo('competitor_cities', get_store().competitor_cities)
+        return self._memo('competitor_cities', lambda: sorted(
+            {city for key in self.competitor_keys() for city in self.competitor(key).cities}))
+
+    def competitors_in_city(self, city):
+        """Keys of the competitors present in a city, sorted"""
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo(('competitors_in_city', city), lambda: get_store().competitors_in_city(city))
+        return self._memo(('competitors_in_city', city), lambda: sorted(
+            key for key in self.competitor_keys() if city in self.competitor(key).cities))
+
+    def financial_window(self, first_period, last_period):
+        """Reported quarters per company between two period indexes: {company: (periods, values)}.
+
+        With the SQLite backend only the rows inside the window are queried.
+        """
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return get_store().financial_window(first_period, last_period)
+        analytics = self.financial_analytics
+        if not len(analytics.periods):
+            return {}
+        columns = slice(max(first_period - analytics.periods[0], 0), max(last_period - analytics.periods[0] + 1, 0))
+        periods = analytics.periods[columns]
+        window = {}
+        for row, company in enumerate(analytics.companies):
+            values = analytics.values[row, columns]
+            reported = ~np.isnan(values)
+            if reported.any():
+                window[company] = (periods[reported], values[reported])
+        return window
+
+    def competitor_keys(self):
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo('competitor_keys', get_store().competitor_keys)
+        return list(self._memo('competitors', get_competitor_models))
+
+    @property
+    def competitor_matrix(self):
+        """Attribute matrix over every competitor, for N-way comparisons"""
+        return self._memo('competitor_matrix', lambda: build_competitor_matrix(
+            self.competitor(key) for key in self.competitor_keys()
+        ))
+
+    def segment_keys(self):
+        if self.backend == 'sqlite':
+            from utils.sqlite_store import get_store
+            return self._memo('segment_keys', get_store().segment_keys)
+        return list(self._memo('segments', get_segment_models))
+
+    def prime(self):
+        """Load every dataset and derived structure up front"""
+        self.market
+        self.financials_store
+        self.financial_analytics
+        self.opportunities
+        self.cities
+        self.catalog
+        for key in self.competitor_keys():
+            self.competitor(key)
+        for key in self.segment_keys():
+            self.segment(key)
+        self.competitor_matrix
+        return self
+
+_current = None
+_state_lock = threading.Lock()
+_refresher = None
+
+def current_data():
+    """The data version to use for this rerun; starts the refresher on first use"""
+    global _current
+    version = _current
+    if version is None:
+        with _state_lock:
+            if _current is None:
+                _current = DataVersion(1, data_fingerprint())
+            version = _current
+        start_refresher()
+    return version
+
+def refresh_now():
+    """Rebuild and publish a new version if the sources changed; returns the current one"""
+    global _current
+    fingerprint = data_fingerprint()
+    version = _current
+    if version is not None and version.fingerprint == fingerprint:
+        return version
+
+    number = version.number + 1 if version is not None else 1
+    new_version = DataVersion(number, fingerprint).prime()
+    with _state_lock:
+        _current = new_version
+    return new_version
+
+class DataRefresher(threading.Thread):
+    """Daemon thread that keeps the published data version up to date"""
+
+    def __init__(self, interval):
+        super().__init__(name='cp-data-refresher', daemon=True)
+        self.interval = interval
+        self.last_error = None
+
+    def run(self):
+        # Prime the initial (lazy) version before the first poll
+        try:
+            current_data().prime()
+        except Exception as e:
+            self.last_error = repr(e)
+            print(f"Warning: initial data load failed ({e!r})")
+        while True:
+            time.sleep(self.interval)
+            try:
+                refresh_now()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the previous version until the sources are valid again
+                self.last_error = repr(e)
+                print(f"Warning: data refresh failed ({e!r})")
+
+def start_refresher(interval=None):
+    """Start the process-wide refresher thread once; returns it (or None if disabled)"""
+    global _refresher
+    if interval is None:
+        interval = float(os.environ.get('CP_DATA_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS))
+    if interval <= 0:
+        return None
+    with _state_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = DataRefresher(interval)
+            _refresher.start()
+        return _refresher
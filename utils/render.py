@@ -0,0 +1,102 @@
+"""Pre-rendered HTML panels for list-heavy sections.
+
+SWOT grids, feature lists, jobs, pains and gains are rendered as a single
+HTML block each, so a panel costs one ``st.markdown`` delta instead of one
+element per bullet. Rendered HTML is cached per (panel, data version,
+record key). The CSS classes used here are defined in the dashboard's
+style block.
+"""
+import html
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+MAX_ENTRIES = 512
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+def _alerts(items, kind):
+    return ''.join(f"<div class='alert alert-{kind}'>{html.escape(str(item))}</div>" for item in items)
+
+def _bullets(items):
+    return "<ul>" + ''.join(f"<li>{html.escape(str(item))}</li>" for item in items) + "</ul>"
+
+def _grid(columns):
+    """columns: list of column HTML strings"""
+    cells = ''.join(f"<div>{column}</div>" for column in columns)
+    return f"<div class='panel-grid' style='grid-template-columns: repeat({len(columns)}, 1fr);'>{cells}</div>"
+
+def swot_html(competitor):
+    return _grid([
+        "<h4>Strengths</h4>" + _alerts(competitor.strengths, 'success')
+        + "<h4>Opportunities</h4>" + _alerts(competitor.opportunities, 'info'),
+        "<h4>Weaknesses</h4>" + _alerts(competitor.weaknesses, 'warning')
+        + "<h4>Threats</h4>" + _alerts(competitor.threats, 'error'),
+    ])
+
+def competitor_card_html(competitor):
+    """Name, model and city strategy header of a side-by-side comparison column"""
+    return ("<div class='competitor-card'>"
+            f"<h3>{html.escape(competitor.name)}</h3>"
+            f"<p><strong>Model:</strong> {html.escape(competitor.model)}</p>"
+            f"<p><strong>Strategy:</strong> {html.escape(competitor.city_strategy)}</p>"
+            "</div>")
+
+def strengths_weaknesses_html(competitor):
+    """Compact check/cross lists used by the side-by-side comparison"""
+    return ("<h4>Strengths</h4>" + ''.join(
+        f"<div class='swot-positive'>✓ {html.escape(s)}</div>" for s in competitor.strengths)
+        + "<h4>Weaknesses</h4>" + ''.join(
+        f"<div class='swot-negative'>✗ {html.escape(w)}</div>" for w in competitor.weaknesses))
+
+def features_html(competitor):
+    return ("<h4>AI Features</h4>" + _bullets(competitor.ai_features)
+            + "<h4>Membership Benefits</h4>" + _bullets(competitor.membership_benefits))
+
+def jobs_html(segment):
+    return _grid([
+        "<h4>Functional Jobs</h4>" + _bullets(segment.functional_jobs),
+        "<h4>Emotional Jobs</h4>" + _bullets(segment.emotional_jobs),
+        "<h4>Social Jobs</h4>" + _bullets(segment.social_jobs),
+    ])
+
+def pains_html(pains):
+    rows = []
+    for pain in pains:
+        severity_color = '#C62828' if pain.severity > 0.8 else '#F57C00'
+        rows.append(
+            "<div class='pain-row'>"
+            f"<div><strong>{html.escape(pain.pain)}</strong>"
+            f"<div class='pain-frequency'>Frequency: {html.escape(pain.frequency)}</div></div>"
+            f"<span style='color: {severity_color}; font-weight: bold;'>{pain.severity*100:.0f}% severity</span>"
+            "</div>"
+        )
+    return ''.join(rows)
+
+def gains_html(segment):
+    return _grid([
+        f"<h4>{label} Gains</h4>" + _alerts(segment.gains.get(category, ()), 'success')
+        for category, label in (('functional', 'Functional'), ('emotional', 'Emotional'), ('social', 'Social'))
+    ])
+
+def cached_html(panel, version, key, build):
+    """Return the rendered HTML for a panel, building it on a miss"""
+    cache_key = (panel, version, key)
+    with _lock:
+        entry = _entries.get(cache_key)
+        if entry is not None:
+            _entries.move_to_end(cache_key)
+            return entry
+
+    entry = build()
+    with _lock:
+        _entries[cache_key] = entry
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return entry
+
+def render_panel(panel, version, key, build):
+    """Render a cached HTML panel as one markdown element"""
+    st.markdown(cached_html(panel, version, key, build), unsafe_allow_html=True)
@@ -0,0 +1,76 @@
+"""Fragment-scoped reruns with rerun timing.
+
+Interactive sections are wrapped with ``timed_fragment`` so a widget change
+reruns only that section instead of the whole page script. Pages call
+``start_page()`` at the top and ``finish_page()`` at the bottom to record
+how long a full run takes; after each fragment-only rerun the fragment shows
+its own run time next to the last full-page time, i.e. the rerun time
+saved by that interaction.
+"""
+import functools
+import time
+
+import streamlit as st
+
+from utils.metrics import record
+
+STATE_KEY = '_rerun_timing'
+
+def _state():
+    if STATE_KEY not in st.session_state:
+        st.session_state[STATE_KEY] = {
+            'page_start': None,
+            'page_end': None,
+            'page_ms': None,
+            'fragments': {},
+        }
+    return st.session_state[STATE_KEY]
+
+def start_page():
+    """Mark the start of a full-page run"""
+    _state()['page_start'] = time.perf_counter()
+
+def finish_page():
+    """Mark the end of a full-page run and record its duration"""
+    state = _state()
+    if state['page_start'] is None:
+        return
+    state['page_end'] = time.perf_counter()
+    state['page_ms'] = (state['page_end'] - state['page_start']) * 1000
+
+def get_fragment_stats():
+    """Per-fragment rerun counts and total time saved, plus the last full-page time"""
+    state = _state()
+    return {
+        'page_ms': state['page_ms'],
+        'fragments': {name: dict(stats) for name, stats in state['fragments'].items()},
+    }
+
+def timed_fragment(func):
+    """``st.fragment`` that reports the rerun time saved on fragment-only reruns"""
+    name = func.__name__
+
+    @st.fragment
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        record(f"fragment.{name}", elapsed_ms)
+
+        state = _state()
+        # Fragment-only rerun: the last full run has finished and this run began after it
+        page_end = state['page_end']
+        if page_end is not None and state['page_start'] <= page_end < start:
+            stats = state['fragments'].setdefault(name, {'reruns': 0, 'saved_ms': 0.0})
+            saved_ms = max(state['page_ms'] - elapsed_ms, 0)
+            stats['reruns'] += 1
+            stats['saved_ms'] += saved_ms
+            st.caption(
+                f"⚡ Section rerun in {elapsed_ms:.0f} ms instead of a {state['page_ms']:.0f} ms "
+                f"full-page rerun (saved {saved_ms:.0f} ms; {stats['saved_ms']/1000:.1f}s over "
+                f"{stats['reruns']} interactions)"
+            )
+        return result
+
+    return wrapper
@@ -0,0 +1,183 @@
+"""Compiled binary snapshot of the data/ directory.
+
+The snapshot bundles every JSON source into a single file so workers can
+memory-map it at startup instead of parsing JSON. Each file is stored as
+its pickled parse tree, so loading returns exactly what ``json.load`` would
+(optional keys stay absent, ints stay ints). Build it with:
+
+    python -m utils.snapshot
+"""
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from utils.data_loader import SNAPSHOT_FILE, get_data_path
+
+MAGIC = b'CPSNAP02'
+
+SOURCES = [
+    'competitors.json',
+    'market_data.json',
+    'customer_segments.json',
+    'dingdong_financials.json',
+    'opportunities.json',
+    'cities.json',
+    'products.json',
+]
+
+# Minimal schema checks run at build time: filename -> required keys
+REQUIRED_KEYS = {
+    'competitors.json': ['name', 'model', 'cities', 'sku_count', 'strengths', 'weaknesses'],
+    'market_data.json': ['growth_rate_cagr', 'market_size_2024', 'market_size_2025_projected',
+                         'instant_retail_penetration'],
+    'customer_segments.json': ['segment_name', 'percentage', 'pain_points'],
+    'dingdong_financials.json': ['annual_data'],
+    'opportunities.json': ['criteria', 'opportunities'],
+    'cities.json': ['criteria', 'cities'],
+    'products.json': ['products'],
+}
+
+FINANCIAL_RECORD_KEYS = ['year', 'quarter', 'net_loss']
+PRODUCT_RECORD_KEYS = ['sku', 'name', 'price', 'quality_score', 'category']
+
+def validate(filename, data):
+    """Return a list of schema problems found in a parsed source file"""
+    errors = []
+    required = REQUIRED_KEYS.get(filename, [])
+    if not isinstance(data, dict):
+        return [f"{filename}: top level must be an object"]
+
+    if filename in ('competitors.json', 'customer_segments.json'):
+        # Keyed collections - every entry needs the required fields
+        for key, entry in data.items():
+            missing = [k for k in required if k not in entry]
+            if missing:
+                errors.append(f"{filename}: '{key}' is missing {', '.join(missing)}")
+    else:
+        missing = [k for k in required if k not in data]
+        if missing:
+            errors.append(f"{filename}: missing {', '.join(missing)}")
+
+    if filename == 'dingdong_financials.json':
+        for i, record in enumerate(data.get('annual_data', [])):
+            missing = [k for k in FINANCIAL_RECORD_KEYS if k not in record]
+            if missing:
+                errors.append(f"{filename}: annual_data[{i}] is missing {', '.join(missing)}")
+
+    if filename in ('opportunities.json', 'cities.json'):
+        # Scored records need a value for every criterion
+        records_key = 'opportunities' if filename == 'opportunities.json' else 'cities'
+        record_keys = ['name'] + list(data.get('criteria', {}))
+        for i, record in enumerate(data.get(records_key, [])):
+            missing = [k for k in record_keys if k not in record]
+            if missing:
+                errors.append(f"{filename}: {records_key}[{i}] is missing {', '.join(missing)}")
+
+    if filename == 'products.json':
+        skus = set()
+        for i, record in enumerate(data.get('products', [])):
+            missing = [k for k in PRODUCT_RECORD_KEYS if k not in record]
+            if missing:
+                errors.append(f"{filename}: products[{i}] is missing {', '.join(missing)}")
+            elif record['sku'] in skus:
+                errors.append(f"{filename}: products[{i}] repeats sku '{record['sku']}'")
+            else:
+                skus.add(record['sku'])
+    return errors
+
+def build_snapshot(output_path=None):
+    """Validate all sources and write them into one snapshot file"""
+    output_path = output_path or get_data_path(SNAPSHOT_FILE)
+
+    sections = []
+    sources = {}
+    errors = []
+    for filename in SOURCES:
+        path = get_data_path(filename)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        errors.extend(validate(filename, data))
+        stat = os.stat(path)
+        sources[filename] = {
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'sha1': hashlib.sha1(raw).hexdigest(),
+        }
+        sections.append((filename, pickle.dumps(data, protocol=5)))
+
+    if errors:
+        raise ValueError("Snapshot validation failed:\n" + "\n".join(errors))
+
+    # Layout: MAGIC | header length | JSON header | section payloads
+    index = []
+    offset = 0
+    for filename, payload in sections:
+        index.append({'file': filename, 'offset': offset, 'length': len(payload)})
+        offset += len(payload)
+    header = json.dumps({'sources': sources, 'sections': index}).encode('utf-8')
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for _, payload in sections:
+            f.write(payload)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+class Snapshot:
+    """Memory-mapped view of a snapshot file; sections are decoded on demand"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a data snapshot")
+        header_len = struct.unpack_from('<I', self._mm, len(MAGIC))[0]
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mm[header_start:header_start + header_len])
+        self._base = header_start + header_len
+        self.sources = header['sources']
+        self._sections = header['sections']
+        self._decoded = {}
+
+    def is_fresh(self, filename, mtime, size):
+        """True if the snapshot holds filename and it matches the source mtime and size.
+
+        A deleted source (mtime None) is never fresh, so its stale copy is not served.
+        """
+        source = self.sources.get(filename)
+        if source is None or mtime is None:
+            return False
+        return source['mtime'] == mtime and source['size'] == size
+
+    def load(self, filename):
+        """Rebuild the parsed JSON tree for one source file"""
+        if filename in self._decoded:
+            return self._decoded[filename]
+
+        view = memoryview(self._mm)
+        data = {}
+        for section in self._sections:
+            if section['file'] == filename:
+                start = self._base + section['offset']
+                data = pickle.loads(view[start:start + section['length']])
+        self._decoded[filename] = data
+        return data
+
+def main():
+    try:
+        path = build_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Snapshot written to {path}")
+
+if __name__ == '__main__':
+    main()
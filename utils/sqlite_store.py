@@ -0,0 +1,240 @@
+"""Optional SQLite backend for competitor, segment and financial data.
+
+Import the current JSON files into an indexed database with:
+
+    python -m utils.sqlite_store [path/to/cp_data.sqlite]
+
+then start the app with CP_DATA_BACKEND=sqlite (and CP_DATA_DB if the
+database is not at data/cp_data.sqlite). Dashboard modules fetch single
+rows through ``DataVersion.competitor`` / ``DataVersion.segment`` (see
+utils/refresher.py) instead of loading whole JSON documents; the
+competitor city filter and the financials zoom window query the city and
+year/quarter indexes.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+
+from utils.data_loader import get_data_path, load_json
+from utils.financials import _quarter_number
+from utils.models import Competitor, FinancialQuarter, Segment
+
+DB_FILE = 'cp_data.sqlite'
+
+# Financial source files: company id -> filename
+FINANCIAL_SOURCES = {
+    'dingdong': 'dingdong_financials.json',
+}
+
+SCHEMA = """
+CREATE TABLE competitors (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    model TEXT NOT NULL,
+    sku_count INTEGER,
+    traceability_coverage REAL,
+    doc TEXT NOT NULL
+);
+CREATE TABLE competitor_cities (
+    competitor TEXT NOT NULL REFERENCES competitors(key),
+    city TEXT NOT NULL
+);
+CREATE INDEX idx_competitor_cities_city ON competitor_cities(city);
+CREATE INDEX idx_competitor_cities_competitor ON competitor_cities(competitor);
+
+CREATE TABLE segments (
+    key TEXT PRIMARY KEY,
+    segment_name TEXT NOT NULL,
+    percentage REAL,
+    doc TEXT NOT NULL
+);
+CREATE TABLE segment_pain_points (
+    segment TEXT NOT NULL REFERENCES segments(key),
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    pain TEXT NOT NULL,
+    severity REAL NOT NULL,
+    frequency TEXT
+);
+CREATE INDEX idx_pain_points_segment ON segment_pain_points(segment, category, position);
+
+CREATE TABLE financials (
+    company TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    quarter TEXT NOT NULL,
+    net_loss REAL NOT NULL,
+    net_loss_attributable REAL,
+    PRIMARY KEY (company, year, quarter)
+);
+CREATE INDEX idx_financials_period ON financials(year, quarter);
+"""
+
+def get_db_path():
+    """Database location, overridable with the CP_DATA_DB environment variable"""
+    return os.environ.get('CP_DATA_DB') or str(get_data_path(DB_FILE))
+
+def import_json(db_path=None):
+    """Create a fresh database from the JSON data files"""
+    db_path = db_path or get_db_path()
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+
+        for key, entry in load_json('competitors.json').items():
+            record = Competitor.from_dict(key, entry)
+            conn.execute(
+                "INSERT INTO competitors VALUES (?, ?, ?, ?, ?, ?)",
+                (key, record.name, record.model, record.sku_count,
+                 record.traceability_coverage, json.dumps(entry))
+            )
+            conn.executemany(
+                "INSERT INTO competitor_cities VALUES (?, ?)",
+                [(key, city) for city in record.cities]
+            )
+
+        for key, entry in load_json('customer_segments.json').items():
+            record = Segment.from_dict(key, entry)
+            doc = {k: v for k, v in entry.items() if k != 'pain_points'}
+            conn.execute(
+                "INSERT INTO segments VALUES (?, ?, ?, ?)",
+                (key, record.segment_name, record.percentage, json.dumps(doc))
+            )
+            conn.executemany(
+                "INSERT INTO segment_pain_points VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, category, i, p.pain, p.severity, p.frequency)
+                 for category, pains in record.pain_points.items()
+                 for i, p in enumerate(pains)]
+            )
+
+        for company, filename in FINANCIAL_SOURCES.items():
+            conn.executemany(
+                "INSERT INTO financials VALUES (?, ?, ?, ?, ?)",
+                [(company, q.year, q.quarter, q.net_loss, q.net_loss_attributable)
+                 for q in map(FinancialQuarter.from_dict, load_json(filename).get('annual_data', []))]
+            )
+
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return db_path
+
+class SQLiteStore:
+    """Read-only row-level queries; one connection per session thread"""
+
+    def __init__(self, db_path, mtime=None):
+        self.db_path = db_path
+        self.mtime = mtime
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def competitor_keys(self):
+        rows = self._conn().execute("SELECT key FROM competitors ORDER BY rowid")
+        return [key for (key,) in rows]
+
+    def segment_keys(self):
+        rows = self._conn().execute("SELECT key FROM segments ORDER BY rowid")
+        return [key for (key,) in rows]
+
+    def competitor(self, key):
+        row = self._conn().execute("SELECT doc FROM competitors WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return Competitor.from_dict(key, json.loads(row[0]))
+
+    def competitor_cities(self):
+        rows = self._conn().execute("SELECT DISTINCT city FROM competitor_cities ORDER BY city")
+        return [city for (city,) in rows]
+
+    def competitors_in_city(self, city):
+        rows = self._conn().execute(
+            "SELECT competitor FROM competitor_cities WHERE city = ? ORDER BY competitor", (city,)
+        )
+        return [key for (key,) in rows]
+
+    def segment(self, key):
+        conn = self._conn()
+        row = conn.execute("SELECT doc FROM segments WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        doc = json.loads(row[0])
+        pains = conn.execute(
+            "SELECT category, pain, severity, frequency FROM segment_pain_points "
+            "WHERE segment = ? ORDER BY category, position", (key,)
+        )
+        doc['pain_points'] = {}
+        for category, pain, severity, frequency in pains:
+            doc['pain_points'].setdefault(category, []).append(
+                {'pain': pain, 'severity': severity, 'frequency': frequency}
+            )
+        return Segment.from_dict(key, doc)
+
+    def financial_window(self, first_period, last_period):
+        """Reported quarters per company between two period indexes (year * 4 + quarter - 1).
+
+        Returns {company: (periods, values)} with periods in time order.
+        """
+        rows = self._conn().execute(
+            "SELECT company, year, quarter, net_loss FROM financials "
+            "WHERE year BETWEEN ? AND ? ORDER BY year, quarter",
+            (int(first_period) // 4, int(last_period) // 4)
+        )
+        window = {}
+        for company, year, quarter, net_loss in rows:
+            period = year * 4 + _quarter_number(quarter) - 1
+            if first_period <= period <= last_period:
+                periods, values = window.setdefault(company, ([], []))
+                periods.append(period)
+                values.append(net_loss)
+        return {company: (np.array(periods, dtype=np.int64), np.array(values, dtype=np.float64))
+                for company, (periods, values) in window.items()}
+
+    def iter_financial_rows(self, chunk_size):
+        """Yield batches of (company, year, quarter, net_loss) rows"""
+        cursor = self._conn().execute(
+            "SELECT company, year, quarter, net_loss FROM financials ORDER BY company, year, quarter"
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Process-wide store for the configured database, reopened when the file is replaced"""
+    global _store
+    db_path = get_db_path()
+    try:
+        mtime = os.stat(db_path).st_mtime
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"{db_path} not found - run 'python -m utils.sqlite_store' to create it"
+        ) from None
+    with _store_lock:
+        if _store is None or (_store.db_path, _store.mtime) != (db_path, mtime):
+            _store = SQLiteStore(db_path, mtime)
+        return _store
+
+def main():
+    path = import_json(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Imported JSON data into {path}")
+
+if __name__ == '__main__':
+    main()
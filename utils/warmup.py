@@ -0,0 +1,63 @@
+"""Background warmup of imports, data and figure construction.
+
+Streamlit has no server-start callback, so ``Home.py`` (the entry page every
+new server process serves first) calls ``start_warmup()``. That starts one
+daemon thread per process which:
+
+- imports the modules the dashboard and consumer app need (pandas, plotly
+  and the dashboard's utils)
+- builds and primes the current data version
+- builds the figure-cache entries of the charts in ``utils/figures.py``
+  for the current data version, with the keys the dashboard uses, so their
+  first view is a cache hit
+
+Home renders right away; by the time the visitor opens a page the imports
+and caches are warm. ``warmup()`` runs the same steps synchronously. Step
+timings are recorded as ``warmup.*`` sections in ``utils.metrics``.
+"""
+import importlib
+import threading
+
+from utils.metrics import timed
+
+MODULES = [
+    'numpy', 'pandas', 'plotly.graph_objects', 'plotly.subplots', 'plotly.io',
+    'utils.refresher', 'utils.figure_cache', 'utils.figures', 'utils.render', 'utils.comparison',
+    'utils.downsample', 'utils.financial_analytics', 'utils.entry_simulator', 'utils.admin',
+]
+
+_thread = None
+_lock = threading.Lock()
+
+def _import_modules():
+    for name in MODULES:
+        importlib.import_module(name)
+
+def _prime_data():
+    from utils.refresher import current_data
+    current_data().prime()
+
+def _prime_figures():
+    from utils.figures import prime_figures
+    from utils.refresher import current_data
+    prime_figures(current_data())
+
+STEPS = [('imports', _import_modules), ('data', _prime_data), ('figures', _prime_figures)]
+
+def warmup():
+    """Run every warmup step now; failures are reported and skipped"""
+    for step, func in STEPS:
+        try:
+            with timed(f"warmup.{step}"):
+                func()
+        except Exception as e:
+            print(f"Warning: warmup step '{step}' failed ({e!r})")
+
+def start_warmup():
+    """Start the warmup thread once per process; returns immediately"""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warmup, name='cp-warmup', daemon=True)
+            _thread.start()
+    return _thread